@@ -0,0 +1,30 @@
+import dataclasses
+from collections.abc import Callable
+from typing import Any
+
+
+# the fields of the root model arrived, placeholders still pending
+ROOT_READY = "root_ready"
+# the value of a placeholder arrived, or the frame closing a streamed list
+PLACEHOLDER_RESOLVED = "placeholder_resolved"
+# the last frame arrived, the document is complete
+STREAM_COMPLETE = "stream_complete"
+
+EVENT_TYPES = (ROOT_READY, PLACEHOLDER_RESOLVED, STREAM_COMPLETE)
+
+
+@dataclasses.dataclass(frozen=True)
+class AssemblerEvent:
+    """
+    Something the assembler received. `value` is the assembled document,
+    except for a resolved placeholder, where it is the placeholder's value
+    and `path` its keys and indexes from the root.
+    """
+
+    type: str
+    value: Any
+    placeholder: str | None = None
+    path: tuple[str | int, ...] = ()
+
+
+type EventCallback = Callable[[AssemblerEvent], Any]
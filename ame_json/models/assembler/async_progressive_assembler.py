@@ -1,8 +1,14 @@
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, AsyncIterator
 from typing import Any
 
+from pydantic import BaseModel
+
+from ame_json.models.assembler.assembler_event import AssemblerEvent, EventCallback
 from ame_json.models.assembler.base import ProgressiveAssemblerBase
-from ame_json.models.path_data import PathDataMapper
+from ame_json.models.assembler.incremental_assembler import IncrementalAssembler
+from ame_json.models.framing import Framing, read_frames_async
+from ame_json.models.json_codec import CodecName, JsonCodec
+from ame_json.models.msgpack_codec import WireFormat
 from ame_json.logging_utils import get_logger
 
 logger = get_logger(__name__)
@@ -10,36 +16,63 @@ logger = get_logger(__name__)
 
 class AsyncProgressiveAssembler(ProgressiveAssemblerBase):
     @staticmethod
-    async def assamble(generator: AsyncGenerator[bytes, Any]) -> dict:
-        stream_completed = False
-        final_data: dict = {}
-        path_data_mapper: PathDataMapper = {}
+    async def assamble(
+        generator: AsyncGenerator[bytes, Any],
+        codec: CodecName | JsonCodec | None = None,
+        format: WireFormat = "json",
+        framing: Framing | None = None,
+        callbacks: dict[str, EventCallback] | None = None,
+        model: type[BaseModel] | None = None,
+    ) -> dict | BaseModel:
+        assembler = IncrementalAssembler(codec, format, framing, model)
 
-        while not stream_completed:
-            try:
-                value = await anext(generator)
+        for event_type, callback in (callbacks or {}).items():
+            assembler.on(event_type, callback)
 
-                if not isinstance(value, bytes):
-                    logger.error(f"excpected bytes, got: {value}")
+        async for _ in AsyncProgressiveAssembler._feed(assembler, generator):
+            pass
 
-                    continue
+        if model is not None:
+            return assembler.get_instance()
 
-                object_value = AsyncProgressiveAssembler._decode_value(value)
-                is_finished = bool(object_value.pop("completed_stream", None))
+        return assembler.data
 
-                if not isinstance(object_value, dict):
-                    logger.error(f"excpected dict, got: {object_value}")
+    @staticmethod
+    async def events(
+        generator: AsyncGenerator[bytes, Any],
+        codec: CodecName | JsonCodec | None = None,
+        format: WireFormat = "json",
+        framing: Framing | None = None,
+    ) -> AsyncIterator[AssemblerEvent]:
+        """
+        Yields the events of the stream as its frames arrive, e.g. to start
+        working on a field without waiting for the rest of the document.
+        """
+        assembler = IncrementalAssembler(codec, format, framing)
 
-                    continue
+        async for event in AsyncProgressiveAssembler._feed(assembler, generator):
+            yield event
 
-                final_data, path_data_mapper = AsyncProgressiveAssembler.update_data(
-                    object_value, final_data, path_data_mapper
-                )
+    @staticmethod
+    async def _feed(
+        assembler: IncrementalAssembler, generator: AsyncGenerator[bytes, Any]
+    ) -> AsyncIterator[AssemblerEvent]:
+        frames = read_frames_async(generator, assembler.framing)
 
-                if is_finished:
-                    stream_completed = True
+        while not assembler.completed:
+            try:
+                value = await anext(frames)
+
+                if not isinstance(value, (bytes, memoryview)):
+                    logger.error(f"excpected bytes, got: {value}")
 
+                    continue
+
+                events = assembler.feed_frame_events(value)
             except Exception as e:
                 print(f"assamble: {e}")
 
-        return final_data
+                continue
+
+            for event in events:
+                yield event
@@ -1,7 +1,10 @@
-import json
+from collections.abc import Callable
 from typing import Any
 
+from ame_json.models.computation_stream import APPEND_SUFFIX, CLOSE_SUFFIX
+from ame_json.models.json_codec import JsonCodec
 from ame_json.models.path_data import PathData, PathDataMapper
+from ame_json.models.placeholder import PLACEHOLDER_PREFIX, is_placeholder_string
 from ame_json.logging_utils import get_logger
 
 logger = get_logger(__name__)
@@ -9,82 +12,154 @@ logger = get_logger(__name__)
 
 class ProgressiveAssemblerBase:
     @staticmethod
-    def _decode_value(value: bytes) -> dict:
-        json_value_str = value.decode()
-        data = json.loads(json_value_str)
+    def _get_placeholder_check(codec: JsonCodec) -> Callable[[Any], bool]:
+        """
+        Binary codecs tag placeholders, JSON ones only have "$" strings.
+        """
+        return getattr(codec, "is_placeholder", is_placeholder_string)
 
-        return data
+    @staticmethod
+    def _register_value(
+        container: dict | list,
+        key: str | int,
+        path: list[str | int],
+        path_data_mapper: PathDataMapper,
+        is_placeholder: Callable[[Any], bool],
+    ):
+        """
+        Registers `container[key]` when it is a placeholder, or the
+        placeholders nested anywhere in it.
+        """
+        value = container[key]
+
+        if is_placeholder(value):
+            path_data_mapper[value] = PathData(
+                value=value, path=[*path, key], container=container, key=key
+            )
+
+            return
+
+        if isinstance(value, dict):
+            inner_keys = value.keys()
+        elif isinstance(value, list):
+            inner_keys = range(len(value))
+        else:
+            return
+
+        inner_path = [*path, key]
+
+        for inner_key in inner_keys:
+            ProgressiveAssemblerBase._register_value(
+                value, inner_key, inner_path, path_data_mapper, is_placeholder
+            )
 
     @staticmethod
-    def _insert_value(data: dict, path: list[str], value: Any):
-        data_value = data
+    def _get_path_data(path_data_mapper: PathDataMapper, key: str) -> PathData | None:
+        path_data = path_data_mapper.get(key)
 
-        for index, path_part in enumerate(path):
-            if path_part not in data:
-                raise Exception(f"Bad path: {path}")
+        if path_data is None:
+            logger.error(f"key was not in pending update data: {key}")
 
-            if index == len(path) - 1:
-                data_value[path_part] = value
+        return path_data
 
-                continue
+    @staticmethod
+    def _resolve(
+        path_data_mapper: PathDataMapper,
+        key: str,
+        value: Any,
+        is_placeholder: Callable[[Any], bool],
+    ):
+        path_data = ProgressiveAssemblerBase._get_path_data(path_data_mapper, key)
 
-            data_value = data_value[path_part]
+        if path_data is None:
+            return
 
-    @staticmethod
-    def _get_first_computed_key(keys: list) -> str | None:
-        for key in keys:
-            if key.startswith("$"):
-                return key
+        path_data.container[path_data.key] = value
+
+        ProgressiveAssemblerBase._register_value(
+            path_data.container,
+            path_data.key,
+            path_data.path[:-1],
+            path_data_mapper,
+            is_placeholder,
+        )
 
     @staticmethod
-    def _get_current_path(path_data_mapper: PathDataMapper, keys: list) -> list[str]:
-        key = ProgressiveAssemblerBase._get_first_computed_key(keys)
+    def _append_values(
+        path_data_mapper: PathDataMapper,
+        key: str,
+        values: list,
+        is_placeholder: Callable[[Any], bool],
+    ):
+        """
+        Appends a chunk of a streaming computation to the list of `key`.
+        """
+        path_data = ProgressiveAssemblerBase._get_path_data(path_data_mapper, key)
+
+        if path_data is None:
+            return
 
-        if key is None:
-            return []
+        current = path_data.container[path_data.key]
 
-        path_data = path_data_mapper.get(key)
+        if current == key:
+            current = path_data.container[path_data.key] = []
+
+        start = len(current)
+        current.extend(values)
+
+        for index in range(start, len(current)):
+            ProgressiveAssemblerBase._register_value(
+                current, index, path_data.path, path_data_mapper, is_placeholder
+            )
+
+    @staticmethod
+    def _close_list(path_data_mapper: PathDataMapper, key: str):
+        path_data = ProgressiveAssemblerBase._get_path_data(path_data_mapper, key)
 
         if path_data is None:
-            return []
+            return
 
-        return path_data.path
+        # a stream that sent no items
+        if path_data.container[path_data.key] == key:
+            path_data.container[path_data.key] = []
 
     @staticmethod
     def update_data(
         object_value: dict[str, Any],
         final_data: dict,
         path_data_mapper: PathDataMapper,
+        is_placeholder: Callable[[Any], bool] = is_placeholder_string,
     ) -> tuple[dict, dict]:
-        keys = list(object_value.keys())
-        current_path = ProgressiveAssemblerBase._get_current_path(
-            path_data_mapper, keys
-        )
-
         for key, value in object_value.items():
-            if key.startswith("$"):
-                if key not in path_data_mapper:
-                    logger.error(f"key was not in pending update data: {key}")
+            # keys starting with a "$" resolve placeholders, field names can't
+            if not key.startswith(PLACEHOLDER_PREFIX):
+                final_data[key] = value
 
-                    continue
+                ProgressiveAssemblerBase._register_value(
+                    final_data, key, [], path_data_mapper, is_placeholder
+                )
 
-                path_data = path_data_mapper.get(key)
+                continue
 
-                if not path_data:
-                    logger.error(f"can't find path for key: {key}")
+            if key.endswith(APPEND_SUFFIX):
+                ProgressiveAssemblerBase._append_values(
+                    path_data_mapper,
+                    key[: -len(APPEND_SUFFIX)],
+                    value,
+                    is_placeholder,
+                )
 
-                    continue
+                continue
 
-                ProgressiveAssemblerBase._insert_value(
-                    final_data, path_data.path, value
+            if key.endswith(CLOSE_SUFFIX):
+                ProgressiveAssemblerBase._close_list(
+                    path_data_mapper, key[: -len(CLOSE_SUFFIX)]
                 )
 
                 continue
 
-            if isinstance(value, str) and value.startswith("$"):
-                path = [*current_path, key]
-                path_data_mapper[value] = PathData(value=value, path=path)
-
-            final_data[key] = value
+            ProgressiveAssemblerBase._resolve(
+                path_data_mapper, key, value, is_placeholder
+            )
 
         return final_data, path_data_mapper
@@ -0,0 +1,210 @@
+import itertools
+from typing import Any
+
+from pydantic import BaseModel
+
+from ame_json.models.assembler.assembler_event import (
+    EVENT_TYPES,
+    PLACEHOLDER_RESOLVED,
+    ROOT_READY,
+    STREAM_COMPLETE,
+    AssemblerEvent,
+    EventCallback,
+)
+from ame_json.models.assembler.base import ProgressiveAssemblerBase
+from ame_json.models.assembler.model_builder import ModelBuilder
+from ame_json.models.computation_stream import APPEND_SUFFIX, CLOSE_SUFFIX
+from ame_json.models.framing import Framing, FrameReader, get_framing
+from ame_json.models.json_codec import CodecName, JsonCodec
+from ame_json.models.msgpack_codec import WireFormat, get_format_codec
+from ame_json.models.path_data import PathDataMapper
+from ame_json.models.placeholder import PLACEHOLDER_PREFIX
+from ame_json.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+
+class IncrementalAssembler(ProgressiveAssemblerBase):
+    """
+    Push-style assembler, fed whatever bytes the network delivered. `data`
+    is the document assembled so far, its pending placeholders still in it.
+    Without framing, every `feed()` must be exactly one frame.
+
+    Callbacks registered with `on()` are called with every event of their
+    type, as the frames are fed.
+
+    With a `model`, the fields are validated into it as they complete, see
+    `ModelBuilder`, and `get_instance()` returns the typed instance.
+    """
+
+    def __init__(
+        self,
+        codec: CodecName | JsonCodec | None = None,
+        format: WireFormat = "json",
+        framing: Framing | None = None,
+        model: type[BaseModel] | None = None,
+    ):
+        self.codec = get_format_codec(format, codec)
+        self.framing = get_framing(format, framing)
+        self.data: dict = {}
+        self.path_data_mapper: PathDataMapper = {}
+        self.completed = False
+        self.root_ready = False
+        self._callbacks: dict[str, list[EventCallback]] = {}
+        self._is_placeholder = self._get_placeholder_check(self.codec)
+        self._reader = None
+        self._builder = ModelBuilder(model) if model is not None else None
+        self._instance = None
+
+        if self.framing != "none":
+            self._reader = FrameReader(self.framing)
+
+    def on(self, event_type: str, callback: EventCallback) -> EventCallback:
+        if event_type not in EVENT_TYPES:
+            raise ValueError(f"Unknown assembler event: {event_type}")
+
+        self._callbacks.setdefault(event_type, []).append(callback)
+
+        return callback
+
+    def feed(self, data: bytes | bytearray | memoryview) -> list[str]:
+        """
+        Returns the placeholders resolved by the frames `data` completed.
+        """
+        return get_resolved(self.feed_events(data))
+
+    def feed_events(self, data: bytes | bytearray | memoryview) -> list[AssemblerEvent]:
+        """
+        Returns the events of the frames `data` completed.
+        """
+        if self._reader is None:
+            return self.feed_frame_events(data)
+
+        events = []
+
+        for frame in self._reader.feed(data):
+            events.extend(self.feed_frame_events(frame))
+
+        return events
+
+    def feed_frame(self, frame: bytes | memoryview) -> list[str]:
+        """
+        Applies a single unframed frame, returns the placeholders it resolved.
+        A streamed list is resolved by the frame closing it.
+        """
+        return get_resolved(self.feed_frame_events(frame))
+
+    def feed_frame_events(self, frame: bytes | memoryview) -> list[AssemblerEvent]:
+        object_value = self.codec.decode(frame)
+
+        if not isinstance(object_value, dict):
+            logger.error(f"excpected dict, got: {object_value}")
+
+            return []
+
+        if object_value.pop("completed_stream", None):
+            self.completed = True
+
+        resolved = []
+        fields = set()
+
+        for key in object_value:
+            if not key.startswith(PLACEHOLDER_PREFIX):
+                fields.add(key)
+
+                continue
+
+            if key.endswith(APPEND_SUFFIX):
+                continue
+
+            if key.endswith(CLOSE_SUFFIX):
+                key = key[: -len(CLOSE_SUFFIX)]
+
+            if key in self.path_data_mapper:
+                resolved.append(key)
+
+        registered = len(self.path_data_mapper)
+
+        self.data, self.path_data_mapper = self.update_data(
+            object_value, self.data, self.path_data_mapper, self._is_placeholder
+        )
+
+        if self._builder is not None:
+            self._update_builder(registered, resolved, fields)
+
+        events = []
+
+        if not self.root_ready and (fields or self.completed):
+            self.root_ready = True
+            events.append(AssemblerEvent(ROOT_READY, self.data))
+
+        for key in resolved:
+            path_data = self.path_data_mapper[key]
+            events.append(
+                AssemblerEvent(
+                    PLACEHOLDER_RESOLVED,
+                    path_data.container[path_data.key],
+                    key,
+                    tuple(path_data.path),
+                )
+            )
+
+        if self.completed:
+            events.append(AssemblerEvent(STREAM_COMPLETE, self.data))
+
+        for event in events:
+            self._dispatch(event)
+
+        return events
+
+    def get_instance(self) -> BaseModel:
+        """
+        Returns the instance of the model of the stream, raising the error of
+        the first field that failed validation.
+        """
+        if self._builder is None:
+            raise ValueError("The assembler was created without a model")
+
+        if not self.completed:
+            raise ValueError("The stream is not complete")
+
+        if self._instance is None:
+            self._instance = self._builder.build(self.data)
+
+        return self._instance
+
+    def _update_builder(self, registered: int, resolved: list[str], fields: set):
+        # the mapper keeps its entries in the order they were registered
+        new_entries = len(self.path_data_mapper) - registered
+
+        for path_data in itertools.islice(
+            reversed(self.path_data_mapper.values()), new_entries
+        ):
+            self._builder.add_placeholder(path_data)
+
+        for key in resolved:
+            path_data = self.path_data_mapper[key]
+            self._builder.resolve_placeholder(path_data)
+            fields.add(path_data.path[0])
+
+        self._builder.update(self.data, fields)
+
+    def _dispatch(self, event: AssemblerEvent):
+        for callback in self._callbacks.get(event.type, ()):
+            try:
+                callback(event)
+            except Exception as e:
+                logger.error(f"Error in {event.type} callback: {e}")
+
+    def get_value(self, placeholder: str) -> Any:
+        """
+        Returns the current value at the path of `placeholder`, which is the
+        placeholder itself until it is resolved.
+        """
+        path_data = self.path_data_mapper[placeholder]
+
+        return path_data.container[path_data.key]
+
+
+def get_resolved(events: list[AssemblerEvent]) -> list[str]:
+    return [event.placeholder for event in events if event.type == PLACEHOLDER_RESOLVED]
@@ -0,0 +1,272 @@
+import types
+from collections.abc import Callable, Iterable
+from typing import Annotated, Any, Union, get_args, get_origin
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from ame_json.models.async_computation import AsyncComputation
+from ame_json.models.computation import Computation
+from ame_json.models.path_data import PathData
+
+type Builder = Callable[[Any], Any]
+
+_UNION_TYPES = (Union, types.UnionType)
+_LIST_TYPES = (list, tuple, set, frozenset)
+_COMPUTATION_TYPES = (Computation, AsyncComputation)
+
+
+class ModelBuilder:
+    """
+    Builds an instance of `model` from the frames of its stream. Each field
+    is validated once the placeholders in its value are all resolved, with
+    a TypeAdapter of its type, and the instance is constructed from the
+    validated fields, without validating the model as a whole again. A
+    computation field holds the value the computation returned.
+    """
+
+    def __init__(self, model: type[BaseModel]):
+        self.model = model
+        self.values: dict[str, Any] = {}
+        self.error: Exception | None = None
+        self._builders = get_field_builders(model)
+        # the placeholders yet to be resolved in the value of each field
+        self._pending: dict[str | int, int] = {}
+
+    def add_placeholder(self, path_data: PathData):
+        root = path_data.path[0]
+        self._pending[root] = self._pending.get(root, 0) + 1
+
+    def resolve_placeholder(self, path_data: PathData):
+        self._pending[path_data.path[0]] -= 1
+
+    def update(self, data: dict, fields: Iterable, completed: bool = False):
+        """
+        Validates the fields of `fields` whose value is complete in `data`,
+        every one of them once the stream is `completed`.
+        """
+        for name in fields:
+            if name in self.values or (self._pending.get(name) and not completed):
+                continue
+
+            builder = self._builders.get(name)
+
+            if builder is None:
+                self.values[name] = data[name]
+
+                continue
+
+            try:
+                self.values[name] = builder(data[name])
+            except (ValidationError, ValueError, TypeError) as e:
+                self.error = self.error or e
+
+    def build(self, data: dict) -> BaseModel:
+        # "$N" strings the stream never resolved are values, not placeholders
+        self.update(data, data.keys(), completed=True)
+
+        if self.error is not None:
+            raise self.error
+
+        check_required(self.model, self.values)
+
+        return self.model.model_construct(**self.values)
+
+
+_adapters: dict[Any, TypeAdapter] = {}
+
+
+def get_type_adapter(annotation: Any) -> TypeAdapter:
+    """
+    Returns the TypeAdapter of `annotation`, created the first time it is
+    seen.
+    """
+    try:
+        adapter = _adapters.get(annotation)
+    except TypeError:  # pragma: no cover - unhashable metadata
+        return TypeAdapter(annotation)
+
+    if adapter is None:
+        adapter = _adapters[annotation] = TypeAdapter(annotation)
+
+    return adapter
+
+
+_builders: dict[Any, Builder] = {}
+
+
+def get_builder(annotation: Any) -> Builder:
+    """
+    Returns the function turning the assembled value of `annotation` into
+    its typed value, compiled the first time it is seen.
+    """
+    builder = _builders.get(annotation)
+
+    if builder is None:
+        builder = _builders[annotation] = compile_builder(annotation)
+
+    return builder
+
+
+_field_builders: dict[type[BaseModel], dict[str, Builder]] = {}
+
+
+def get_field_builders(model: type[BaseModel]) -> dict[str, Builder]:
+    builders = _field_builders.get(model)
+
+    if builders is None:
+        builders = _field_builders[model] = compile_field_builders(model)
+
+    return builders
+
+
+def compile_field_builders(model: type[BaseModel]) -> dict[str, Builder]:
+    builders = {}
+
+    for name, field_info in model.model_fields.items():
+        annotation = field_info.annotation
+
+        # constraints of a computation field apply to the computation
+        if field_info.metadata and not has_computation(annotation):
+            builders[name] = get_type_adapter(
+                Annotated[annotation, *field_info.metadata]
+            ).validate_python
+        else:
+            builders[name] = get_builder(annotation)
+
+    return builders
+
+
+def compile_builder(annotation: Any) -> Builder:
+    origin = get_origin(annotation)
+    args = get_args(annotation)
+
+    if annotation in _COMPUTATION_TYPES or origin in _COMPUTATION_TYPES:
+        return get_builder(args[0]) if args else build_as_is
+
+    if not has_computation(annotation):
+        return get_type_adapter(annotation).validate_python
+
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return lambda value: build_model(annotation, value)
+
+    if origin in _LIST_TYPES and args:
+        return lambda value: build_list(origin, args, value)
+
+    if origin is dict and len(args) == 2:
+        return lambda value: build_dict(args[1], value)
+
+    if origin in _UNION_TYPES:
+        return lambda value: build_union(args, value)
+
+    return build_as_is
+
+
+def build_as_is(value: Any) -> Any:
+    return value
+
+
+def build_model(model: type[BaseModel], value: Any) -> Any:
+    if not isinstance(value, dict):
+        raise TypeError(f"Expected the fields of {model.__name__}, got: {value}")
+
+    check_required(model, value)
+
+    # fetched on each call, models may refer to themselves
+    builders = get_field_builders(model)
+
+    return model.model_construct(
+        **{
+            name: builders[name](inner_value) if name in builders else inner_value
+            for name, inner_value in value.items()
+        }
+    )
+
+
+def check_required(model: type[BaseModel], values: dict):
+    missing = [
+        name
+        for name, field_info in model.model_fields.items()
+        if field_info.is_required() and name not in values
+    ]
+
+    if missing:
+        raise ValueError(f"Missing fields of {model.__name__}: {missing}")
+
+
+def build_list(origin: type, args: tuple, value: Any) -> Any:
+    if not isinstance(value, list):
+        raise TypeError(f"Expected a list, got: {value}")
+
+    if origin is tuple and (len(args) != 2 or args[1] is not Ellipsis):
+        items = [get_builder(arg)(item) for arg, item in zip(args, value, strict=True)]
+    else:
+        builder = get_builder(args[0])
+        items = [builder(item) for item in value]
+
+    return items if origin is list else origin(items)
+
+
+def build_dict(annotation: Any, value: Any) -> Any:
+    if not isinstance(value, dict):
+        raise TypeError(f"Expected a dict, got: {value}")
+
+    builder = get_builder(annotation)
+
+    return {key: builder(inner_value) for key, inner_value in value.items()}
+
+
+def build_union(args: tuple, value: Any) -> Any:
+    if value is None and type(None) in args:
+        return None
+
+    error = None
+
+    for arg in args:
+        try:
+            return get_builder(arg)(value)
+        except (ValidationError, ValueError, TypeError) as e:
+            error = e
+
+    raise error or TypeError(f"No type of {args} accepts: {value}")
+
+
+def is_model_type(annotation: Any) -> bool:
+    return isinstance(annotation, type) and issubclass(annotation, BaseModel)
+
+
+_has_computation: dict[Any, bool] = {}
+
+
+def has_computation(annotation: Any) -> bool:
+    """
+    Returns True when a value of `annotation` may hold a computation, whose
+    assembled value its own validator would reject.
+    """
+    try:
+        result = _has_computation.get(annotation)
+    except TypeError:  # pragma: no cover - unhashable metadata
+        return False
+
+    if result is None:
+        result = _has_computation[annotation] = _find_computation(annotation, set())
+
+    return result
+
+
+def _find_computation(annotation: Any, seen: set[int]) -> bool:
+    if annotation in _COMPUTATION_TYPES or get_origin(annotation) in _COMPUTATION_TYPES:
+        return True
+
+    # a model referring to itself holds no computation through itself
+    if id(annotation) in seen:
+        return False
+
+    seen.add(id(annotation))
+
+    if is_model_type(annotation):
+        return any(
+            _find_computation(field_info.annotation, seen)
+            for field_info in annotation.model_fields.values()
+        )
+
+    return any(_find_computation(arg, seen) for arg in get_args(annotation))
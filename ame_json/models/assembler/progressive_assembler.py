@@ -1,8 +1,14 @@
-from collections.abc import Generator
+from collections.abc import Generator, Iterator
 from typing import Any
 
+from pydantic import BaseModel
+
+from ame_json.models.assembler.assembler_event import AssemblerEvent, EventCallback
 from ame_json.models.assembler.base import ProgressiveAssemblerBase
-from ame_json.models.path_data import PathDataMapper
+from ame_json.models.assembler.incremental_assembler import IncrementalAssembler
+from ame_json.models.framing import Framing, read_frames
+from ame_json.models.json_codec import CodecName, JsonCodec
+from ame_json.models.msgpack_codec import WireFormat
 from ame_json.logging_utils import get_logger
 
 logger = get_logger(__name__)
@@ -10,36 +16,67 @@ logger = get_logger(__name__)
 
 class ProgressiveAssembler(ProgressiveAssemblerBase):
     @staticmethod
-    def assamble(generator: Generator[bytes, Any, None]) -> dict:
-        stream_completed = False
-        final_data: dict = {}
-        path_data_mapper: PathDataMapper = {}
+    def assamble(
+        generator: Generator[bytes, Any, None],
+        codec: CodecName | JsonCodec | None = None,
+        format: WireFormat = "json",
+        framing: Framing | None = None,
+        callbacks: dict[str, EventCallback] | None = None,
+        model: type[BaseModel] | None = None,
+    ) -> dict | BaseModel:
+        """
+        `callbacks` are called with the events of their type as the frames
+        arrive, e.g. `{PLACEHOLDER_RESOLVED: on_field}`.
 
-        while not stream_completed:
-            try:
-                value = next(generator)
+        With a `model`, returns its instance instead of a dict, validating
+        each field as it completes.
+        """
+        assembler = IncrementalAssembler(codec, format, framing, model)
 
-                if not isinstance(value, bytes):
-                    logger.error(f"excpected bytes, got: {value}")
+        for event_type, callback in (callbacks or {}).items():
+            assembler.on(event_type, callback)
 
-                    continue
+        for _ in ProgressiveAssembler._feed(assembler, generator):
+            pass
 
-                object_value = ProgressiveAssembler._decode_value(value)
-                is_finished = bool(object_value.pop("completed_stream", None))
+        if model is not None:
+            return assembler.get_instance()
 
-                if not isinstance(object_value, dict):
-                    logger.error(f"excpected dict, got: {object_value}")
+        return assembler.data
 
-                    continue
+    @staticmethod
+    def events(
+        generator: Generator[bytes, Any, None],
+        codec: CodecName | JsonCodec | None = None,
+        format: WireFormat = "json",
+        framing: Framing | None = None,
+    ) -> Iterator[AssemblerEvent]:
+        """
+        Yields the events of the stream as its frames arrive.
+        """
+        assembler = IncrementalAssembler(codec, format, framing)
+
+        yield from ProgressiveAssembler._feed(assembler, generator)
 
-                final_data, path_data_mapper = ProgressiveAssembler.update_data(
-                    object_value, final_data, path_data_mapper
-                )
+    @staticmethod
+    def _feed(
+        assembler: IncrementalAssembler, generator: Generator[bytes, Any, None]
+    ) -> Iterator[AssemblerEvent]:
+        frames = read_frames(generator, assembler.framing)
+
+        while not assembler.completed:
+            try:
+                value = next(frames)
 
-                if is_finished:
-                    stream_completed = True
+                if not isinstance(value, (bytes, memoryview)):
+                    logger.error(f"excpected bytes, got: {value}")
 
+                    continue
+
+                events = assembler.feed_frame_events(value)
             except Exception as e:
                 print(f"assamble: {e}")
 
-        return final_data
+                continue
+
+            yield from events
@@ -1,17 +1,54 @@
+import inspect
 from collections.abc import Coroutine
 from pydantic import SerializationInfo
 from pydantic_core import core_schema
 
 from typing import Any, Callable
 
+from ame_json.models.computation_cache import computation_cache
+from ame_json.models.computation_hedging import ensure_hedgeable
+from ame_json.models.computation_stream import (
+    DEFAULT_CHUNK_SIZE,
+    ComputationChunk,
+    ensure_chunk_size,
+    read_async_chunk,
+)
+from ame_json.models.computation_timeout import NO_FALLBACK
+from ame_json.models.single_flight import async_single_flight, make_flight_key
+
 
 type ComputationFunction[R] = Callable[..., Coroutine[Any, Any, R]]
 
 
 class AsyncComputation[R]:
-    def __init__(self, func: ComputationFunction[R], func_kwargs: dict | None = None):
+    def __init__(
+        self,
+        func: ComputationFunction[R],
+        func_kwargs: dict | None = None,
+        depends_on: list[str] | None = None,
+        priority: int = 0,
+        timeout: float | None = None,
+        fallback: Any = NO_FALLBACK,
+        group: str | None = None,
+        single_flight: bool = False,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        hedge_after: float | None = None,
+    ):
         self.func = func
         self.func_kwargs = func_kwargs or {}
+        self.depends_on = list(depends_on or [])
+        self.priority = priority
+        self.timeout = timeout
+        self.fallback = fallback
+        self.group = group
+        self.single_flight = single_flight
+        self.chunk_size = chunk_size
+        # async generator functions stream their items in chunks
+        self.is_streaming = inspect.isasyncgenfunction(func)
+        self.hedge_after = hedge_after
+
+        ensure_hedgeable(hedge_after, self.is_streaming, single_flight)
+        ensure_chunk_size(chunk_size)
 
     def __repr__(self):
         return f"<AsyncComputation func={self.func.__name__}>"
@@ -49,5 +86,50 @@ class AsyncComputation[R]:
     async def _serialize(self):
         return await self.run()
 
-    async def run(self) -> R:
-        return await self.func(**self.func_kwargs)
+    def get_kwargs(self, **dependency_kwargs: Any) -> dict[str, Any]:
+        if not dependency_kwargs:
+            return self.func_kwargs
+
+        return {**self.func_kwargs, **dependency_kwargs}
+
+    def get_cached(self) -> tuple[bool, R | None]:
+        """
+        Returns `(True, result)` when the result is already in the cache.
+        """
+        if self.depends_on or self.is_streaming:
+            return False, None
+
+        return computation_cache.lookup(self.func, self.func_kwargs, count_miss=False)
+
+    async def run(self, **dependency_kwargs: Any) -> R:
+        kwargs = self.get_kwargs(**dependency_kwargs)
+
+        if self.is_streaming:
+            return [item async for item in self.func(**kwargs)]
+
+        found, result = computation_cache.lookup(self.func, kwargs)
+
+        if found:
+            return result
+
+        key = make_flight_key(self.func, kwargs) if self.single_flight else None
+
+        if key is None:
+            return await self._call(kwargs)
+
+        # identical calls already running on this loop share their result
+        return await async_single_flight.run(key, lambda: self._call(kwargs))
+
+    async def _call(self, kwargs: dict[str, Any]) -> R:
+        result = await self.func(**kwargs)
+        computation_cache.store(self.func, kwargs, result)
+
+        return result
+
+    async def read_chunks(self, **dependency_kwargs: Any) -> ComputationChunk:
+        """
+        Reads the first chunk of a streaming computation.
+        """
+        iterator = self.func(**self.get_kwargs(**dependency_kwargs))
+
+        return await read_async_chunk(aiter(iterator), self.chunk_size)
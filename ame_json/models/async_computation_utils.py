@@ -1,34 +1,76 @@
+import asyncio
 from collections.abc import AsyncGenerator
+from concurrent.futures import Executor, Future
 from typing import Any, Callable
 
-from pydantic import BaseModel
-
-from ame_json.models.utils import handle_model_iterable, prepare_data_str
+from ame_json.models.cancellation import CancellationToken
+from ame_json.models.computation_item import ComputationItem
+from ame_json.models.computation_scheduler import (
+    ComputationScheduler,
+    has_free_slot,
+    is_sync_computation,
+)
 
 from ame_json.models.progressive_streamer_context import ProgressiveStreamerContext
 
 
-def handle_list_generator(
-    value_list: list[BaseModel],
-    computations: list,
-    layer_items: list,
-    context: ProgressiveStreamerContext,
-) -> list[dict]:
-    results = []
+def run_computation(
+    value: Any,
+    executor: Executor,
+    dependency_kwargs: dict[str, Any],
+    token: CancellationToken | None = None,
+) -> asyncio.Future | Future:
+    if is_sync_computation(value):
+        return value.submit(executor, token, **dependency_kwargs)
 
-    for value in value_list:
-        generator = handle_model_iterable(
-            computations,
-            layer_items,
-            value,
-            context,
-        )
+    if value.is_streaming:
+        return asyncio.ensure_future(value.read_chunks(**dependency_kwargs))
+
+    return asyncio.ensure_future(value.run(**dependency_kwargs))
+
+
+class AsyncComputationScheduler(ComputationScheduler[asyncio.Future]):
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+
+        self._loop = asyncio.get_running_loop()
+        self._wakeup: asyncio.Future = self._loop.create_future()
+
+    def _set_wakeup(self):
+        if not self._wakeup.done():
+            self._wakeup.set_result(None)
+
+    def wake(self):
+        self._loop.call_soon_threadsafe(self._set_wakeup)
 
-        result_list = [v for v in generator]
+    def get_wakeup(self) -> asyncio.Future:
+        if self._wakeup.done() and not self.granted:
+            self._wakeup = self._loop.create_future()
 
-        results.extend(result_list)
+        return self._wakeup
 
-    return results
+    def wrap(self, future: Any) -> asyncio.Future:
+        if isinstance(future, Future):
+            return asyncio.wrap_future(future)
+
+        return future
+
+    def can_start(self, value: Any) -> bool:
+        # async computations start right away, sync ones wait for a free worker
+        if not is_sync_computation(value):
+            return True
+
+        return has_free_slot(
+            value.get_executor(self.executor), self.pending, self.executor
+        )
+
+    def submit(
+        self,
+        item: ComputationItem,
+        dependency_kwargs: dict[str, Any],
+        token: CancellationToken,
+    ) -> asyncio.Future | Future:
+        return run_computation(item.value, self.executor, dependency_kwargs, token)
 
 
 async def handle_computations(
@@ -36,33 +78,53 @@ async def handle_computations(
     layer_items: list,
     get_stream_completed_fun: Callable[..., bool],
     context: ProgressiveStreamerContext,
+    executor: Executor,
+    deadline_at: float | None = None,
+    scheduler: AsyncComputationScheduler | None = None,
 ) -> AsyncGenerator[bytes, Any]:
-    new_layers = []
-
-    while computations:
-        field_name, value = computations.pop(0)
-        placeholder_value = "$" + str(context.placeholder_mapper[field_name])
-        result = await value.run()
-
-        if isinstance(result, list):
-            result_list = handle_list_generator(
-                result,
-                computations,
-                layer_items,
-                context,
-            )
+    """
+    Runs the pending computations concurrently, highest priority first, and
+    yields each placeholder frame as soon as its task finishes. Nested models
+    are sent as layers as soon as they are known, and their computations
+    join the ones already running. Sync
+    computations are run in `executor` or in their own process pool,
+    computations with dependencies start once all of their inputs resolve,
+    and the ones that run out of time resolve to their fallback. A
+    `scheduler` that already started work, see `prefetch()`, is continued.
+    """
+    if scheduler is None:
+        scheduler = AsyncComputationScheduler(
+            computations,
+            layer_items,
+            get_stream_completed_fun,
+            context,
+            executor,
+            deadline_at,
+        )
 
-            yield prepare_data_str(
-                {placeholder_value: result_list}, get_stream_completed_fun
-            )
+    try:
+        for frame in scheduler.handle_layers():
+            yield frame
+
+        scheduler.start_computations()
 
-            continue
+        while scheduler.is_running():
+            await asyncio.wait(
+                [*scheduler.pending.keys(), scheduler.get_wakeup()],
+                timeout=scheduler.get_wait_timeout(),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
 
-        if isinstance(result, BaseModel):
-            new_layers.append((result, placeholder_value))
+            for task in scheduler.get_finished():
+                for frame in scheduler.handle_finished(task):
+                    yield frame
 
-            continue
+            for frame in scheduler.handle_layers():
+                yield frame
 
-        yield prepare_data_str({placeholder_value: result}, get_stream_completed_fun)
+            scheduler.start_computations()
 
-    layer_items.extend(new_layers)
+        for frame in scheduler.expire_remaining():
+            yield frame
+    finally:
+        scheduler.cancel_pending()
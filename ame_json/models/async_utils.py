@@ -2,7 +2,7 @@ from collections.abc import Callable, AsyncGenerator
 from typing import Any
 from pydantic import BaseModel
 from ame_json.models.field_handler import FieldHandler
-from ame_json.models.field_helper import get_field_list, prepare_data_str
+from ame_json.models.field_helper import encode_frame
 from ame_json.models.progressive_streamer_context import ProgressiveStreamerContext
 
 
@@ -13,18 +13,10 @@ async def handle_model_iterable(
     context: ProgressiveStreamerContext,
 ) -> AsyncGenerator[dict, Any]:
     try:
-        fields = get_field_list(model)
         new_computations = []
         new_layers_items = []
-        data = {}
-
-        for field_name in fields:
-            field_handler = FieldHandler(new_computations, new_layers_items, context)
-
-            data[field_name] = field_handler.handle_field(
-                field_name,
-                model,
-            )
+        field_handler = FieldHandler(new_computations, new_layers_items, context)
+        data = field_handler.handle_model(model)
 
         yield data
 
@@ -46,22 +38,16 @@ async def handle_model(
     placeholder_value: str | None = None,
 ) -> AsyncGenerator[bytes, Any]:
     try:
-        fields = get_field_list(model)
         new_computations = []
         new_layers_items = []
-        data = {}
-
-        for field_name in fields:
-            field_handler = FieldHandler(new_computations, new_layers_items, context)
-
-            data[field_name] = field_handler.handle_field(field_name, model)
-
-        effective_data = data
-
-        if placeholder_value:
-            effective_data = {placeholder_value: data}
-
-        yield prepare_data_str(effective_data, get_stream_completed_fun)
+        field_handler = FieldHandler(new_computations, new_layers_items, context)
+
+        yield encode_frame(
+            field_handler.iter_model(model),
+            get_stream_completed_fun(),
+            context.codec,
+            placeholder_value or None,
+        )
 
         if new_computations:
             computations.extend(new_computations)
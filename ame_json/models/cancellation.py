@@ -0,0 +1,84 @@
+import contextvars
+import threading
+from collections.abc import Callable
+from concurrent.futures import CancelledError
+from typing import Any
+
+
+class CancellationToken:
+    """
+    Cancelled when the computation it was handed to is no longer needed:
+    the stream was closed, or the computation ran out of time. Threads can't
+    be interrupted, so long running sync computations check it themselves.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: list[Callable[[], Any]] = []
+
+    def __repr__(self):
+        return f"<CancellationToken cancelled={self.is_cancelled}>"
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self):
+        with self._lock:
+            if self._event.is_set():
+                return
+
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+
+        for callback in callbacks:
+            callback()
+
+    def add_callback(self, callback: Callable[[], Any]):
+        """
+        Calls `callback` from the thread cancelling the token, right away if
+        it already is.
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+
+                return
+
+        callback()
+
+    def raise_if_cancelled(self):
+        if self.is_cancelled:
+            raise CancelledError()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """
+        Sleeps for up to `timeout` seconds, returning True as soon as the
+        token is cancelled.
+        """
+        return self._event.wait(timeout)
+
+
+_current_token: contextvars.ContextVar[CancellationToken | None] = (
+    contextvars.ContextVar("ame_json_cancel_token", default=None)
+)
+
+
+def get_cancel_token() -> CancellationToken:
+    """
+    Returns the token of the sync computation running in this thread. Outside
+    of a stream it is never cancelled.
+    """
+    return _current_token.get() or CancellationToken()
+
+
+def run_with_token[R](
+    token: CancellationToken | None, func: Callable[..., R], *args: Any, **kwargs: Any
+) -> R:
+    reset_token = _current_token.set(token)
+
+    try:
+        return func(*args, **kwargs)
+    finally:
+        _current_token.reset(reset_token)
@@ -1,16 +1,70 @@
+import inspect
+from collections.abc import Callable
+from concurrent.futures import Executor, Future
 from pydantic import SerializationInfo
 from pydantic_core import core_schema
 
-from typing import Any, Callable
+from typing import Any, Literal
+
+from ame_json.models.cancellation import CancellationToken, run_with_token
+from ame_json.models.computation_cache import computation_cache
+from ame_json.models.computation_hedging import ensure_hedgeable
+from ame_json.models.computation_stream import (
+    DEFAULT_CHUNK_SIZE,
+    ensure_chunk_size,
+    submit_chunk,
+)
+from ame_json.models.computation_timeout import NO_FALLBACK
+from ame_json.models.single_flight import single_flight, make_flight_key
+from ame_json.models.executors import ensure_picklable, get_process_executor
 
 
 type ComputationFunction[R] = Callable[..., R]
+type ExecutorKind = Literal["thread", "process"]
 
 
 class Computation[R]:
-    def __init__(self, func: ComputationFunction[R], func_kwargs: dict | None = None):
+    def __init__(
+        self,
+        func: ComputationFunction[R],
+        func_kwargs: dict | None = None,
+        executor: ExecutorKind = "thread",
+        depends_on: list[str] | None = None,
+        priority: int = 0,
+        timeout: float | None = None,
+        fallback: Any = NO_FALLBACK,
+        group: str | None = None,
+        single_flight: bool = False,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        hedge_after: float | None = None,
+    ):
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unknown executor: {executor}")
+
+        # generator functions stream their items in chunks of `chunk_size`
+        is_streaming = inspect.isgeneratorfunction(func)
+
+        if is_streaming and executor == "process":
+            raise ValueError("Generator computations can't run in a process pool")
+
+        ensure_hedgeable(hedge_after, is_streaming, single_flight)
+        ensure_chunk_size(chunk_size)
+
         self.func = func
         self.func_kwargs = func_kwargs or {}
+        self.executor = executor
+        self.depends_on = list(depends_on or [])
+        self.priority = priority
+        self.timeout = timeout
+        self.fallback = fallback
+        self.group = group
+        self.single_flight = single_flight
+        self.chunk_size = chunk_size
+        self.is_streaming = is_streaming
+        self.hedge_after = hedge_after
+
+        if executor == "process":
+            ensure_picklable(self.func, self.func_kwargs)
 
     def __repr__(self):
         return f"<Computation func={self.func.__name__}>"
@@ -48,5 +102,96 @@ class Computation[R]:
     def _serialize(self):
         return self.run()
 
-    def run(self) -> R:
-        return self.func(**self.func_kwargs)
+    def get_executor(self, default: Executor) -> Executor:
+        if self.executor == "process":
+            return get_process_executor()
+
+        return default
+
+    def get_kwargs(self, **dependency_kwargs: Any) -> dict[str, Any]:
+        if not dependency_kwargs:
+            return self.func_kwargs
+
+        return {**self.func_kwargs, **dependency_kwargs}
+
+    def get_cached(self) -> tuple[bool, R | None]:
+        """
+        Returns `(True, result)` when the result is already in the cache.
+        """
+        if self.depends_on or self.is_streaming:
+            return False, None
+
+        return computation_cache.lookup(self.func, self.func_kwargs, count_miss=False)
+
+    def submit(
+        self,
+        default: Executor,
+        token: CancellationToken | None = None,
+        /,
+        **dependency_kwargs: Any,
+    ) -> Future[R]:
+        """
+        Starts the computation in its executor, where `get_cancel_token()`
+        returns `token`. With `single_flight`, identical calls that are
+        already running share their result instead.
+        """
+        key = None
+
+        if self.single_flight:
+            key = make_flight_key(self.func, self.get_kwargs(**dependency_kwargs))
+
+        if key is None:
+            return self._submit(default, token, **dependency_kwargs)
+
+        # a shared call outlives the stream that started it
+        return single_flight.submit(
+            key, lambda: self._submit(default, None, **dependency_kwargs)
+        )
+
+    def _submit(
+        self,
+        default: Executor,
+        token: CancellationToken | None = None,
+        /,
+        **dependency_kwargs: Any,
+    ) -> Future[R]:
+        executor = self.get_executor(default)
+
+        if self.is_streaming:
+            iterator = self.func(**self.get_kwargs(**dependency_kwargs))
+
+            return submit_chunk(executor, iterator, self.chunk_size, token)
+
+        if self.executor != "process":
+            return executor.submit(run_with_token, token, self.run, **dependency_kwargs)
+
+        # process pools receive the bare function, since they pickle it
+        kwargs = self.get_kwargs(**dependency_kwargs)
+        found, result = computation_cache.lookup(self.func, kwargs)
+
+        if found:
+            future: Future[R] = Future()
+            future.set_result(result)
+
+            return future
+
+        future = executor.submit(self.func, **kwargs)
+        computation_cache.store_when_done(self.func, kwargs, future)
+
+        return future
+
+    def run(self, **dependency_kwargs: Any) -> R:
+        kwargs = self.get_kwargs(**dependency_kwargs)
+
+        if self.is_streaming:
+            return list(self.func(**kwargs))
+
+        found, result = computation_cache.lookup(self.func, kwargs)
+
+        if found:
+            return result
+
+        result = self.func(**kwargs)
+        computation_cache.store(self.func, kwargs, result)
+
+        return result
@@ -0,0 +1,207 @@
+from collections.abc import Callable, Coroutine, Sequence
+from concurrent.futures import Executor, Future
+from typing import Any
+
+from ame_json.models.async_computation import AsyncComputation
+from ame_json.models.cancellation import CancellationToken, run_with_token
+from ame_json.models.computation import Computation, ExecutorKind
+from ame_json.models.computation_item import ComputationItem
+from ame_json.models.computation_timeout import NO_FALLBACK
+from ame_json.models.executors import ensure_picklable
+
+
+type BatchFunction[K, R] = Callable[[list[K]], Sequence[R]]
+type AsyncBatchFunction[K, R] = Callable[[list[K]], Coroutine[Any, Any, Sequence[R]]]
+
+
+def ensure_hashable(key: Any):
+    try:
+        hash(key)
+    except TypeError as e:
+        raise TypeError(f"Batch key {key!r} must be hashable: {e}") from e
+
+
+def check_batch_results(keys: list, results: Sequence) -> list:
+    results = list(results)
+
+    if len(results) != len(keys):
+        raise ValueError(
+            f"Batch function returned {len(results)} results for {len(keys)} keys"
+        )
+
+    return results
+
+
+def load_batch(func: BatchFunction, keys: list) -> list:
+    # module level, so process pools can pickle it
+    return check_batch_results(keys, func(keys))
+
+
+def load_one(func: BatchFunction, key: Any) -> Any:
+    return load_batch(func, [key])[0]
+
+
+class BatchComputation[K, R](Computation[R]):
+    """
+    A computation that loads the result for `key` together with every other
+    batch computation of the same function that is ready in the same
+    scheduling tick: `func` is called once with the list of keys and returns
+    the results in the same order.
+    """
+
+    def __init__(
+        self,
+        func: BatchFunction[K, R],
+        key: K,
+        executor: ExecutorKind = "thread",
+        priority: int = 0,
+        timeout: float | None = None,
+        fallback: Any = NO_FALLBACK,
+        group: str | None = None,
+        max_batch_size: int | None = None,
+    ):
+        ensure_hashable(key)
+
+        super().__init__(
+            func,
+            executor=executor,
+            priority=priority,
+            timeout=timeout,
+            fallback=fallback,
+            group=group,
+        )
+
+        self.key = key
+        self.max_batch_size = max_batch_size
+
+        if executor == "process":
+            ensure_picklable(func, {"key": key})
+
+    def __repr__(self):
+        return f"<BatchComputation func={self.func.__name__} key={self.key!r}>"
+
+    def get_cached(self) -> tuple[bool, R | None]:
+        return False, None
+
+    def _submit(
+        self,
+        default: Executor,
+        token: CancellationToken | None = None,
+        /,
+        **dependency_kwargs: Any,
+    ) -> Future[R]:
+        executor = self.get_executor(default)
+
+        return executor.submit(run_with_token, token, load_one, self.func, self.key)
+
+    def run(self, **dependency_kwargs: Any) -> R:
+        return load_one(self.func, self.key)
+
+
+class AsyncBatchComputation[K, R](AsyncComputation[R]):
+    """
+    The async counterpart of `BatchComputation`.
+    """
+
+    def __init__(
+        self,
+        func: AsyncBatchFunction[K, R],
+        key: K,
+        priority: int = 0,
+        timeout: float | None = None,
+        fallback: Any = NO_FALLBACK,
+        group: str | None = None,
+        max_batch_size: int | None = None,
+    ):
+        ensure_hashable(key)
+
+        super().__init__(
+            func,
+            priority=priority,
+            timeout=timeout,
+            fallback=fallback,
+            group=group,
+        )
+
+        self.key = key
+        self.max_batch_size = max_batch_size
+
+    def __repr__(self):
+        return f"<AsyncBatchComputation func={self.func.__name__} key={self.key!r}>"
+
+    def get_cached(self) -> tuple[bool, R | None]:
+        return False, None
+
+    async def run(self, **dependency_kwargs: Any) -> R:
+        keys = [self.key]
+
+        return check_batch_results(keys, await self.func(keys))[0]
+
+
+def is_batch_computation(value: Any) -> bool:
+    return isinstance(value, (BatchComputation, AsyncBatchComputation))
+
+
+def get_batch_key(value: Any) -> tuple | None:
+    """
+    Returns what batch computations must share to be loaded together, or None
+    when `value` is not a batch computation.
+    """
+    if not is_batch_computation(value):
+        return None
+
+    return type(value), value.func, getattr(value, "executor", None), value.group
+
+
+class ComputationBatch:
+    """
+    The batch computations of one function that are loaded with a single
+    call. It is scheduled like any other computation and its result is split
+    between the placeholders of `items`.
+    """
+
+    def __init__(self, items: list[ComputationItem]):
+        first = items[0].value
+        timeouts = [
+            item.value.timeout for item in items if item.value.timeout is not None
+        ]
+
+        self.items = items
+        self.func = first.func
+        self.group = first.group
+        self.priority = max(item.value.priority for item in items)
+        self.timeout = min(timeouts) if timeouts else None
+        self.fallback = NO_FALLBACK
+        self.is_streaming = False
+        self.hedge_after = None
+        self.is_async = isinstance(first, AsyncBatchComputation)
+        # items sharing a key share its result
+        self.keys = list(dict.fromkeys(item.value.key for item in items))
+
+    def __repr__(self):
+        return f"<ComputationBatch func={self.func.__name__} size={len(self.keys)}>"
+
+    def get_executor(self, default: Executor) -> Executor:
+        return self.items[0].value.get_executor(default)
+
+    def submit(
+        self, default: Executor, token: CancellationToken | None = None
+    ) -> Future[list]:
+        executor = self.get_executor(default)
+
+        return executor.submit(run_with_token, token, load_batch, self.func, self.keys)
+
+    async def run(self) -> list:
+        return check_batch_results(self.keys, await self.func(self.keys))
+
+    def split(self, results: list) -> list[tuple[ComputationItem, Any]]:
+        by_key = dict(zip(self.keys, results))
+
+        return [(item, by_key[item.value.key]) for item in self.items]
+
+
+def get_batch_items(item: ComputationItem) -> list[ComputationItem]:
+    if isinstance(item.value, ComputationBatch):
+        return item.value.items
+
+    return [item]
@@ -0,0 +1,149 @@
+import dataclasses
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future
+from typing import Any
+
+
+type CacheKey = tuple[str, Hashable]
+
+
+@dataclasses.dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0
+
+
+def get_function_name(func: Callable) -> str:
+    return f"{func.__module__}.{func.__qualname__}"
+
+
+class ComputationCache:
+    """
+    An opt-in LRU cache of computation results shared by every streamer.
+    Entries are keyed by the function's qualified name and its keyword
+    arguments, so only functions registered with `configure()` whose kwargs
+    are hashable are cached. Closures sharing a qualified name share entries.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self.stats = CacheStats()
+        self._ttls: dict[str, float] = {}
+        self._entries: OrderedDict[CacheKey, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def configure(self, func: Callable, ttl: float):
+        """
+        Caches the results of `func` for `ttl` seconds.
+        """
+        self._ttls[get_function_name(func)] = ttl
+
+    def is_cached(self, func: Callable) -> bool:
+        return get_function_name(func) in self._ttls
+
+    def make_key(self, func: Callable, func_kwargs: dict[str, Any]) -> CacheKey | None:
+        name = get_function_name(func)
+
+        if name not in self._ttls:
+            return None
+
+        kwargs_key = tuple(sorted(func_kwargs.items()))
+
+        try:
+            hash(kwargs_key)
+        except TypeError:
+            return None
+
+        return name, kwargs_key
+
+    def lookup(
+        self, func: Callable, func_kwargs: dict[str, Any], count_miss: bool = True
+    ) -> tuple[bool, Any]:
+        """
+        Returns `(True, value)` on a hit and `(False, None)` otherwise.
+        """
+        key = self.make_key(func, func_kwargs)
+
+        if key is None:
+            return False, None
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                self.stats.size = len(self._entries)
+                entry = None
+
+            if entry is None:
+                if count_miss:
+                    self.stats.misses += 1
+
+                return False, None
+
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+
+            return True, entry[1]
+
+    def store(self, func: Callable, func_kwargs: dict[str, Any], value: Any):
+        key = self.make_key(func, func_kwargs)
+
+        if key is None:
+            return
+
+        expires_at = time.monotonic() + self._ttls[key[0]]
+
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+            self.stats.size = len(self._entries)
+
+    def store_when_done(
+        self, func: Callable, func_kwargs: dict[str, Any], future: Future
+    ):
+        if self.make_key(func, func_kwargs) is None:
+            return
+
+        def on_done(done: Future):
+            if not done.cancelled() and done.exception() is None:
+                self.store(func, func_kwargs, done.result())
+
+        future.add_done_callback(on_done)
+
+    def invalidate(self, func: Callable, func_kwargs: dict[str, Any] | None = None):
+        """
+        Drops the entry of one call, or every entry of `func` when
+        `func_kwargs` is None.
+        """
+        name = get_function_name(func)
+
+        with self._lock:
+            if func_kwargs is not None:
+                key = self.make_key(func, func_kwargs)
+
+                if key is not None:
+                    self._entries.pop(key, None)
+            else:
+                for key in [key for key in self._entries if key[0] == name]:
+                    del self._entries[key]
+
+            self.stats.size = len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.stats = CacheStats()
+
+
+computation_cache = ComputationCache()
@@ -0,0 +1,193 @@
+from typing import Any
+
+from pydantic import BaseModel
+
+from ame_json.models.computation_item import ComputationItem
+from ame_json.models.field_helper import get_field_list, is_computation
+from ame_json.models.serialization_plan import PRIMITIVE, STATIC, get_model_plan
+
+
+def get_dependency_graph(model: BaseModel) -> dict[str, list[str]]:
+    fields = get_field_list(model)
+    graph = {}
+
+    for field_name in fields:
+        value = getattr(model, field_name, None)
+
+        if not is_computation(value):
+            continue
+
+        for dependency in value.depends_on:
+            dependency_value = getattr(model, dependency, None)
+
+            if dependency not in fields or not is_computation(dependency_value):
+                raise ValueError(
+                    f"{model.__class__.__name__}.{field_name} depends on "
+                    f"{dependency!r}, which is not a computation field"
+                )
+
+            if dependency_value.is_streaming:
+                raise ValueError(
+                    f"{model.__class__.__name__}.{field_name} depends on "
+                    f"{dependency!r}, which streams its items"
+                )
+
+        graph[field_name] = value.depends_on
+
+    return graph
+
+
+def find_cycle(graph: dict[str, list[str]]) -> list[str] | None:
+    visited: set[str] = set()
+    path: list[str] = []
+
+    def visit(node: str) -> list[str] | None:
+        if node in path:
+            return [*path[path.index(node) :], node]
+
+        if node in visited:
+            return None
+
+        visited.add(node)
+        path.append(node)
+
+        for dependency in graph.get(node, []):
+            cycle = visit(dependency)
+
+            if cycle:
+                return cycle
+
+        path.pop()
+
+        return None
+
+    for node in graph:
+        cycle = visit(node)
+
+        if cycle:
+            return cycle
+
+    return None
+
+
+def validate_dependencies(model: BaseModel):
+    """
+    Rejects unknown dependencies and dependency cycles between the
+    computation fields of `model`, and of the models nested in it.
+    """
+    cycle = find_cycle(get_dependency_graph(model))
+
+    if cycle:
+        raise ValueError(
+            f"Computation dependency cycle in {model.__class__.__name__}: "
+            + " -> ".join(cycle)
+        )
+
+    for name, kind in get_model_plan(model.__class__).fields:
+        if kind not in (PRIMITIVE, STATIC):
+            validate_nested_dependencies(getattr(model, name, None))
+
+
+def validate_nested_dependencies(value: Any):
+    if isinstance(value, BaseModel):
+        validate_dependencies(value)
+    elif isinstance(value, (list, tuple)):
+        for inner_value in value:
+            validate_nested_dependencies(inner_value)
+    elif isinstance(value, dict):
+        for inner_value in value.values():
+            validate_nested_dependencies(inner_value)
+
+
+class ComputationGraph:
+    """
+    Tracks computations that wait on the results of other computations
+    discovered in the same model, so every node starts as soon as its
+    inputs resolve and every result is computed once.
+    """
+
+    def __init__(self):
+        self.waiting: list[ComputationItem] = []
+        self.required: set[Any] = set()
+        self.results: dict[Any, Any] = {}
+
+    def is_ready(self, item: ComputationItem) -> bool:
+        return all(value in self.results for value in item.dependencies.values())
+
+    def schedule(self, item: ComputationItem) -> bool:
+        """
+        Returns True when `item` can start now, otherwise parks it until its
+        dependencies resolve.
+        """
+        for value in item.dependencies.values():
+            self.required.add(value)
+
+        if self.is_ready(item):
+            return True
+
+        self.waiting.append(item)
+
+        return False
+
+    def get_kwargs(self, item: ComputationItem) -> dict[str, Any]:
+        return {name: self.results[value] for name, value in item.dependencies.items()}
+
+    def resolve(self, item: ComputationItem, result: Any) -> list[ComputationItem]:
+        """
+        Records the result of `item` and returns the computations it unblocked.
+        """
+        if item.value not in self.required:
+            return []
+
+        self.results[item.value] = result
+
+        ready = []
+        waiting = []
+
+        for waiting_item in self.waiting:
+            if self.is_ready(waiting_item):
+                ready.append(waiting_item)
+            else:
+                waiting.append(waiting_item)
+
+        self.waiting = waiting
+
+        return ready
+
+    def reject(self, item: ComputationItem) -> list[ComputationItem]:
+        """
+        Removes and returns the waiting computations that depend, directly or
+        not, on `item`, which will never produce a result.
+        """
+        failed = {item.value}
+        rejected = []
+        changed = True
+
+        while changed:
+            changed = False
+            waiting = []
+
+            for waiting_item in self.waiting:
+                if any(value in failed for value in waiting_item.dependencies.values()):
+                    failed.add(waiting_item.value)
+                    rejected.append(waiting_item)
+                    changed = True
+                else:
+                    waiting.append(waiting_item)
+
+            self.waiting = waiting
+
+        return rejected
+
+    def drain(self) -> list[ComputationItem]:
+        waiting = self.waiting
+        self.waiting = []
+
+        return waiting
+
+    def ensure_progress(self, has_pending: bool):
+        if self.waiting and not has_pending:
+            raise ValueError(
+                "Computations can't resolve their dependencies: "
+                + ", ".join(item.placeholder_value for item in self.waiting)
+            )
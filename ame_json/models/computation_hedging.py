@@ -0,0 +1,173 @@
+import dataclasses
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from ame_json.models.computation_cache import get_function_name
+
+
+DEFAULT_HEDGE_RATIO = 0.1
+DEFAULT_HEDGE_BURST = 10
+
+
+def ensure_hedgeable(
+    hedge_after: float | None, is_streaming: bool, single_flight: bool
+):
+    if hedge_after is None:
+        return
+
+    if is_streaming:
+        raise ValueError("Generator computations can't be hedged")
+
+    if single_flight:
+        raise ValueError("Single-flight computations can't be hedged")
+
+
+@dataclasses.dataclass
+class HedgeStats:
+    calls: int = 0
+    hedges: int = 0
+    denied: int = 0
+    wins: int = 0
+
+
+class HedgeBudget:
+    """
+    Caps the extra load hedging adds to each function. Every call earns
+    `ratio` of a hedge, up to `burst` saved hedges, and every hedge spends
+    one, so a brownout where every call is slow can't double the load.
+    """
+
+    def __init__(
+        self, ratio: float = DEFAULT_HEDGE_RATIO, burst: int = DEFAULT_HEDGE_BURST
+    ):
+        self.ratio = ratio
+        self.burst = burst
+        self._limits: dict[str, tuple[float, int]] = {}
+        self._tokens: dict[str, float] = {}
+        self._stats: dict[str, HedgeStats] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, func: Callable, ratio: float, burst: int | None = None):
+        """
+        Lets `func` hedge up to `ratio` of its calls, e.g. 0.05 for 5%.
+        """
+        if ratio < 0:
+            raise ValueError(f"Hedge ratio can't be negative, got: {ratio}")
+
+        name = get_function_name(func)
+
+        with self._lock:
+            self._limits[name] = (ratio, self.burst if burst is None else burst)
+            self._tokens.pop(name, None)
+
+    def _get_limit(self, name: str) -> tuple[float, int]:
+        return self._limits.get(name, (self.ratio, self.burst))
+
+    def _get_stats(self, name: str) -> HedgeStats:
+        return self._stats.setdefault(name, HedgeStats())
+
+    def record_call(self, func: Callable):
+        name = get_function_name(func)
+        ratio, burst = self._get_limit(name)
+
+        with self._lock:
+            self._get_stats(name).calls += 1
+            self._tokens[name] = min(self._tokens.get(name, burst) + ratio, burst)
+
+    def try_hedge(self, func: Callable) -> bool:
+        """
+        Spends one hedge of `func`'s budget, returns False when none is left.
+        """
+        name = get_function_name(func)
+        _, burst = self._get_limit(name)
+
+        with self._lock:
+            stats = self._get_stats(name)
+            tokens = self._tokens.get(name, burst)
+
+            if tokens < 1:
+                stats.denied += 1
+
+                return False
+
+            self._tokens[name] = tokens - 1
+            stats.hedges += 1
+
+            return True
+
+    def record_win(self, func: Callable):
+        with self._lock:
+            self._get_stats(get_function_name(func)).wins += 1
+
+    def get_stats(self, func: Callable) -> HedgeStats:
+        with self._lock:
+            return dataclasses.replace(self._get_stats(get_function_name(func)))
+
+    def clear(self):
+        with self._lock:
+            self._tokens.clear()
+            self._stats.clear()
+
+
+hedge_budget = HedgeBudget()
+
+
+class ComputationHedges[F]:
+    """
+    Tracks when the running futures of hedged computations are due for a
+    second, identical call, and pairs each hedge with the future it races.
+    """
+
+    def __init__(self):
+        self.due: dict[F, float] = {}
+        self.siblings: dict[F, F] = {}
+        self.hedges: set[F] = set()
+
+    def start(self, future: F, value: Any):
+        if value.hedge_after is None:
+            return
+
+        self.due[future] = time.monotonic() + value.hedge_after
+        hedge_budget.record_call(value.func)
+
+    def pop_due(self) -> list[F]:
+        """
+        Returns the futures whose hedge delay passed, each is considered once.
+        """
+        now = time.monotonic()
+        due = [future for future, due_at in self.due.items() if due_at <= now]
+
+        for future in due:
+            del self.due[future]
+
+        return due
+
+    def pair(self, future: F, hedge: F):
+        self.siblings[future] = hedge
+        self.siblings[hedge] = future
+        self.hedges.add(hedge)
+
+    def is_hedge(self, future: F) -> bool:
+        return future in self.hedges
+
+    def discard(self, future: F) -> F | None:
+        """
+        Forgets `future` and returns the future it was racing, if any.
+        """
+        self.due.pop(future, None)
+        self.hedges.discard(future)
+        sibling = self.siblings.pop(future, None)
+
+        if sibling is not None:
+            self.siblings.pop(sibling, None)
+            self.hedges.discard(sibling)
+
+        return sibling
+
+    def get_wait_timeout(self) -> float | None:
+        if not self.due:
+            return None
+
+        return max(min(self.due.values()) - time.monotonic(), 0)
@@ -0,0 +1,9 @@
+import dataclasses
+from typing import Any
+
+
+@dataclasses.dataclass
+class ComputationItem:
+    placeholder_value: str
+    value: Any
+    dependencies: dict[str, Any] = dataclasses.field(default_factory=dict)
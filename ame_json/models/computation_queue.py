@@ -0,0 +1,66 @@
+import heapq
+import itertools
+from collections.abc import Callable
+
+from ame_json.models.computation_item import ComputationItem
+
+
+def get_priority(item: ComputationItem) -> int:
+    return item.value.priority
+
+
+class ComputationQueue:
+    """
+    Computations that are ready to start, highest priority first and in
+    discovery order among equal priorities.
+    """
+
+    def __init__(self):
+        self._heap: list[tuple[int, int, ComputationItem]] = []
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, item: ComputationItem):
+        heapq.heappush(self._heap, (-get_priority(item), next(self._counter), item))
+
+    def peek(self) -> ComputationItem:
+        return self._heap[0][2]
+
+    def pop(self) -> ComputationItem:
+        return heapq.heappop(self._heap)[2]
+
+    def take(
+        self, predicate: Callable[[ComputationItem], bool], limit: int | None = None
+    ) -> list[ComputationItem]:
+        """
+        Removes and returns up to `limit` items matching `predicate`, in
+        queue order.
+        """
+        taken = []
+        kept = []
+
+        for entry in sorted(self._heap):
+            if (limit is None or len(taken) < limit) and predicate(entry[2]):
+                taken.append(entry[2])
+            else:
+                kept.append(entry)
+
+        self._heap = kept
+
+        return taken
+
+    def drain(self) -> list[ComputationItem]:
+        items = [item for _, _, item in sorted(self._heap)]
+        self._heap = []
+
+        return items
+
+
+def sort_by_priority[T](futures: list[T], pending: dict[T, ComputationItem]) -> list[T]:
+    """
+    Orders futures that finished at the same moment so higher priority
+    frames are flushed first, keeping the start order otherwise.
+    """
+    return sorted(futures, key=lambda future: -get_priority(pending[future]))
@@ -0,0 +1,646 @@
+from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Executor
+from typing import Any, Protocol
+
+from pydantic import BaseModel
+from pydantic_core import to_jsonable_python
+
+from ame_json.models.cancellation import CancellationToken
+from ame_json.models.computation import Computation
+from ame_json.models.computation_batch import (
+    ComputationBatch,
+    get_batch_items,
+    get_batch_key,
+)
+from ame_json.models.computation_graph import ComputationGraph
+from ame_json.models.computation_hedging import ComputationHedges, hedge_budget
+from ame_json.models.computation_item import ComputationItem
+from ame_json.models.computation_queue import ComputationQueue, sort_by_priority
+from ame_json.models.computation_stream import (
+    ComputationChunk,
+    get_append_key,
+    get_close_key,
+)
+from ame_json.models.computation_timeout import (
+    ComputationTimeouts,
+    get_fallback,
+    has_fallback,
+)
+from ame_json.models.executors import get_executor_capacity
+from ame_json.models.field_helper import encode_frame
+from ame_json.models.progressive_streamer_context import ProgressiveStreamerContext
+from ame_json.models.resource_groups import GroupWaiter, get_group
+from ame_json.models.serialization_plan import is_static_model
+from ame_json.models.single_flight import single_flight
+from ame_json.models.utils import handle_model, handle_model_iterable
+
+
+def handle_list_generator(
+    value_list: list[BaseModel],
+    computations: list,
+    layer_items: list,
+    context: ProgressiveStreamerContext,
+):
+    # lists of static models are serialized by pydantic-core in one call
+    if value_list and all(is_static_model(value) for value in value_list):
+        return to_jsonable_python(value_list, by_alias=False)
+
+    results = []
+
+    for value in value_list:
+        if not isinstance(value, BaseModel):
+            results.append(value)
+
+            continue
+
+        generator = handle_model_iterable(
+            computations,
+            layer_items,
+            value,
+            context,
+        )
+
+        result_list = [v for v in generator]
+
+        results.extend(result_list)
+
+    return results
+
+
+def handle_result(
+    item: ComputationItem,
+    result: Any,
+    computations: list,
+    layer_items: list,
+    get_stream_completed_fun: Callable[..., bool],
+    context: ProgressiveStreamerContext,
+) -> bytes | None:
+    """
+    Returns the frame resolving the placeholder of `item`, or None when the
+    result is a model that is queued as a new layer.
+    """
+    placeholder_value = item.placeholder_value
+
+    if isinstance(result, list):
+        result_list = handle_list_generator(
+            result,
+            computations,
+            layer_items,
+            context,
+        )
+
+        return encode_frame(
+            ((placeholder_value, result_list),),
+            get_stream_completed_fun(),
+            context.codec,
+        )
+
+    if isinstance(result, BaseModel):
+        layer_items.append((result, placeholder_value))
+
+        return None
+
+    return encode_frame(
+        ((placeholder_value, result),), get_stream_completed_fun(), context.codec
+    )
+
+
+def is_sync_computation(value: Any) -> bool:
+    if isinstance(value, ComputationBatch):
+        return not value.is_async
+
+    return isinstance(value, Computation)
+
+
+def has_free_slot(
+    executor: Executor, pending: dict[Any, ComputationItem], default: Executor
+) -> bool:
+    capacity = get_executor_capacity(executor)
+
+    if capacity is None:
+        return True
+
+    in_flight = 0
+
+    for item in pending.values():
+        # async computations don't take a worker
+        if not is_sync_computation(item.value):
+            continue
+
+        if item.value.get_executor(default) is executor:
+            in_flight += 1
+
+    return in_flight < capacity
+
+
+class FutureLike(Protocol):
+    def done(self) -> bool: ...
+
+    def result(self) -> Any: ...
+
+    def cancel(self) -> bool: ...
+
+    def cancelled(self) -> bool: ...
+
+    def exception(self) -> BaseException | None: ...
+
+    def add_done_callback(self, fn: Callable[[Any], Any]) -> None: ...
+
+
+class ComputationScheduler[F: FutureLike](ABC):
+    """
+    Holds the computations of one `handle_computations` run: the layers not
+    yet serialized, the ones waiting on dependencies, the ready queue, the
+    ones waiting for a resource group slot and the running futures. Subclasses decide how a computation is
+    started and how to wait for it.
+    """
+
+    def __init__(
+        self,
+        computations: list[ComputationItem],
+        layer_items: list,
+        get_stream_completed_fun: Callable[..., bool],
+        context: ProgressiveStreamerContext,
+        executor: Executor,
+        deadline_at: float | None = None,
+    ):
+        self.computations = computations
+        self.layer_items = layer_items
+        self.get_stream_completed_fun = get_stream_completed_fun
+        self.context = context
+        self.executor = executor
+        self.pending: dict[F, ComputationItem] = {}
+        self.tokens: dict[F, CancellationToken] = {}
+        self.graph = ComputationGraph()
+        self.queue = ComputationQueue()
+        self.timeouts: ComputationTimeouts[F] = ComputationTimeouts(deadline_at)
+        self.hedges: ComputationHedges[F] = ComputationHedges()
+        self.blocked: dict[GroupWaiter, ComputationItem] = {}
+        # appended to from the thread that released the group slot
+        self.granted: deque[GroupWaiter] = deque()
+        # placeholders of the streaming computations that sent a chunk
+        self.streams: set[str] = set()
+
+    @abstractmethod
+    def can_start(self, value: Any) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def submit(
+        self,
+        item: ComputationItem,
+        dependency_kwargs: dict[str, Any],
+        token: CancellationToken,
+    ) -> Any:
+        """
+        Starts `item` and returns the future of the call itself, see `wrap()`.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def wake(self):
+        """
+        Interrupts the wait for a finished future, from any thread.
+        """
+        raise NotImplementedError
+
+    def wrap(self, future: Any) -> F:
+        """
+        Turns the future of a started computation, or of the next chunk of a
+        streaming one, into one this scheduler can wait on.
+        """
+        return future
+
+    def is_running(self) -> bool:
+        has_work = bool(self.pending or self.blocked)
+
+        return has_work and not self.timeouts.is_past_deadline()
+
+    def on_grant(self, waiter: GroupWaiter):
+        self.granted.append(waiter)
+        self.wake()
+
+    def acquire_group(self, item: ComputationItem) -> bool:
+        """
+        Returns True when `item` may start now, otherwise it waits in
+        `blocked` until its resource group grants it a slot.
+        """
+        group = get_group(item.value.group)
+
+        if group is None:
+            return True
+
+        waiter = group.acquire(item.value.priority, self.on_grant)
+
+        if waiter is None:
+            return True
+
+        self.blocked[waiter] = item
+
+        return False
+
+    def launch(self, item: ComputationItem) -> F:
+        token = CancellationToken()
+        call = self.submit(item, self.graph.get_kwargs(item), token)
+        future = self.wrap(call)
+        group = get_group(item.value.group)
+
+        self.pending[future] = item
+        self.tokens[future] = token
+
+        # a cancelled wrapper or single-flight waiter doesn't stop a running
+        # thread, the slot is held until the call itself is done
+        if group is not None:
+            single_flight.get_call(call).add_done_callback(lambda _: group.release())
+
+        return future
+
+    def start(self, item: ComputationItem):
+        future = self.launch(item)
+
+        self.timeouts.start(future, item.value)
+        self.hedges.start(future, item.value)
+
+    def start_hedges(self):
+        """
+        Races a second, identical call against the computations that are
+        still running after their `hedge_after` delay, when a worker, a
+        resource group slot and the function's hedge budget allow it.
+        """
+        for future in self.hedges.pop_due():
+            item = self.pending.get(future)
+
+            if item is None or future.done() or not self.can_start(item.value):
+                continue
+
+            group = get_group(item.value.group)
+
+            if group is not None and not group.try_acquire():
+                continue
+
+            if not hedge_budget.try_hedge(item.value.func):
+                if group is not None:
+                    group.release()
+
+                continue
+
+            # releases the group slot taken above once it finishes
+            hedge = self.launch(item)
+
+            self.hedges.pair(future, hedge)
+            self.timeouts.share(future, hedge)
+
+    def get_wait_timeout(self) -> float | None:
+        limits = [
+            limit
+            for limit in (
+                self.timeouts.get_wait_timeout(),
+                self.hedges.get_wait_timeout(),
+            )
+            if limit is not None
+        ]
+
+        return min(limits) if limits else None
+
+    def start_computations(self):
+        if self.timeouts.is_past_deadline():
+            return
+
+        self.start_hedges()
+
+        while self.granted:
+            self.start(self.blocked.pop(self.granted.popleft()))
+
+        while self.computations:
+            item = self.computations.pop(0)
+
+            if self.graph.schedule(item):
+                self.queue.push(item)
+
+        while self.queue and self.can_start(self.queue.peek().value):
+            item = self.collect_batch(self.queue.pop())
+
+            if self.acquire_group(item):
+                self.start(item)
+
+        self.graph.ensure_progress(bool(self.pending or self.blocked))
+
+    def collect_batch(self, item: ComputationItem) -> ComputationItem:
+        """
+        Joins the ready batch computations sharing the function of `item`
+        into one computation, so their keys are loaded with a single call.
+        """
+        key = get_batch_key(item.value)
+
+        if key is None:
+            return item
+
+        limit = item.value.max_batch_size
+        others = self.queue.take(
+            lambda other: get_batch_key(other.value) == key,
+            None if limit is None else limit - 1,
+        )
+
+        return ComputationItem(
+            placeholder_value=item.placeholder_value,
+            value=ComputationBatch([item, *others]),
+        )
+
+    def get_finished(self) -> list[F]:
+        finished = [
+            future
+            for future in self.pending
+            if future.done() or self.timeouts.is_expired(future)
+        ]
+
+        return sort_by_priority(finished, self.pending)
+
+    def to_frame(self, item: ComputationItem, result: Any) -> bytes | None:
+        return handle_result(
+            item,
+            result,
+            self.computations,
+            self.layer_items,
+            self.get_stream_completed_fun,
+            self.context,
+        )
+
+    def to_chunk_frames(
+        self, item: ComputationItem, chunk: ComputationChunk
+    ) -> list[bytes]:
+        frames = []
+
+        if chunk.items:
+            items = handle_list_generator(
+                chunk.items,
+                self.computations,
+                self.layer_items,
+                self.context,
+            )
+
+            frames.append(
+                encode_frame(
+                    ((get_append_key(item.placeholder_value), items),),
+                    self.get_stream_completed_fun(),
+                    self.context.codec,
+                )
+            )
+
+        if chunk.next is None:
+            frames.append(
+                encode_frame(
+                    ((get_close_key(item.placeholder_value), True),),
+                    self.get_stream_completed_fun(),
+                    self.context.codec,
+                )
+            )
+
+        return frames
+
+    def to_frames(self, resolved: list[tuple[ComputationItem, Any]]) -> list[bytes]:
+        frames = []
+
+        for item, result in resolved:
+            if isinstance(result, ComputationChunk):
+                frames.extend(self.to_chunk_frames(item, result))
+
+                continue
+
+            frame = self.to_frame(item, result)
+
+            if frame is not None:
+                frames.append(frame)
+
+        return frames
+
+    def handle_finished(self, future: F) -> list[bytes]:
+        """
+        Resolves the placeholder of a finished or timed out future, starts
+        the work it unblocked and returns the frames to send.
+        """
+        if future not in self.pending:
+            # the losing side of a hedge that finished at the same time
+            return []
+
+        item = self.pending.pop(future)
+        is_hedge = self.hedges.is_hedge(future)
+        sibling = self.hedges.discard(future)
+
+        if sibling is not None and self.settle_hedge(future, sibling):
+            return []
+
+        if is_hedge and future.done():
+            hedge_budget.record_win(item.value.func)
+
+        if future.done() and isinstance(future.result(), ComputationChunk):
+            frames = self.handle_chunk(future, item, future.result())
+        else:
+            self.timeouts.discard(future)
+
+            if future.done():
+                self.tokens.pop(future, None)
+                resolved = self.resolve(item, future.result())
+            else:
+                self.cancel(future)
+                resolved = self.expire(item)
+
+            frames = self.to_frames(resolved)
+
+        # refill the freed slots before handing the frames out
+        self.start_computations()
+
+        return frames
+
+    def settle_hedge(self, future: F, sibling: F) -> bool:
+        """
+        Cancels the call `future` raced against. Returns True when `future`
+        failed instead, so the result of its sibling is awaited.
+        """
+        failed = (
+            future.done() and not future.cancelled() and future.exception() is not None
+        )
+
+        if failed:
+            self.tokens.pop(future, None)
+            self.timeouts.discard(future)
+
+            return True
+
+        self.pending.pop(sibling, None)
+        self.cancel(sibling)
+        self.timeouts.discard(sibling)
+
+        return False
+
+    def handle_chunk(
+        self, future: F, item: ComputationItem, chunk: ComputationChunk
+    ) -> list[bytes]:
+        """
+        Sends the items read by a streaming computation and waits for its next
+        chunk, under the same timeout. The next chunk is read while this one
+        is being sent, never further ahead.
+        """
+        token = self.tokens.pop(future, None)
+
+        if chunk.next is None:
+            self.timeouts.discard(future)
+            self.streams.discard(item.placeholder_value)
+        else:
+            next_future = self.wrap(chunk.next())
+
+            self.streams.add(item.placeholder_value)
+            self.pending[next_future] = item
+            self.timeouts.transfer(future, next_future)
+
+            if token is not None:
+                self.tokens[next_future] = token
+
+        return self.to_frames([(item, chunk)])
+
+    def resolve(
+        self, item: ComputationItem, result: Any
+    ) -> list[tuple[ComputationItem, Any]]:
+        if isinstance(item.value, ComputationBatch):
+            resolved = item.value.split(result)
+        else:
+            resolved = [(item, result)]
+
+        for member, value in resolved:
+            self.computations.extend(self.graph.resolve(member, value))
+
+        return resolved
+
+    def expire(self, item: ComputationItem) -> list[tuple[ComputationItem, Any]]:
+        if isinstance(item.value, ComputationBatch):
+            return [
+                expired
+                for member in item.value.items
+                for expired in self.expire(member)
+            ]
+
+        fallback = self.get_expired_value(item)
+
+        if has_fallback(item.value):
+            self.computations.extend(self.graph.resolve(item, fallback))
+
+            return [(item, fallback)]
+
+        rejected = self.graph.reject(item)
+
+        return [(item, fallback), *[(r, get_fallback(r.value)) for r in rejected]]
+
+    def get_expired_value(self, item: ComputationItem) -> Any:
+        # a stream that already sent items is closed instead
+        if item.placeholder_value in self.streams:
+            self.streams.discard(item.placeholder_value)
+
+            return ComputationChunk([])
+
+        return get_fallback(item.value)
+
+    def has_work(self) -> bool:
+        return bool(
+            self.layer_items
+            or self.pending
+            or self.blocked
+            or self.queue
+            or self.graph.waiting
+            or self.computations
+        )
+
+    def expire_remaining(self) -> list[bytes]:
+        """
+        Resolves every computation that has not finished by the deadline with
+        its fallback.
+        """
+        frames = []
+
+        while self.has_work():
+            # layers are still sent, only their computations expire
+            frames.extend(self.handle_layers())
+
+            for future in self.pending:
+                self.cancel(future)
+
+            items = [
+                *[
+                    item
+                    for future, item in self.pending.items()
+                    if not self.hedges.is_hedge(future)
+                ],
+                *self.withdraw_blocked(),
+                *self.queue.drain(),
+                *self.graph.drain(),
+                *self.computations,
+            ]
+
+            self.pending.clear()
+            self.computations.clear()
+
+            members = [member for item in items for member in get_batch_items(item)]
+
+            frames.extend(
+                self.to_frames([(m, self.get_expired_value(m)) for m in members])
+            )
+
+        return frames
+
+    def withdraw_blocked(self) -> list[ComputationItem]:
+        items = []
+
+        for waiter, item in self.blocked.items():
+            group = get_group(item.value.group)
+
+            if group is not None and not group.cancel(waiter):
+                group.release()
+
+            items.append(item)
+
+        self.blocked.clear()
+        self.granted.clear()
+
+        return items
+
+    def cancel(self, future: F):
+        """
+        Cancels `future` if it has not started, and signals its cancellation
+        token in case it has.
+        """
+        future.cancel()
+        token = self.tokens.pop(future, None)
+
+        if token is not None:
+            token.cancel()
+
+    def cancel_pending(self):
+        for future in self.pending:
+            self.cancel(future)
+
+        self.pending.clear()
+        self.withdraw_blocked()
+
+    def handle_layers(self) -> list[bytes]:
+        """
+        Serializes the models queued as new layers, so the computations they
+        hold are scheduled together with the ones already running, instead of
+        after them.
+        """
+        frames = []
+
+        while self.layer_items:
+            model, placeholder_value = self.layer_items.pop(0)
+
+            frames.extend(
+                handle_model(
+                    self.computations,
+                    self.layer_items,
+                    model,
+                    self.context,
+                    self.get_stream_completed_fun,
+                    placeholder_value=placeholder_value,
+                )
+            )
+
+        return frames
@@ -0,0 +1,161 @@
+import asyncio
+import dataclasses
+import functools
+import itertools
+import threading
+from collections.abc import AsyncIterator, Callable, Iterator
+from concurrent.futures import Executor, Future
+from typing import Any
+
+from ame_json.models.cancellation import CancellationToken, run_with_token
+
+
+DEFAULT_CHUNK_SIZE = 100
+
+# frames keyed "$N+" append items to the list of placeholder "$N", and the
+# frame keyed "$N!" closes it
+APPEND_SUFFIX = "+"
+CLOSE_SUFFIX = "!"
+
+
+@dataclasses.dataclass
+class ComputationChunk:
+    """
+    Items read from a generator computation, and a function starting to read
+    the next chunk, returning its future, or None when the generator is
+    exhausted. The scheduler only calls it once this chunk is handed out, so
+    a slow client doesn't let the generator run ahead of it.
+    """
+
+    items: list
+    next: Callable[[], Any] | None = None
+
+
+def get_append_key(placeholder_value: str) -> str:
+    return placeholder_value + APPEND_SUFFIX
+
+
+def get_close_key(placeholder_value: str) -> str:
+    return placeholder_value + CLOSE_SUFFIX
+
+
+def ensure_chunk_size(chunk_size: int):
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be at least 1, got: {chunk_size}")
+
+
+class ChunkReader:
+    """
+    Reads a generator computation in chunks, one executor task per chunk.
+    Once `token` is cancelled the generator is closed, right away when it
+    is suspended between chunks, otherwise after the chunk being read, so
+    its `finally` blocks run even when the stream stops reading it.
+    """
+
+    def __init__(
+        self,
+        executor: Executor,
+        iterator: Iterator,
+        chunk_size: int,
+        token: CancellationToken | None = None,
+    ):
+        self.executor = executor
+        self.iterator = iterator
+        self.chunk_size = chunk_size
+        self.token = token
+        self._lock = threading.Lock()
+        self._reading = False
+        self._cancelled = False
+
+        if token is not None:
+            token.add_callback(self.close)
+
+    def submit(self) -> Future[ComputationChunk]:
+        return self.executor.submit(run_with_token, self.token, self.read)
+
+    def read(self) -> ComputationChunk:
+        with self._lock:
+            if self._cancelled:
+                return ComputationChunk([])
+
+            self._reading = True
+
+        try:
+            items = list(itertools.islice(self.iterator, self.chunk_size))
+        finally:
+            with self._lock:
+                self._reading = False
+                cancelled = self._cancelled
+
+            if cancelled:
+                self.iterator.close()
+
+        if cancelled or len(items) < self.chunk_size:
+            return ComputationChunk(items)
+
+        return ComputationChunk(items, self.submit)
+
+    def close(self):
+        with self._lock:
+            self._cancelled = True
+
+            # a generator can't be closed while it runs, read() closes it
+            if self._reading:
+                return
+
+        self.iterator.close()
+
+
+def submit_chunk(
+    executor: Executor,
+    iterator: Iterator,
+    chunk_size: int,
+    token: CancellationToken | None = None,
+) -> Future[ComputationChunk]:
+    return ChunkReader(executor, iterator, chunk_size, token).submit()
+
+
+async def read_async_chunk(
+    iterator: AsyncIterator, chunk_size: int
+) -> ComputationChunk:
+    items = []
+
+    async for item in iterator:
+        items.append(item)
+
+        if len(items) == chunk_size:
+            break
+
+    if len(items) < chunk_size:
+        return ComputationChunk(items)
+
+    return ComputationChunk(
+        items, functools.partial(submit_async_chunk, iterator, chunk_size)
+    )
+
+
+_closing: set[asyncio.Task] = set()
+
+
+def submit_async_chunk(
+    iterator: AsyncIterator, chunk_size: int
+) -> asyncio.Future[ComputationChunk]:
+    task = asyncio.ensure_future(read_async_chunk(iterator, chunk_size))
+    task.add_done_callback(lambda _: close_cancelled(task, iterator))
+
+    return task
+
+
+def close_cancelled(task: asyncio.Future, iterator: AsyncIterator):
+    """
+    Closes the async generator of a chunk read that was cancelled, which is
+    left suspended when the read is cancelled before it started.
+    """
+    aclose = getattr(iterator, "aclose", None)
+
+    if not task.cancelled() or aclose is None:
+        return
+
+    closing = asyncio.ensure_future(aclose())
+    _closing.add(closing)
+    closing.add_done_callback(_closing.discard)
@@ -0,0 +1,85 @@
+import time
+from typing import Any
+
+
+class _NoFallback:
+    def __repr__(self):
+        return "NO_FALLBACK"
+
+
+NO_FALLBACK: Any = _NoFallback()
+
+TIMEOUT_ERROR = "timeout"
+
+
+def get_fallback(value: Any) -> Any:
+    """
+    Returns the value that resolves the placeholder of a computation that ran
+    out of time: its fallback, or an error marker when it has none.
+    """
+    if value.fallback is NO_FALLBACK:
+        return {"error": TIMEOUT_ERROR}
+
+    return value.fallback
+
+
+def has_fallback(value: Any) -> bool:
+    return value.fallback is not NO_FALLBACK
+
+
+def get_deadline_at(deadline: float | None) -> float | None:
+    if deadline is None:
+        return None
+
+    return time.monotonic() + deadline
+
+
+class ComputationTimeouts[F]:
+    """
+    Tracks the per-computation timeouts of the running futures and the
+    deadline of the whole stream.
+    """
+
+    def __init__(self, deadline_at: float | None):
+        self.deadline_at = deadline_at
+        self.expiries: dict[F, float] = {}
+
+    def start(self, future: F, value: Any):
+        if value.timeout is not None:
+            self.expiries[future] = time.monotonic() + value.timeout
+
+    def transfer(self, future: F, next_future: F):
+        expiry = self.expiries.pop(future, None)
+
+        if expiry is not None:
+            self.expiries[next_future] = expiry
+
+    def share(self, future: F, other: F):
+        if future in self.expiries:
+            self.expiries[other] = self.expiries[future]
+
+    def discard(self, future: F):
+        self.expiries.pop(future, None)
+
+    def is_expired(self, future: F) -> bool:
+        expiry = self.expiries.get(future)
+
+        return expiry is not None and expiry <= time.monotonic()
+
+    def is_past_deadline(self) -> bool:
+        return self.deadline_at is not None and self.deadline_at <= time.monotonic()
+
+    def get_wait_timeout(self) -> float | None:
+        """
+        Returns how long to wait for a future before a timeout or the deadline
+        needs handling, or None to wait without a limit.
+        """
+        limits = list(self.expiries.values())
+
+        if self.deadline_at is not None:
+            limits.append(self.deadline_at)
+
+        if not limits:
+            return None
+
+        return max(min(limits) - time.monotonic(), 0)
@@ -1,34 +1,55 @@
 from collections.abc import Generator
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    InvalidStateError,
+    wait,
+)
+import threading
 from typing import Any, Callable
 
-from pydantic import BaseModel
-
-from ame_json.models.utils import handle_model_iterable, prepare_data_str
+from ame_json.models.cancellation import CancellationToken
+from ame_json.models.computation_item import ComputationItem
+from ame_json.models.computation_scheduler import ComputationScheduler, has_free_slot
 
 from ame_json.models.progressive_streamer_context import ProgressiveStreamerContext
 
 
-def handle_list_generator(
-    value_list: list[BaseModel],
-    computations: list,
-    layer_items: list,
-    context: ProgressiveStreamerContext,
-):
-    results = []
+class ThreadComputationScheduler(ComputationScheduler[Future]):
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
 
-    for value in value_list:
-        generator = handle_model_iterable(
-            computations,
-            layer_items,
-            value,
-            context,
-        )
+        self._wakeup: Future = Future()
+        self._wakeup_lock = threading.Lock()
 
-        result_list = [v for v in generator]
+    def wake(self):
+        with self._wakeup_lock:
+            try:
+                self._wakeup.set_result(None)
+            except InvalidStateError:
+                pass
 
-        results.extend(result_list)
+    def get_wakeup(self) -> Future:
+        with self._wakeup_lock:
+            if self._wakeup.done() and not self.granted:
+                self._wakeup = Future()
 
-    return results
+            return self._wakeup
+
+    def can_start(self, value: Any) -> bool:
+        # only hand out free workers, so the queue decides who gets the next slot
+        return has_free_slot(
+            value.get_executor(self.executor), self.pending, self.executor
+        )
+
+    def submit(
+        self,
+        item: ComputationItem,
+        dependency_kwargs: dict[str, Any],
+        token: CancellationToken,
+    ) -> Future:
+        return item.value.submit(self.executor, token, **dependency_kwargs)
 
 
 def handle_computations(
@@ -36,33 +57,46 @@ def handle_computations(
     layer_items: list,
     get_stream_completed_fun: Callable[..., bool],
     context: ProgressiveStreamerContext,
+    executor: Executor,
+    deadline_at: float | None = None,
+    scheduler: ThreadComputationScheduler | None = None,
 ) -> Generator[bytes, Any, None]:
-    new_layers = []
-
-    while computations:
-        field_name, value = computations.pop(0)
-        placeholder_value = "$" + str(context.placeholder_mapper[field_name])
-        result = value.run()
-
-        if isinstance(result, list):
-            result_list = handle_list_generator(
-                result,
-                computations,
-                layer_items,
-                context,
-            )
-
-            yield prepare_data_str(
-                {placeholder_value: result_list}, get_stream_completed_fun
-            )
+    """
+    Submits the pending computations to the executor, highest priority first,
+    and yields each placeholder frame as soon as its future completes. Nested
+    models are sent as layers as soon as they are known, and their
+    computations join the ones already running.
+    Computations with dependencies are submitted once all of their inputs
+    have resolved, and the ones that run out of time resolve to their fallback.
+    A `scheduler` that already started work, see `prefetch()`, is continued.
+    """
+    if scheduler is None:
+        scheduler = ThreadComputationScheduler(
+            computations,
+            layer_items,
+            get_stream_completed_fun,
+            context,
+            executor,
+            deadline_at,
+        )
 
-            continue
+    try:
+        yield from scheduler.handle_layers()
+        scheduler.start_computations()
 
-        if isinstance(result, BaseModel):
-            new_layers.append((result, placeholder_value))
+        while scheduler.is_running():
+            wait(
+                [*scheduler.pending.keys(), scheduler.get_wakeup()],
+                timeout=scheduler.get_wait_timeout(),
+                return_when=FIRST_COMPLETED,
+            )
 
-            continue
+            for future in scheduler.get_finished():
+                yield from scheduler.handle_finished(future)
 
-        yield prepare_data_str({placeholder_value: result}, get_stream_completed_fun)
+            yield from scheduler.handle_layers()
+            scheduler.start_computations()
 
-    layer_items.extend(new_layers)
+        yield from scheduler.expire_remaining()
+    finally:
+        scheduler.cancel_pending()
@@ -0,0 +1,88 @@
+import multiprocessing
+import os
+import pickle
+import threading
+import weakref
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any
+
+
+DEFAULT_MAX_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+_executor_lock = threading.Lock()
+_thread_executor: ThreadPoolExecutor | None = None
+_process_executor: ProcessPoolExecutor | None = None
+# how many callables each executor runs at once, recorded when it is created
+_capacities: weakref.WeakKeyDictionary[Executor, int] = weakref.WeakKeyDictionary()
+
+
+def get_default_executor() -> ThreadPoolExecutor:
+    """
+    Returns the bounded thread pool shared by every sync streamer.
+    """
+    global _thread_executor
+
+    with _executor_lock:
+        if _thread_executor is None:
+            _thread_executor = ThreadPoolExecutor(
+                max_workers=DEFAULT_MAX_WORKERS,
+                thread_name_prefix="ame-json",
+            )
+            _capacities[_thread_executor] = DEFAULT_MAX_WORKERS
+
+        return _thread_executor
+
+
+def get_process_executor() -> ProcessPoolExecutor:
+    """
+    Returns the process pool shared by every computation created with
+    `executor="process"`.
+    """
+    global _process_executor
+
+    with _executor_lock:
+        if _process_executor is None:
+            # the streamers already run worker threads, which makes fork unsafe
+            max_workers = os.cpu_count() or 1
+            _process_executor = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            _capacities[_process_executor] = max_workers
+
+        return _process_executor
+
+
+def set_executor_capacity(executor: Executor, max_workers: int):
+    if max_workers < 1:
+        raise ValueError(f"max_workers must be at least 1, got: {max_workers}")
+
+    _capacities[executor] = max_workers
+
+
+def get_executor_capacity(executor: Executor) -> int | None:
+    """
+    Returns how many callables `executor` runs at once, or None when unknown.
+    """
+    return _capacities.get(executor)
+
+
+def ensure_picklable(func: Callable, func_kwargs: dict[str, Any]):
+    try:
+        pickle.dumps(func)
+    except Exception as e:
+        raise TypeError(
+            f"Computation func {func!r} must be picklable to run in a process pool, "
+            "use a module level function instead: "
+            f"{e}"
+        ) from e
+
+    for key, value in func_kwargs.items():
+        try:
+            pickle.dumps(value)
+        except Exception as e:
+            raise TypeError(
+                f"Computation kwarg {key!r} of {func!r} must be picklable "
+                f"to run in a process pool: {e}"
+            ) from e
@@ -1,5 +1,7 @@
+from collections.abc import Iterator
 from typing import Any, cast
 from pydantic import BaseModel
+from pydantic_core import to_jsonable_python
 
 from ame_json.models.placeholder_utils import (
     handle_computation,
@@ -9,10 +11,19 @@ from ame_json.models.placeholder_utils import (
 from ame_json.models.field_helper import (
     PRIMITIVES,
     is_computation,
+    is_dependency,
+    is_json_value,
     is_model,
 )
 
 from ame_json.models.progressive_streamer_context import ProgressiveStreamerContext
+from ame_json.models.serialization_plan import (
+    PRIMITIVE,
+    STATIC,
+    STATIC_TYPES,
+    get_model_plan,
+    is_static_model,
+)
 
 
 class FieldHandler:
@@ -33,6 +44,19 @@ class FieldHandler:
         value: Any,
     ):
         if is_computation(value):
+            found, cached = value.get_cached()
+
+            # cached results don't need their own frame, unless a sibling
+            # computation is waiting for them
+            if found and not is_dependency(model, field_name):
+                if is_json_value(cached):
+                    return cached
+
+                if isinstance(cached, list):
+                    return self.handle_cached_list(cached)
+
+                return self.handle_field_by_value(field_name, model, cached)
+
             return handle_computation(
                 field_name,
                 model,
@@ -41,12 +65,7 @@ class FieldHandler:
             )
 
         if is_model(value):
-            return handle_model_instance(
-                field_name,
-                self.new_layers_items,
-                self.context,
-                value,
-            )
+            return self.handle_nested_model(field_name, value)
 
         if isinstance(value, list):
             return self.handle_iterable_field(
@@ -64,6 +83,48 @@ class FieldHandler:
 
         return value
 
+    def handle_cached_list(self, value_list: list) -> list:
+        """
+        Returns a cached list the way the frame of its computation sends it,
+        with the models in it serialized in place.
+        """
+        if value_list and all(is_static_model(value) for value in value_list):
+            return to_jsonable_python(value_list, by_alias=False)
+
+        return [
+            self.handle_model(value) if isinstance(value, BaseModel) else value
+            for value in value_list
+        ]
+
+    def handle_nested_model(self, field_name: str, value: BaseModel) -> Any:
+        """
+        Returns the data of `value` when the inline policy embeds it, and the
+        placeholder of its own frame otherwise.
+        """
+        inline_policy = self.context.inline_policy
+
+        if inline_policy is not None and inline_policy.can_inline(value):
+            # the models nested in it that don't fit are only queued once it
+            # is inlined, otherwise its own layer queues them again
+            new_computations = []
+            new_layers_items = []
+            data = FieldHandler(
+                new_computations, new_layers_items, self.context
+            ).handle_model(value)
+
+            if inline_policy.fits(data, self.context.codec):
+                self.new_computations.extend(new_computations)
+                self.new_layers_items.extend(new_layers_items)
+
+                return data
+
+        return handle_model_instance(
+            field_name,
+            self.new_layers_items,
+            self.context,
+            value,
+        )
+
     def handle_iterable_field(
         self,
         field_name: str,
@@ -133,3 +194,39 @@ class FieldHandler:
             return self.handle_field_by_value(field_name, model, value)
         except Exception as e:
             print(f"Error handle_field: {e}")
+
+    def handle_model(self, model: BaseModel) -> dict:
+        """
+        Returns the frame data of `model`, following the plan of its class.
+        """
+        return dict(self.iter_model(model))
+
+    def iter_model(self, model: BaseModel) -> Iterator[tuple[str, Any]]:
+        """
+        Yields the name and frame value of each field of `model`, following
+        the plan of its class.
+        """
+        plan = get_model_plan(model.__class__)
+        static_data = None
+
+        if plan.static_fields:
+            static_data = model.model_dump(
+                mode="json", include=plan.static_fields, by_alias=False
+            )
+
+        for field_name, kind in plan.fields:
+            if kind == STATIC:
+                yield field_name, static_data[field_name]
+
+                continue
+
+            if kind == PRIMITIVE:
+                value = getattr(model, field_name, None)
+
+                # checked since model_construct and assignments skip validation
+                if type(value) in STATIC_TYPES:
+                    yield field_name, value
+
+                    continue
+
+            yield field_name, self.handle_field(field_name, model)
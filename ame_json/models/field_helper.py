@@ -1,12 +1,15 @@
 from pydantic import BaseModel
 
-from collections.abc import Callable
-import json
+from collections.abc import Iterable
 from typing import Any, cast
 
 from ame_json.models.progressive_streamer_context import ProgressiveStreamerContext
 from ame_json.models.computation import Computation
+from ame_json.models.computation_item import ComputationItem
 from ame_json.models.async_computation import AsyncComputation
+from ame_json.models.json_codec import JsonCodec, get_codec
+from ame_json.models.placeholder import Placeholder
+from ame_json.models.serialization_plan import get_model_plan
 
 
 PRIMITIVES = (str, int, float, bool, complex, bytes, bytearray, type(None))
@@ -20,8 +23,37 @@ def is_model(value: Any) -> bool:
     return isinstance(value, BaseModel)
 
 
+def is_json_value(value: Any) -> bool:
+    """
+    Returns True when `value` can be written to a frame as is.
+    """
+    if isinstance(value, (str, int, float, bool, type(None))):
+        return True
+
+    if isinstance(value, list):
+        return all(is_json_value(inner_value) for inner_value in value)
+
+    if isinstance(value, dict):
+        return all(
+            isinstance(key, str) and is_json_value(inner_value)
+            for key, inner_value in value.items()
+        )
+
+    return False
+
+
+def is_dependency(model: BaseModel, field_name: str) -> bool:
+    for name in get_model_plan(model.__class__).computation_fields:
+        value = getattr(model, name, None)
+
+        if is_computation(value) and field_name in value.depends_on:
+            return True
+
+    return False
+
+
 def get_field_list(model: BaseModel):
-    return list(model.__class__.model_fields.keys())
+    return [name for name, _ in get_model_plan(model.__class__).fields]
 
 
 def add_placeholder(
@@ -39,26 +71,45 @@ def add_computation(
     context: ProgressiveStreamerContext,
 ):
     value: Computation = cast(Computation, getattr(model, field_name, None))
-    computations.append((field_name, value))
 
     add_placeholder(field_name, context)
 
+    dependencies = {name: getattr(model, name, None) for name in value.depends_on}
+
+    computations.append(
+        ComputationItem(
+            placeholder_value=Placeholder.from_index(
+                context.placeholder_mapper[field_name]
+            ),
+            value=value,
+            dependencies=dependencies,
+        )
+    )
 
-def prepare_data_str(
-    data: dict, get_stream_completed_fun: Callable[..., bool]
+
+def encode_frame(
+    items: Iterable[tuple[str, Any]],
+    completed: bool,
+    codec: JsonCodec | None = None,
+    placeholder_value: str | None = None,
 ) -> bytes:
-    data["completed_stream"] = get_stream_completed_fun()
+    """
+    Encodes the frame holding `items`, nested under `placeholder_value` when
+    they resolve it.
+    """
+    frame = dict(items)
+
+    if placeholder_value is not None:
+        frame = {placeholder_value: frame}
 
-    data_json = json.dumps(data)
+    frame["completed_stream"] = completed
 
-    return data_json.encode("utf-8")
+    return get_codec(codec).encode(frame)
 
 
-def send_completed_stream() -> bytes:
-    data_json = json.dumps(
+def send_completed_stream(codec: JsonCodec | None = None) -> bytes:
+    return get_codec(codec).encode(
         {
             "completed_stream": True,
         }
     )
-
-    return data_json.encode("utf-8")
@@ -0,0 +1,186 @@
+import struct
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterable, Iterator
+from typing import Literal
+
+
+type Framing = Literal["none", "length", "ndjson"]
+
+# a frame is preceded by its size, as a 4 byte big endian integer
+LENGTH_PREFIX = struct.Struct(">I")
+NEW_LINE = b"\n"
+
+
+def get_framing(format: str, framing: Framing | None = None) -> Framing:
+    """
+    Returns the framing of a stream, by default none for JSON, whose frames
+    are sent one per write, and length-prefixed for binary formats.
+    """
+    if framing is None:
+        return "none" if format == "json" else "length"
+
+    if framing not in ("none", "length", "ndjson"):
+        raise ValueError(f"Unknown framing: {framing}")
+
+    if framing == "ndjson" and format != "json":
+        raise ValueError(f"The {format} format can't be split on new lines")
+
+    return framing
+
+
+def write_length_prefixed(frame: bytes) -> bytes:
+    return LENGTH_PREFIX.pack(len(frame)) + frame
+
+
+def write_ndjson(frame: bytes) -> bytes:
+    return frame + NEW_LINE
+
+
+def get_frame_writer(framing: Framing) -> Callable[[bytes], bytes] | None:
+    if framing == "length":
+        return write_length_prefixed
+
+    if framing == "ndjson":
+        return write_ndjson
+
+    return None
+
+
+def read_length_prefixed(frame: bytes) -> memoryview:
+    """
+    Returns the payload of a single length-prefixed frame, without copying it.
+    """
+    view = memoryview(frame)
+
+    if len(view) < LENGTH_PREFIX.size:
+        raise ValueError(f"Truncated frame of {len(view)} bytes")
+
+    (size,) = LENGTH_PREFIX.unpack_from(view)
+
+    if len(view) - LENGTH_PREFIX.size != size:
+        raise ValueError(
+            f"Frame declares {size} bytes, got {len(view) - LENGTH_PREFIX.size}"
+        )
+
+    return view[LENGTH_PREFIX.size :]
+
+
+class FrameReader:
+    """
+    Splits a byte stream into frames, however its chunks were split or
+    merged on the way, e.g. socket reads. Frames are memoryviews into the
+    receive buffer, they are only valid until the reader is resumed.
+    """
+
+    def __init__(self, framing: Framing):
+        if framing not in ("length", "ndjson"):
+            raise ValueError(f"Can't read frames of framing: {framing}")
+
+        self.framing = framing
+        self._buffer = bytearray()
+        # where the first unread frame starts, and where to resume looking
+        # for the end of a new line delimited one
+        self._start = 0
+        self._scanned = 0
+
+    def feed(self, data: bytes | bytearray | memoryview) -> Iterator[memoryview]:
+        """
+        Adds `data` to the buffer and yields the frames it completed.
+        """
+        self._compact()
+        self._buffer += data
+
+        with memoryview(self._buffer) as view:
+            while (bounds := self._next_frame()) is not None:
+                start, end = bounds
+
+                if start == end:
+                    continue
+
+                frame = view[start:end]
+
+                try:
+                    yield frame
+                finally:
+                    frame.release()
+
+    def pending(self) -> int:
+        """
+        Returns the size of the incomplete frame left in the buffer.
+        """
+        return len(self._buffer) - self._start
+
+    def _next_frame(self) -> tuple[int, int] | None:
+        buffer = self._buffer
+
+        if self.framing == "length":
+            start = self._start + LENGTH_PREFIX.size
+
+            if len(buffer) < start:
+                return None
+
+            (size,) = LENGTH_PREFIX.unpack_from(buffer, self._start)
+            end = start + size
+
+            if len(buffer) < end:
+                return None
+
+            self._start = end
+
+            return start, end
+
+        end = buffer.find(NEW_LINE, max(self._scanned, self._start))
+
+        if end == -1:
+            self._scanned = len(buffer)
+
+            return None
+
+        start = self._start
+        self._start = self._scanned = end + 1
+
+        return start, end
+
+    def _compact(self):
+        # deleting from the front of a bytearray doesn't move its data
+        del self._buffer[: self._start]
+        self._scanned -= self._start
+        self._start = 0
+
+
+def read_frames(
+    chunks: Iterable[bytes], framing: Framing
+) -> Iterator[bytes | memoryview]:
+    """
+    Yields the frames of `chunks`, which are frames already without framing.
+    """
+    if framing == "none":
+        yield from chunks
+
+        return
+
+    reader = FrameReader(framing)
+
+    for chunk in chunks:
+        yield from reader.feed(chunk)
+
+    if reader.pending():
+        raise ValueError(f"Stream ended inside a frame, {reader.pending()} bytes")
+
+
+async def read_frames_async(
+    chunks: AsyncIterable[bytes], framing: Framing
+) -> AsyncIterator[bytes | memoryview]:
+    if framing == "none":
+        async for chunk in chunks:
+            yield chunk
+
+        return
+
+    reader = FrameReader(framing)
+
+    async for chunk in chunks:
+        for frame in reader.feed(chunk):
+            yield frame
+
+    if reader.pending():
+        raise ValueError(f"Stream ended inside a frame, {reader.pending()} bytes")
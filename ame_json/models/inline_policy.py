@@ -0,0 +1,87 @@
+import dataclasses
+from typing import Any
+
+from pydantic import BaseModel
+
+from ame_json.models.async_computation import AsyncComputation
+from ame_json.models.computation import Computation
+from ame_json.models.json_codec import JsonCodec
+from ame_json.models.serialization_plan import PRIMITIVE, STATIC, get_model_plan
+
+
+@dataclasses.dataclass(frozen=True)
+class InlinePolicy:
+    """
+    Decides which nested models are embedded in their parent's frame instead
+    of being sent in a frame of their own. Only models without a computation
+    anywhere in them are inlined, optionally up to `max_depth` levels of
+    nested models and `max_bytes` once encoded.
+    """
+
+    max_depth: int | None = None
+    max_bytes: int | None = None
+
+    def can_inline(self, model: BaseModel) -> bool:
+        depth = get_static_depth(model)
+
+        if depth is None:
+            return False
+
+        return self.max_depth is None or depth <= self.max_depth
+
+    def fits(self, data: dict, codec: JsonCodec) -> bool:
+        return self.max_bytes is None or len(codec.encode(data)) <= self.max_bytes
+
+
+def get_inline_policy(inline: "InlinePolicy | bool") -> InlinePolicy | None:
+    if isinstance(inline, InlinePolicy):
+        return inline
+
+    return InlinePolicy() if inline else None
+
+
+def get_static_depth(value: Any) -> int | None:
+    """
+    Returns how many levels of models `value` nests, 1 for a model of plain
+    fields, or None when a computation is found in it.
+    """
+    if isinstance(value, (Computation, AsyncComputation)):
+        return None
+
+    if isinstance(value, BaseModel):
+        plan = get_model_plan(value.__class__)
+
+        if plan.is_static:
+            return 1
+
+        inner_values = [
+            getattr(value, name, None)
+            for name, kind in plan.fields
+            if kind not in (PRIMITIVE, STATIC)
+        ]
+
+        depth = get_max_depth(inner_values)
+
+        return None if depth is None else depth + 1
+
+    if isinstance(value, list):
+        return get_max_depth(value)
+
+    if isinstance(value, dict):
+        return get_max_depth(value.values())
+
+    return 0
+
+
+def get_max_depth(values: Any) -> int | None:
+    depth = 0
+
+    for value in values:
+        inner_depth = get_static_depth(value)
+
+        if inner_depth is None:
+            return None
+
+        depth = max(depth, inner_depth)
+
+    return depth
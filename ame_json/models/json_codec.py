@@ -0,0 +1,143 @@
+import json
+from typing import Any, Literal, Protocol
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - depends on the environment
+    msgspec = None
+
+
+type CodecName = Literal["auto", "orjson", "msgspec", "json"]
+
+
+class JsonCodec(Protocol):
+    name: str
+
+    def encode(self, data: Any) -> bytes: ...
+
+    def decode(self, data: bytes | bytearray | memoryview) -> Any: ...
+
+
+class StdlibCodec:
+    name = "json"
+
+    def encode(self, data: Any) -> bytes:
+        return json.dumps(data).encode("utf-8")
+
+    def decode(self, data: bytes | bytearray | memoryview) -> Any:
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+
+        return json.loads(data)
+
+
+class OrjsonCodec:
+    """
+    Writes bytes directly with orjson. Values orjson rejects, like integers
+    over 64 bits, are encoded by the stdlib instead.
+    """
+
+    name = "orjson"
+
+    def __init__(self):
+        if orjson is None:
+            raise ValueError("The orjson codec requires the orjson package")
+
+        self._fallback = StdlibCodec()
+
+    def encode(self, data: Any) -> bytes:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            return self._fallback.encode(data)
+
+    def decode(self, data: bytes | bytearray | memoryview) -> Any:
+        return orjson.loads(data)
+
+
+def encode_str_subclass(value: Any) -> str:
+    """
+    msgspec only encodes exact strings, placeholders are a str subclass.
+    """
+    if isinstance(value, str):
+        return str(value)
+
+    raise NotImplementedError
+
+
+class MsgspecCodec:
+    """
+    Writes bytes directly with msgspec, falling back to the stdlib for values
+    it can't encode.
+    """
+
+    name = "msgspec"
+
+    def __init__(self):
+        if msgspec is None:
+            raise ValueError("The msgspec codec requires the msgspec package")
+
+        self._encoder = msgspec.json.Encoder(enc_hook=encode_str_subclass)
+        self._decoder = msgspec.json.Decoder()
+        self._fallback = StdlibCodec()
+
+    def encode(self, data: Any) -> bytes:
+        try:
+            return self._encoder.encode(data)
+        except (TypeError, msgspec.EncodeError):
+            return self._fallback.encode(data)
+
+    def decode(self, data: bytes | bytearray | memoryview) -> Any:
+        return self._decoder.decode(data)
+
+
+_codec_types: dict[str, type] = {
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+    "json": StdlibCodec,
+}
+_codecs: dict[str, JsonCodec] = {}
+
+
+def get_codec(codec: "CodecName | JsonCodec | None" = None) -> JsonCodec:
+    """
+    Returns the codec named `codec`, the default one for None. "auto" picks
+    orjson, then msgspec, when installed and the stdlib otherwise.
+    """
+    if codec is None:
+        return _default_codec
+
+    if not isinstance(codec, str):
+        return codec
+
+    if codec == "auto":
+        codec = "orjson" if orjson else "msgspec" if msgspec else "json"
+
+    if codec not in _codec_types:
+        raise ValueError(f"Unknown codec: {codec}")
+
+    if codec not in _codecs:
+        _codecs[codec] = _codec_types[codec]()
+
+    return _codecs[codec]
+
+
+def set_default_codec(codec: "CodecName | JsonCodec"):
+    """
+    Sets the codec of every streamer and assembler that doesn't pick one.
+    """
+    global _default_codec
+
+    _default_codec = get_codec(codec)
+
+
+def get_default_codec() -> JsonCodec:
+    return _default_codec
+
+
+_default_codec: JsonCodec = get_codec("auto")
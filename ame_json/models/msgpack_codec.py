@@ -0,0 +1,122 @@
+from typing import Any, Literal
+
+from pydantic_core import to_jsonable_python
+
+from ame_json.models.computation_stream import (
+    APPEND_SUFFIX,
+    CLOSE_SUFFIX,
+    get_append_key,
+    get_close_key,
+)
+from ame_json.models.json_codec import CodecName, JsonCodec, get_codec
+from ame_json.models.placeholder import PLACEHOLDER_PREFIX, Placeholder
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - depends on the environment
+    msgpack = None
+
+
+type WireFormat = Literal["json", "msgpack"]
+
+# ext types of a placeholder, and of the keys appending to and closing the
+# list of a streaming computation, each holding the placeholder's index
+PLACEHOLDER_EXT = 1
+APPEND_EXT = 2
+CLOSE_EXT = 3
+
+
+def pack_index(index: int) -> bytes:
+    return index.to_bytes(max((index.bit_length() + 7) // 8, 1), "big")
+
+
+def encode_key(key: Any) -> Any:
+    """
+    Frame keys starting with a "$" resolve placeholders, field names can't.
+    """
+    if not isinstance(key, str) or not key.startswith(PLACEHOLDER_PREFIX):
+        return key
+
+    if key.endswith(APPEND_SUFFIX):
+        return msgpack.ExtType(APPEND_EXT, pack_index(int(key[1:-1])))
+
+    if key.endswith(CLOSE_SUFFIX):
+        return msgpack.ExtType(CLOSE_EXT, pack_index(int(key[1:-1])))
+
+    return msgpack.ExtType(PLACEHOLDER_EXT, pack_index(int(key[1:])))
+
+
+def encode_default(value: Any) -> Any:
+    if isinstance(value, Placeholder):
+        return msgpack.ExtType(PLACEHOLDER_EXT, pack_index(value.index))
+
+    # e.g. tuples, enums and datetimes, as they are sent in JSON frames
+    return to_jsonable_python(value)
+
+
+def decode_ext(code: int, data: bytes) -> Any:
+    placeholder = Placeholder.from_index(int.from_bytes(data, "big"))
+
+    if code == PLACEHOLDER_EXT:
+        return placeholder
+
+    if code == APPEND_EXT:
+        return get_append_key(placeholder)
+
+    if code == CLOSE_EXT:
+        return get_close_key(placeholder)
+
+    return msgpack.ExtType(code, data)
+
+
+class MsgpackCodec:
+    """
+    Encodes frames as MessagePack. Placeholders are sent as ext types holding
+    their integer index, so strings starting with a "$" stay strings.
+    """
+
+    name = "msgpack"
+
+    def __init__(self):
+        if msgpack is None:
+            raise ValueError("The msgpack format requires the msgpack package")
+
+    def encode(self, data: Any) -> bytes:
+        if isinstance(data, dict):
+            data = {encode_key(key): value for key, value in data.items()}
+
+        # exact types, so placeholders and other subclasses reach the default
+        return msgpack.packb(data, default=encode_default, strict_types=True)
+
+    def decode(self, data: bytes | bytearray | memoryview) -> Any:
+        return msgpack.unpackb(data, ext_hook=decode_ext, strict_map_key=False)
+
+    @staticmethod
+    def is_placeholder(value: Any) -> bool:
+        return isinstance(value, Placeholder)
+
+
+_msgpack_codec: MsgpackCodec | None = None
+
+
+def get_format_codec(
+    format: WireFormat, codec: "CodecName | JsonCodec | None" = None
+) -> JsonCodec:
+    """
+    Returns the codec writing `format`, `codec` only applies to JSON.
+    """
+    global _msgpack_codec
+
+    if format == "json":
+        return get_codec(codec)
+
+    if format != "msgpack":
+        raise ValueError(f"Unknown format: {format}")
+
+    if codec is not None:
+        raise ValueError("A codec can only be picked for the json format")
+
+    if _msgpack_codec is None:
+        _msgpack_codec = MsgpackCodec()
+
+    return _msgpack_codec
@@ -4,8 +4,16 @@ from typing import Any
 
 @dataclasses.dataclass
 class PathData:
+    """
+    Where a placeholder sits: its path from the root, and the container
+    holding it with its key or index there, so resolving it is a single
+    assignment.
+    """
+
     value: Any
-    path: list[str]
+    path: list[str | int]
+    container: dict | list
+    key: str | int
 
 
 type PathDataMapper = dict[str, PathData]
@@ -0,0 +1,35 @@
+from typing import Any
+
+
+PLACEHOLDER_PREFIX = "$"
+
+
+class Placeholder(str):
+    """
+    The "$N" string a value is replaced with until a later frame resolves
+    it. JSON frames send it as is, binary formats as an integer tag, which
+    keeps it apart from strings that merely start with a "$".
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_index(cls, index: int) -> "Placeholder":
+        return cls(PLACEHOLDER_PREFIX + str(index))
+
+    @property
+    def index(self) -> int:
+        return int(self[len(PLACEHOLDER_PREFIX) :])
+
+
+def is_placeholder_string(value: Any) -> bool:
+    """
+    JSON can't tell placeholders from other strings, any "$N" string may be
+    one, until the stream ends without resolving it.
+    """
+    return (
+        isinstance(value, str)
+        and value.startswith(PLACEHOLDER_PREFIX)
+        and value[len(PLACEHOLDER_PREFIX) :].isdecimal()
+        and value.isascii()
+    )
@@ -5,6 +5,7 @@ from ame_json.models.field_helper import (
     add_computation,
     add_placeholder,
 )
+from ame_json.models.placeholder import Placeholder
 from ame_json.models.progressive_streamer_context import ProgressiveStreamerContext
 
 
@@ -21,7 +22,7 @@ def handle_computation(
         context,
     )
 
-    return "$" + str(context.placeholder_mapper[field_name])
+    return Placeholder.from_index(context.placeholder_mapper[field_name])
 
 
 def handle_model_instance(
@@ -32,7 +33,7 @@ def handle_model_instance(
 ) -> str:
     add_placeholder(field_name, context)
 
-    placeholder_value = "$" + str(context.placeholder_mapper[field_name])
+    placeholder_value = Placeholder.from_index(context.placeholder_mapper[field_name])
 
     new_layers_items.append((value, placeholder_value))
 
@@ -11,8 +11,8 @@ from ame_json.models.async_base_schema import AsyncBaseProgressiveSchema
 
 
 class ProgressiveSchema(BaseProgressiveSchema):
-    def to_streamer(self) -> ProgressiveJSONStreamer:
-        return ProgressiveJSONStreamer(self)
+    def to_streamer(self, **kwargs: Any) -> ProgressiveJSONStreamer:
+        return ProgressiveJSONStreamer(self, **kwargs)
 
 
 class AsyncProgressiveSchema(AsyncBaseProgressiveSchema):
@@ -56,5 +56,5 @@ class AsyncProgressiveSchema(AsyncBaseProgressiveSchema):
 
         return data
 
-    def to_streamer(self) -> AsyncProgressiveJSONStreamer:
-        return AsyncProgressiveJSONStreamer(self)
+    def to_streamer(self, **kwargs: Any) -> AsyncProgressiveJSONStreamer:
+        return AsyncProgressiveJSONStreamer(self, **kwargs)
@@ -1,10 +1,23 @@
 from collections.abc import Generator
+from contextlib import closing
+from concurrent.futures import Executor
 from typing import Any
 from pydantic import BaseModel
 
+from ame_json.models.computation_graph import validate_dependencies
+from ame_json.models.computation_item import ComputationItem
+from ame_json.models.computation_timeout import get_deadline_at
 from ame_json.models.field_helper import send_completed_stream
+from ame_json.models.inline_policy import InlinePolicy, get_inline_policy
+from ame_json.models.framing import Framing, get_frame_writer, get_framing
+from ame_json.models.json_codec import CodecName, JsonCodec
+from ame_json.models.msgpack_codec import WireFormat, get_format_codec
 from ame_json.models.progressive_streamer_context import ProgressiveStreamerContext
-from ame_json.models.computation_utils import handle_computations
+from ame_json.models.computation_utils import (
+    ThreadComputationScheduler,
+    handle_computations,
+)
+from ame_json.models.executors import get_default_executor, set_executor_capacity
 from ame_json.models.utils import handle_model
 from ame_json.models.base_schema import (
     BaseProgressiveJSONStreamer,
@@ -13,23 +26,54 @@ from ame_json.models.base_schema import (
 
 
 class ProgressiveJSONStreamer(BaseProgressiveJSONStreamer):
-    def __init__(self, schema_instance: BaseProgressiveSchema):
+    def __init__(
+        self,
+        schema_instance: BaseProgressiveSchema,
+        executor: Executor | None = None,
+        max_workers: int | None = None,
+        deadline: float | None = None,
+        eager: bool = False,
+        codec: CodecName | JsonCodec | None = None,
+        inline: InlinePolicy | bool = False,
+        format: WireFormat = "json",
+        framing: Framing | None = None,
+    ):
         if not isinstance(schema_instance, BaseProgressiveSchema):
             raise TypeError("Instance must be a ProgressiveSchema or inherit from it.")
 
+        validate_dependencies(schema_instance)
+
         self.schema_instance = schema_instance
-        self._computations: list[str] = []
+        self._computations: list[ComputationItem] = []
         self._placeholder_mapper: dict[str, int] = {}
         self._placeholder_counter: int = 1
         self._layer_items = []
         self._completed_stream = False
+        self.executor = executor or get_default_executor()
+
+        # only the default executors' capacity is known, see has_free_slot
+        if max_workers is not None:
+            set_executor_capacity(self.executor, max_workers)
+
+        self.deadline = deadline
+        self.format = format
+        self.framing = get_framing(format, framing)
+        self._write_frame = get_frame_writer(self.framing)
+        self._deadline_at: float | None = None
+        self._root_frames: list[bytes] | None = None
+        self._scheduler: ThreadComputationScheduler | None = None
 
         self.context = ProgressiveStreamerContext(
             placeholder_mapper=self._placeholder_mapper,
             get_counter_func=self.get_counter_func,
             update_counter_func=self.update_counter_func,
+            codec=get_format_codec(format, codec),
+            inline_policy=get_inline_policy(inline),
         )
 
+        if eager:
+            self.prefetch()
+
     def add_computation(self, field_name: str):
         self._computations.append(field_name)
         self.add_placeholder(field_name)
@@ -59,32 +103,71 @@ class ProgressiveJSONStreamer(BaseProgressiveJSONStreamer):
             placeholder_value=placeholder_value,
         )
 
-    def stream(self) -> Generator[bytes, Any, None]:
-        try:
-            yield from self.handle_model(self.schema_instance)
-
-            placeholder_value = None
-            layer = 1
-
-            while self._layer_items:
-                current_data_model = None
+    def prefetch(self):
+        """
+        Serializes the root model and starts its computations right away,
+        instead of when `stream()` is first iterated. The root frame is still
+        the first one `stream()` yields, and the deadline starts now.
+        """
+        if self._root_frames is not None:
+            return
+
+        self._deadline_at = get_deadline_at(self.deadline)
+        self._root_frames = list(self.handle_model(self.schema_instance))
+        self._scheduler = ThreadComputationScheduler(
+            self._computations,
+            self._layer_items,
+            self.get_stream_completed_fun,
+            self.context,
+            self.executor,
+            self._deadline_at,
+        )
+        self._scheduler.start_computations()
 
-                if self._layer_items:
-                    current_data_model, placeholder_value = self._layer_items.pop(0)
+    def close(self):
+        """
+        Cancels the computations started by `prefetch()` that `stream()` has
+        not taken over, for streams that are dropped before they are read.
+        """
+        if self._scheduler is not None:
+            self._scheduler.cancel_pending()
+            self._scheduler = None
 
-                if current_data_model is not None:
-                    yield from self.handle_model(current_data_model, placeholder_value)
+    def stream(self) -> Generator[bytes, Any, None]:
+        if self._write_frame is None:
+            yield from self._stream_frames()
 
-                if self._computations:
-                    yield from handle_computations(
-                        self._computations,
-                        self._layer_items,
-                        self.get_stream_completed_fun,
-                        self.context,
-                    )
+            return
 
-                layer += 1
+        with closing(self._stream_frames()) as frames:
+            for frame in frames:
+                yield self._write_frame(frame)
 
-            yield send_completed_stream()
+    def _stream_frames(self) -> Generator[bytes, Any, None]:
+        try:
+            if self._root_frames is None:
+                self._deadline_at = get_deadline_at(self.deadline)
+
+                yield from self.handle_model(self.schema_instance)
+            else:
+                yield from self._root_frames
+
+            # nested layers are sent by the same scheduler as their results arrive
+            if self._layer_items or self._computations or self._scheduler is not None:
+                scheduler, self._scheduler = self._scheduler, None
+
+                yield from handle_computations(
+                    self._computations,
+                    self._layer_items,
+                    self.get_stream_completed_fun,
+                    self.context,
+                    self.executor,
+                    self._deadline_at,
+                    scheduler,
+                )
+
+            yield send_completed_stream(self.context.codec)
         except Exception as e:
             print(f"Error stream: {e}")
+        finally:
+            self.close()
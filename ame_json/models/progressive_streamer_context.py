@@ -1,9 +1,14 @@
 from collections.abc import Callable
 import dataclasses
 
+from ame_json.models.inline_policy import InlinePolicy
+from ame_json.models.json_codec import JsonCodec, get_default_codec
+
 
 @dataclasses.dataclass
 class ProgressiveStreamerContext:
     placeholder_mapper: dict
     get_counter_func: Callable[..., int]
     update_counter_func: Callable
+    codec: JsonCodec = dataclasses.field(default_factory=get_default_codec)
+    inline_policy: InlinePolicy | None = None
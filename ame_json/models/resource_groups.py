@@ -0,0 +1,180 @@
+import dataclasses
+import heapq
+import itertools
+import threading
+import time
+from collections.abc import Callable
+
+
+@dataclasses.dataclass
+class ResourceGroupStats:
+    acquired: int = 0
+    waited: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    max_queued: int = 0
+
+
+@dataclasses.dataclass(eq=False)
+class GroupWaiter:
+    priority: int
+    on_grant: Callable[["GroupWaiter"], None]
+    queued_at: float
+    granted: bool = False
+    cancelled: bool = False
+
+
+class ResourceGroup:
+    """
+    A named limit on how many computations run at once, shared by every
+    streamer in the process. Slots are handed to waiters by priority, then in
+    arrival order.
+    """
+
+    def __init__(self, name: str, limit: int):
+        self.name = name
+        self.limit = limit
+        self.in_use = 0
+        self.stats = ResourceGroupStats()
+        self._waiters: list[tuple[int, int, GroupWaiter]] = []
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def acquire(
+        self, priority: int, on_grant: Callable[[GroupWaiter], None]
+    ) -> GroupWaiter | None:
+        """
+        Takes a slot and returns None when one is free, otherwise queues a
+        waiter whose `on_grant` is called, from any thread, once it owns a slot.
+        """
+        with self._lock:
+            if self.in_use < self.limit and not self._waiters:
+                self.in_use += 1
+                self.stats.acquired += 1
+
+                return None
+
+            waiter = GroupWaiter(priority, on_grant, time.monotonic())
+
+            heapq.heappush(self._waiters, (-priority, next(self._counter), waiter))
+            self.stats.max_queued = max(self.stats.max_queued, len(self._waiters))
+
+            return waiter
+
+    def try_acquire(self) -> bool:
+        """
+        Takes a slot only when one is free, without queueing.
+        """
+        with self._lock:
+            if self.in_use < self.limit and not self._waiters:
+                self.in_use += 1
+                self.stats.acquired += 1
+
+                return True
+
+            return False
+
+    def release(self):
+        with self._lock:
+            self.in_use -= 1
+            granted = self._grant_free_slots()
+
+        for waiter in granted:
+            waiter.on_grant(waiter)
+
+    def cancel(self, waiter: GroupWaiter) -> bool:
+        """
+        Withdraws a queued waiter. Returns False when it was already granted,
+        in which case the caller owns a slot and must release it.
+        """
+        with self._lock:
+            if waiter.granted:
+                return False
+
+            waiter.cancelled = True
+
+            return True
+
+    def set_limit(self, limit: int):
+        with self._lock:
+            self.limit = limit
+            granted = self._grant_free_slots()
+
+        for waiter in granted:
+            waiter.on_grant(waiter)
+
+    def _pop_waiter(self) -> GroupWaiter | None:
+        while self._waiters:
+            _, _, waiter = heapq.heappop(self._waiters)
+
+            if not waiter.cancelled:
+                return waiter
+
+        return None
+
+    def _grant(self, waiter: GroupWaiter):
+        wait_time = time.monotonic() - waiter.queued_at
+
+        waiter.granted = True
+        self.stats.acquired += 1
+        self.stats.waited += 1
+        self.stats.total_wait += wait_time
+        self.stats.max_wait = max(self.stats.max_wait, wait_time)
+
+    def _grant_free_slots(self) -> list[GroupWaiter]:
+        # called with the lock held, the grants are delivered after releasing it
+        granted = []
+
+        while self.in_use < self.limit:
+            waiter = self._pop_waiter()
+
+            if waiter is None:
+                break
+
+            self.in_use += 1
+            self._grant(waiter)
+            granted.append(waiter)
+
+        return granted
+
+
+_groups: dict[str, ResourceGroup] = {}
+_groups_lock = threading.Lock()
+
+
+def set_group_limit(name: str, limit: int) -> ResourceGroup:
+    """
+    Limits how many computations tagged with `group=name` run at once across
+    every streamer in the process.
+    """
+    if limit < 1:
+        raise ValueError(f"Resource group limit must be at least 1, got: {limit}")
+
+    with _groups_lock:
+        group = _groups.get(name)
+
+        if group is None:
+            group = ResourceGroup(name, limit)
+            _groups[name] = group
+
+            return group
+
+    group.set_limit(limit)
+
+    return group
+
+
+def get_group(name: str | None) -> ResourceGroup | None:
+    if name is None:
+        return None
+
+    return _groups.get(name)
+
+
+def get_group_stats(name: str) -> ResourceGroupStats:
+    group = _groups.get(name)
+
+    if group is None:
+        raise KeyError(f"Unknown resource group: {name}")
+
+    return group.stats
@@ -0,0 +1,161 @@
+import dataclasses
+import datetime
+import decimal
+import enum
+import types
+import uuid
+from typing import Any, Literal, Union, get_args, get_origin
+
+from pydantic import BaseModel
+
+from ame_json.models.async_computation import AsyncComputation
+from ame_json.models.computation import Computation
+
+
+# the kinds of value a field's annotation allows
+PRIMITIVE = "primitive"
+STATIC = "static"
+COMPUTATION = "computation"
+MODEL = "model"
+LIST = "list"
+DICT = "dict"
+ANY = "any"
+
+# values of these exact types are written to a frame as is
+STATIC_TYPES = frozenset((str, int, float, bool, type(None)))
+
+# leaf types pydantic-core serializes, they can never hold a computation
+_STATIC_LEAF_TYPES = (
+    datetime.date,
+    datetime.time,
+    datetime.timedelta,
+    decimal.Decimal,
+    uuid.UUID,
+    enum.Enum,
+)
+
+_UNION_TYPES = (Union, types.UnionType)
+_LIST_TYPES = (list, tuple, set, frozenset)
+
+
+@dataclasses.dataclass(frozen=True)
+class ModelPlan:
+    """
+    The fields of a model class in order, with the kind of value each one
+    may hold. Primitive fields are copied to the frame without dispatch, and
+    static ones are serialized together by pydantic-core. A static model has
+    only primitive and static fields.
+    """
+
+    fields: tuple[tuple[str, str], ...]
+    computation_fields: tuple[str, ...]
+    static_fields: frozenset[str]
+    is_static: bool
+
+
+def is_static_annotation(annotation: Any) -> bool:
+    """
+    Returns True when no value of `annotation` can hold a model or a
+    computation, e.g. `dict[str, list[int]]`.
+    """
+    if annotation in STATIC_TYPES or annotation is Ellipsis:
+        return True
+
+    origin = get_origin(annotation)
+
+    if origin is Literal:
+        return all(type(arg) in STATIC_TYPES for arg in get_args(annotation))
+
+    if origin in _UNION_TYPES or origin in _LIST_TYPES or origin is dict:
+        return all(is_static_annotation(arg) for arg in get_args(annotation))
+
+    return isinstance(annotation, type) and issubclass(annotation, _STATIC_LEAF_TYPES)
+
+
+def get_annotation_kind(annotation: Any) -> str:
+    if annotation in STATIC_TYPES:
+        return PRIMITIVE
+
+    origin = get_origin(annotation)
+
+    if origin is Literal:
+        if all(type(arg) in STATIC_TYPES for arg in get_args(annotation)):
+            return PRIMITIVE
+
+        return ANY
+
+    if origin in _UNION_TYPES:
+        kinds = {get_annotation_kind(arg) for arg in get_args(annotation)}
+
+        if len(kinds) == 1:
+            return kinds.pop()
+
+        return STATIC if kinds <= {PRIMITIVE, STATIC} else ANY
+
+    if origin in (Computation, AsyncComputation) or annotation in (
+        Computation,
+        AsyncComputation,
+    ):
+        return COMPUTATION
+
+    if (origin in _LIST_TYPES or origin is dict) and is_static_annotation(annotation):
+        return STATIC
+
+    if isinstance(annotation, type) and issubclass(annotation, _STATIC_LEAF_TYPES):
+        return STATIC
+
+    if origin in _LIST_TYPES or annotation in _LIST_TYPES:
+        return LIST
+
+    if origin is dict or annotation is dict:
+        return DICT
+
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return MODEL
+
+    return ANY
+
+
+def compile_model_plan(model_class: type[BaseModel]) -> ModelPlan:
+    fields = []
+
+    for name, field_info in model_class.model_fields.items():
+        kind = get_annotation_kind(field_info.annotation)
+
+        # pydantic would leave excluded fields out, the frames keep them
+        if field_info.exclude:
+            kind = ANY
+
+        fields.append((name, kind))
+
+    static_fields = frozenset(name for name, kind in fields if kind == STATIC)
+
+    return ModelPlan(
+        fields=tuple(fields),
+        computation_fields=tuple(
+            name for name, kind in fields if kind in (COMPUTATION, ANY)
+        ),
+        static_fields=static_fields,
+        # computed fields are serialized by pydantic but not by the walker
+        is_static=not model_class.model_computed_fields
+        and all(kind in (PRIMITIVE, STATIC) for _, kind in fields),
+    )
+
+
+_plans: dict[type[BaseModel], ModelPlan] = {}
+
+
+def get_model_plan(model_class: type[BaseModel]) -> ModelPlan:
+    """
+    Returns the plan of `model_class`, compiled the first time it is seen.
+    """
+    plan = _plans.get(model_class)
+
+    if plan is None:
+        plan = _plans[model_class] = compile_model_plan(model_class)
+
+    return plan
+
+
+def is_static_model(value: Any) -> bool:
+    return isinstance(value, BaseModel) and get_model_plan(value.__class__).is_static
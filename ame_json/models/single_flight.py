@@ -0,0 +1,163 @@
+import asyncio
+import threading
+import weakref
+from collections.abc import Callable, Coroutine, Hashable
+from concurrent.futures import Future, InvalidStateError
+from typing import Any
+
+
+type FlightKey = tuple[Callable, Hashable]
+
+
+def make_flight_key(func: Callable, func_kwargs: dict[str, Any]) -> FlightKey | None:
+    """
+    Returns the key identifying identical calls, or None when the kwargs are
+    not hashable and the call can't be shared.
+    """
+    kwargs_key = tuple(sorted(func_kwargs.items()))
+
+    try:
+        hash(kwargs_key)
+    except TypeError:
+        return None
+
+    return func, kwargs_key
+
+
+def copy_future_state(source: Future, target: Future):
+    try:
+        if source.cancelled():
+            target.cancel()
+        elif source.exception() is not None:
+            target.set_exception(source.exception())
+        else:
+            target.set_result(source.result())
+    except InvalidStateError:
+        # the waiter was cancelled at the same moment
+        pass
+
+
+class _Flight:
+    def __init__(self, future: Future):
+        self.future = future
+        self.waiters: set[Future] = set()
+
+
+class SingleFlight:
+    """
+    Shares one in-flight future between identical sync computations. Every
+    caller gets its own future, so cancelling one waiter doesn't cancel the
+    call for the others, while the call itself is cancelled once nobody
+    waits for it anymore.
+    """
+
+    def __init__(self):
+        self._flights: dict[FlightKey, _Flight] = {}
+        self._lock = threading.Lock()
+        self._calls: weakref.WeakKeyDictionary[Future, Future] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def submit(self, key: FlightKey, start: Callable[[], Future]) -> Future:
+        waiter: Future = Future()
+
+        with self._lock:
+            flight = self._flights.get(key)
+            is_leader = flight is None
+
+            if flight is None:
+                flight = _Flight(start())
+                self._flights[key] = flight
+
+            flight.waiters.add(waiter)
+            self._calls[waiter] = flight.future
+
+        if is_leader:
+            flight.future.add_done_callback(
+                lambda future: self._finish(key, flight, future)
+            )
+
+        waiter.add_done_callback(lambda future: self._leave(flight, future))
+
+        return waiter
+
+    def get_call(self, future: Future) -> Future:
+        """
+        Returns the shared call the waiter `future` waits for, which keeps
+        running after the waiter is cancelled, or `future` itself when it
+        isn't a waiter.
+        """
+        with self._lock:
+            return self._calls.get(future, future)
+
+    def _finish(self, key: FlightKey, flight: _Flight, future: Future):
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+            waiters = list(flight.waiters)
+
+        for waiter in waiters:
+            copy_future_state(future, waiter)
+
+    def _leave(self, flight: _Flight, waiter: Future):
+        if not waiter.cancelled():
+            return
+
+        with self._lock:
+            flight.waiters.discard(waiter)
+            is_abandoned = not flight.waiters
+
+        if is_abandoned:
+            flight.future.cancel()
+
+
+class _AsyncFlight:
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class AsyncSingleFlight:
+    """
+    Shares one task between identical async computations running on the same
+    event loop. Errors and cancellation of the shared task reach every
+    waiter, a cancelled waiter only stops waiting, and the task is cancelled
+    once nobody waits for it anymore.
+    """
+
+    def __init__(self):
+        self._flights: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[FlightKey, _AsyncFlight]
+        ] = weakref.WeakKeyDictionary()
+
+    async def run[R](
+        self, key: FlightKey, factory: Callable[[], Coroutine[Any, Any, R]]
+    ) -> R:
+        loop = asyncio.get_running_loop()
+        flights = self._flights.setdefault(loop, {})
+        flight = flights.get(key)
+
+        if flight is None:
+            flight = _AsyncFlight(loop.create_task(factory()))
+            flights[key] = flight
+
+            def finish(_: asyncio.Task):
+                if flights.get(key) is flight:
+                    del flights[key]
+
+            flight.task.add_done_callback(finish)
+
+        flight.waiters += 1
+
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()
+
+
+single_flight = SingleFlight()
+async_single_flight = AsyncSingleFlight()
@@ -0,0 +1,67 @@
+"""
+Measures how long the assembler takes to resolve n placeholders, from the
+frames of a computation returning n models with a nested model each. Each
+placeholder is resolved through the container holding it, so the time
+should grow linearly with n. The typed column assembles into a Street
+instance, validating its fields.
+
+    python -m benchmarks.bench_assembler
+"""
+
+import time
+
+from ame_json.models.assembler.progressive_assembler import ProgressiveAssembler
+from ame_json.models.computation import Computation
+from ame_json.models.progressive_schema import ProgressiveSchema
+from tests.utils import UserAddress
+
+
+class Resident(ProgressiveSchema):
+    name: str
+    address: UserAddress
+
+
+class Street(ProgressiveSchema):
+    name: str
+    residents: Computation[list[Resident]]
+
+
+def get_residents(n: int) -> list[Resident]:
+    return [
+        Resident(
+            name=f"resident {i}",
+            address=UserAddress(street=f"{i} Placeholder Dr", city="Streamington"),
+        )
+        for i in range(n)
+    ]
+
+
+def assemble(frames: list[bytes], **kwargs) -> float:
+    start = time.perf_counter()
+    ProgressiveAssembler().assamble(iter(frames), **kwargs)
+
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    print(f"{'placeholders':>14}{'frames':>10}{'dict':>12}{'typed':>12}")
+
+    for n in (1_000, 10_000):
+        street = Street(
+            name="main", residents=Computation(lambda n=n: get_residents(n))
+        )
+        frames = list(street.to_streamer().stream())
+
+        timings = [
+            assemble(frames),
+            assemble(frames, model=Street),
+        ]
+
+        print(
+            f"{n:>14}{len(frames):>10}"
+            + "".join(f"{timing:>10.1f}ms" for timing in timings)
+        )
+
+
+if __name__ == "__main__":
+    main()
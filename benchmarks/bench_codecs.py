@@ -0,0 +1,68 @@
+"""
+Compares the JSON codecs on the test schemas: encoding every frame of a
+stream, then decoding them with the assembler.
+
+    python -m benchmarks.bench_codecs
+"""
+
+import importlib.util
+import time
+from collections.abc import Callable
+
+from ame_json.models.assembler.progressive_assembler import ProgressiveAssembler
+from ame_json.models.computation import Computation
+from ame_json.models.progressive_schema import ProgressiveSchema
+from tests.utils import Products, UserAddress, UserWithAddress
+
+ROUNDS = 20
+
+
+class Catalog(ProgressiveSchema):
+    name: str
+    products: Computation[list[Products]]
+
+
+def get_products() -> list[Products]:
+    return [Products(name=f"product {i}", price=i * 1.5) for i in range(5_000)]
+
+
+def make_user() -> UserWithAddress:
+    return UserWithAddress(
+        user_id=101,
+        username="jdoe",
+        email="john.doe@example.com",
+        address=UserAddress(street="123 Placeholder Dr", city="Streamington"),
+    )
+
+
+def make_catalog() -> Catalog:
+    return Catalog(name="catalog", products=Computation(get_products))
+
+
+def measure(make_schema: Callable[[], ProgressiveSchema], codec: str) -> float:
+    start = time.perf_counter()
+
+    for _ in range(ROUNDS):
+        frames = list(make_schema().to_streamer(codec=codec).stream())
+        ProgressiveAssembler.assamble(iter(frames), codec=codec)
+
+    return (time.perf_counter() - start) / ROUNDS * 1000
+
+
+def main():
+    codecs = [
+        name
+        for name in ("json", "orjson", "msgspec")
+        if name == "json" or importlib.util.find_spec(name)
+    ]
+
+    print(f"{'schema':<12}" + "".join(f"{name:>12}" for name in codecs))
+
+    for label, make_schema in (("user", make_user), ("catalog", make_catalog)):
+        timings = [measure(make_schema, codec) for codec in codecs]
+
+        print(f"{label:<12}" + "".join(f"{ms:>10.2f}ms" for ms in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -77,7 +77,7 @@ def generate_data():
             calculate_loyalty_score_sync
         ),  # Pass another sync callable
     )
-    streamer = ProgressiveJSONStreamer(user_data)
+    streamer = ProgressiveJSONStreamer(user_data, codec="json", framing="ndjson")
     for chunk in streamer.stream():
         yield chunk
 
@@ -95,7 +95,6 @@ class StreamingHandler(http.server.SimpleHTTPRequestHandler):
 
             for chunk in generate_data():
                 self.wfile.write(chunk)
-                self.wfile.write(b"\n")
                 self.wfile.flush()
         else:
             # Handle other requests normally (e.g., serving static files)
@@ -1,10 +1,20 @@
+import asyncio
+import json
+
 import pytest
+from ame_json.models.assembler.assembler_event import (
+    PLACEHOLDER_RESOLVED,
+    ROOT_READY,
+    STREAM_COMPLETE,
+)
 from ame_json.models.assembler.async_progressive_assembler import (
     AsyncProgressiveAssembler,
 )
 from ame_json.models.async_computation import AsyncComputation
+from ame_json.models.progressive_schema import AsyncProgressiveSchema
 from tests.asynchronous.utils import (
     BaseUserProfile,
+    Products,
     UserWithAddress,
     UserAddress,
     UserProfile,
@@ -88,3 +98,122 @@ async def test_user_with_list():
     user_model = await user_data.dumps()
 
     assert data == user_model
+
+
+class Report(AsyncProgressiveSchema):
+    title: str
+    rows: AsyncComputation[list[Products]]
+
+
+async def get_report_rows():
+    for i in range(7):
+        await asyncio.sleep(0)
+
+        yield Products(name=f"row {i}", price=float(i))
+
+
+@pytest.mark.asyncio
+async def test_streamed_list():
+    report = Report(
+        title="sales",
+        rows=AsyncComputation(get_report_rows, chunk_size=3),
+    )
+
+    frames = [frame async for frame in report.to_streamer().stream()]
+
+    assert [next(iter(json.loads(frame))) for frame in frames] == [
+        "title",
+        "$1+",
+        "$1+",
+        "$1+",
+        "$1!",
+        "completed_stream",
+    ]
+
+    async def replay():
+        for frame in frames:
+            yield frame
+
+    data = await AsyncProgressiveAssembler().assamble(replay())
+
+    assert data == {
+        "title": "sales",
+        "rows": [{"name": f"row {i}", "price": float(i)} for i in range(7)],
+    }
+
+
+@pytest.mark.asyncio
+async def test_msgpack_format():
+    pytest.importorskip("msgpack")
+
+    report = Report(
+        title="$ales",
+        rows=AsyncComputation(get_report_rows, chunk_size=3),
+    )
+
+    data = await AsyncProgressiveAssembler().assamble(
+        report.to_streamer(format="msgpack").stream(), format="msgpack"
+    )
+
+    assert data == {
+        "title": "$ales",
+        "rows": [{"name": f"row {i}", "price": float(i)} for i in range(7)],
+    }
+
+
+@pytest.mark.asyncio
+async def test_framed_chunks():
+    user_data = UserWithAddress(
+        user_id=101,
+        username="jdoe",
+        email="john.doe@example.com",
+        address=UserAddress(street="123 Placeholder Dr", city="Streamington"),
+    )
+
+    data = b"".join(
+        [frame async for frame in user_data.to_streamer(framing="length").stream()]
+    )
+
+    async def read_socket():
+        for i in range(0, len(data), 5):
+            yield data[i : i + 5]
+
+    result = await AsyncProgressiveAssembler().assamble(read_socket(), framing="length")
+
+    assert result == user_data.model_dump()
+
+
+@pytest.mark.asyncio
+async def test_events():
+    report = Report(
+        title="sales",
+        rows=AsyncComputation(get_report_rows, chunk_size=3),
+    )
+
+    events = [
+        (event.type, event.placeholder, event.path)
+        async for event in AsyncProgressiveAssembler.events(
+            report.to_streamer().stream()
+        )
+    ]
+
+    assert events == [
+        (ROOT_READY, None, ()),
+        (PLACEHOLDER_RESOLVED, "$1", ("rows",)),
+        (STREAM_COMPLETE, None, ()),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_assemble_into_model():
+    report = Report(
+        title="sales",
+        rows=AsyncComputation(get_report_rows, chunk_size=3),
+    )
+
+    result = await AsyncProgressiveAssembler().assamble(
+        report.to_streamer().stream(), model=Report
+    )
+
+    assert isinstance(result, Report)
+    assert result.rows == [Products(name=f"row {i}", price=float(i)) for i in range(7)]
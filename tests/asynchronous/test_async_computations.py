@@ -0,0 +1,778 @@
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from ame_json.models.async_computation import AsyncComputation
+from ame_json.models.cancellation import get_cancel_token
+from ame_json.models.computation import Computation
+from ame_json.models.computation_batch import AsyncBatchComputation
+from ame_json.models.computation_cache import computation_cache
+from ame_json.models.computation_hedging import hedge_budget
+from ame_json.models.progressive_schema import AsyncProgressiveSchema, ProgressiveSchema
+from ame_json.models.resource_groups import set_group_limit
+from ame_json.models.single_flight import AsyncSingleFlight
+from tests.asynchronous.utils import assert_end_of_stream_async
+from tests.utils import sum_of_squares
+
+
+def make_slow_value(delay: float, value: int):
+    async def slow_value() -> int:
+        await asyncio.sleep(delay)
+
+        return value
+
+    return slow_value
+
+
+class Scores(AsyncProgressiveSchema):
+    first: AsyncComputation[int]
+    second: AsyncComputation[int]
+    third: AsyncComputation[int]
+
+
+@pytest.mark.asyncio
+async def test_computations_run_concurrently():
+    scores = Scores(
+        first=AsyncComputation(make_slow_value(0.2, 1)),
+        second=AsyncComputation(make_slow_value(0.2, 2)),
+        third=AsyncComputation(make_slow_value(0.2, 3)),
+    )
+
+    generator = scores.to_streamer().stream()
+    start = time.perf_counter()
+
+    values = [json.loads(await anext(generator)) for _ in range(4)]
+
+    await assert_end_of_stream_async(generator)
+
+    assert time.perf_counter() - start < 0.5
+    assert values[0] == {
+        "first": "$1",
+        "second": "$2",
+        "third": "$3",
+        "completed_stream": False,
+    }
+    assert {key for value in values[1:] for key in value} == {
+        "$1",
+        "$2",
+        "$3",
+        "completed_stream",
+    }
+
+
+class Child(AsyncProgressiveSchema):
+    score: AsyncComputation[int]
+
+
+class Family(AsyncProgressiveSchema):
+    first: Child
+    second: Child
+    third: Child
+
+
+@pytest.mark.asyncio
+async def test_nested_computations_run_concurrently():
+    family = Family(
+        first=Child(score=AsyncComputation(make_slow_value(0.2, 1))),
+        second=Child(score=AsyncComputation(make_slow_value(0.2, 2))),
+        third=Child(score=AsyncComputation(make_slow_value(0.2, 3))),
+    )
+
+    start = time.perf_counter()
+    frames = [json.loads(frame) async for frame in family.to_streamer().stream()]
+
+    assert time.perf_counter() - start < 0.5
+    assert frames[1:4] == [
+        {"$1": {"score": "$4"}, "completed_stream": False},
+        {"$2": {"score": "$5"}, "completed_stream": False},
+        {"$3": {"score": "$6"}, "completed_stream": False},
+    ]
+
+    scores = {key: value for frame in frames[4:-1] for key, value in frame.items()}
+
+    assert scores == {"$4": 1, "$5": 2, "$6": 3, "completed_stream": False}
+
+
+@pytest.mark.asyncio
+async def test_frames_are_emitted_in_completion_order():
+    scores = Scores(
+        first=AsyncComputation(make_slow_value(0.15, 1)),
+        second=AsyncComputation(make_slow_value(0.05, 2)),
+        third=AsyncComputation(make_slow_value(0.1, 3)),
+    )
+
+    generator = scores.to_streamer().stream()
+
+    await anext(generator)
+
+    values = [json.loads(await anext(generator)) for _ in range(3)]
+
+    assert values == [
+        {"$2": 2, "completed_stream": False},
+        {"$3": 3, "completed_stream": False},
+        {"$1": 1, "completed_stream": False},
+    ]
+
+    await assert_end_of_stream_async(generator)
+
+
+class MixedScores(AsyncProgressiveSchema):
+    total: Computation[int]
+    blocking: Computation[int]
+    score: AsyncComputation[int]
+
+
+def blocking_value() -> int:
+    time.sleep(0.01)
+
+    return 7
+
+
+@pytest.mark.asyncio
+async def test_sync_computations_run_in_executors():
+    scores = MixedScores(
+        total=Computation(sum_of_squares, {"n": 1000}, executor="process"),
+        blocking=Computation(blocking_value),
+        score=AsyncComputation(make_slow_value(0.01, 3)),
+    )
+
+    generator = scores.to_streamer().stream()
+
+    await anext(generator)
+
+    values = [json.loads(await anext(generator)) for _ in range(3)]
+
+    assert {"$1": sum_of_squares(1000), "completed_stream": False} in values
+    assert {"$2": 7, "completed_stream": False} in values
+    assert {"$3": 3, "completed_stream": False} in values
+
+    await assert_end_of_stream_async(generator)
+
+
+class Recommendations(AsyncProgressiveSchema):
+    user: AsyncComputation[str]
+    products: AsyncComputation[list[str]]
+    stock: AsyncComputation[int]
+    recommendations: AsyncComputation[list[str]]
+
+
+@pytest.mark.asyncio
+async def test_dependencies_start_when_inputs_resolve():
+    calls = []
+
+    async def get_user() -> str:
+        calls.append("user")
+        await asyncio.sleep(0.05)
+
+        return "jdoe"
+
+    async def get_products(user: str) -> list[str]:
+        calls.append("products")
+        await asyncio.sleep(0.05)
+
+        return [f"{user}-bag"]
+
+    async def get_stock(user: str) -> int:
+        calls.append("stock")
+        await asyncio.sleep(0.05)
+
+        return 3
+
+    async def get_recommendations(user: str, products: list[str]) -> list[str]:
+        calls.append("recommendations")
+
+        return [f"{product}-case" for product in products]
+
+    schema = Recommendations(
+        user=AsyncComputation(get_user),
+        products=AsyncComputation(get_products, depends_on=["user"]),
+        stock=AsyncComputation(get_stock, depends_on=["user"]),
+        recommendations=AsyncComputation(
+            get_recommendations, depends_on=["user", "products"]
+        ),
+    )
+
+    generator = schema.to_streamer().stream()
+    start = time.perf_counter()
+
+    await anext(generator)
+
+    values = [json.loads(await anext(generator)) for _ in range(4)]
+
+    await assert_end_of_stream_async(generator)
+
+    # products and stock run side by side once user resolves
+    assert time.perf_counter() - start < 0.14
+    assert values[0] == {"$1": "jdoe", "completed_stream": False}
+    assert {"$4": ["jdoe-bag-case"], "completed_stream": False} in values
+    assert sorted(calls) == ["products", "recommendations", "stock", "user"]
+
+
+@pytest.mark.asyncio
+async def test_dependency_cycles_are_rejected():
+    schema = Scores(
+        first=AsyncComputation(make_slow_value(0, 1), depends_on=["second"]),
+        second=AsyncComputation(make_slow_value(0, 2), depends_on=["first"]),
+        third=AsyncComputation(make_slow_value(0, 3)),
+    )
+
+    with pytest.raises(ValueError, match="first -> second -> first"):
+        schema.to_streamer()
+
+
+@pytest.mark.asyncio
+async def test_priority_orders_start_and_flush():
+    started = []
+
+    def make_recorded_value(value: int):
+        async def recorded_value() -> int:
+            started.append(value)
+
+            return value
+
+        return recorded_value
+
+    scores = Scores(
+        first=AsyncComputation(make_recorded_value(1)),
+        second=AsyncComputation(make_recorded_value(2), priority=10),
+        third=AsyncComputation(make_recorded_value(3), priority=5),
+    )
+
+    generator = scores.to_streamer().stream()
+
+    await anext(generator)
+
+    values = [json.loads(await anext(generator)) for _ in range(3)]
+
+    assert started == [2, 3, 1]
+    assert values == [
+        {"$2": 2, "completed_stream": False},
+        {"$3": 3, "completed_stream": False},
+        {"$1": 1, "completed_stream": False},
+    ]
+
+    await assert_end_of_stream_async(generator)
+
+
+@pytest.mark.asyncio
+async def test_timeouts_and_deadline_resolve_to_fallbacks():
+    cancelled = []
+
+    async def hung_value() -> int:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+
+            raise
+
+        return 0
+
+    scores = Scores(
+        first=AsyncComputation(hung_value, timeout=0.02, fallback=-1),
+        second=AsyncComputation(hung_value, fallback=-2),
+        third=AsyncComputation(make_slow_value(0.01, 3)),
+    )
+
+    generator = scores.to_streamer(deadline=0.1).stream()
+    start = time.perf_counter()
+
+    await anext(generator)
+
+    values = [json.loads(await anext(generator)) for _ in range(3)]
+
+    await assert_end_of_stream_async(generator)
+
+    assert time.perf_counter() - start < 0.3
+    assert values == [
+        {"$3": 3, "completed_stream": False},
+        {"$1": -1, "completed_stream": False},
+        {"$2": -2, "completed_stream": False},
+    ]
+
+    await asyncio.sleep(0)
+
+    assert cancelled == [True, True]
+
+
+class SyncScores(ProgressiveSchema):
+    first: Computation[int]
+    second: Computation[int]
+    third: Computation[int]
+
+
+@pytest.mark.asyncio
+async def test_resource_groups_are_shared_by_sync_and_async_streamers():
+    group = set_group_limit("test-async-db", 1)
+    running = []
+    max_running = []
+
+    async def async_query() -> int:
+        running.append(1)
+        max_running.append(len(running))
+        await asyncio.sleep(0.02)
+        running.remove(1)
+
+        return 1
+
+    def sync_query() -> int:
+        running.append(2)
+        max_running.append(len(running))
+        time.sleep(0.02)
+        running.remove(2)
+
+        return 2
+
+    async def consume_async() -> list[bytes]:
+        scores = Scores(
+            first=AsyncComputation(async_query, group="test-async-db"),
+            second=AsyncComputation(async_query, group="test-async-db"),
+            third=AsyncComputation(async_query, group="test-async-db"),
+        )
+
+        return [frame async for frame in scores.to_streamer().stream()]
+
+    def consume_sync() -> list[bytes]:
+        scores = SyncScores(
+            first=Computation(sync_query, group="test-async-db"),
+            second=Computation(sync_query, group="test-async-db"),
+            third=Computation(sync_query, group="test-async-db"),
+        )
+
+        return list(scores.to_streamer().stream())
+
+    async_frames, sync_frames = await asyncio.gather(
+        consume_async(), asyncio.to_thread(consume_sync)
+    )
+
+    assert max(max_running) == 1
+    assert len(async_frames) == 5
+    assert len(sync_frames) == 5
+    assert group.in_use == 0
+    assert group.stats.acquired == 6
+    assert group.stats.waited >= 4
+
+
+class ThreadScores(AsyncProgressiveSchema):
+    first: Computation[int]
+    second: Computation[int]
+    third: Computation[int]
+
+
+@pytest.mark.asyncio
+async def test_timed_out_group_members_hold_their_slot_until_they_stop():
+    set_group_limit("test-async-timeout-db", 1)
+    running = []
+    max_running = []
+
+    def slow_query(value: int) -> int:
+        running.append(value)
+        max_running.append(len(running))
+        # ignores its cancellation token, so it runs past its timeout
+        time.sleep(0.1)
+        running.remove(value)
+
+        return value
+
+    scores = ThreadScores(
+        first=Computation(
+            slow_query,
+            {"value": 1},
+            group="test-async-timeout-db",
+            priority=1,
+            timeout=0.02,
+            fallback=0,
+        ),
+        second=Computation(slow_query, {"value": 2}, group="test-async-timeout-db"),
+        third=Computation(slow_query, {"value": 3}, group="test-async-timeout-db"),
+    )
+
+    frames = [json.loads(frame) async for frame in scores.to_streamer().stream()]
+
+    assert frames[1] == {"$1": 0, "completed_stream": False}
+    assert max(max_running) == 1
+
+
+async def get_exchange_rate(currency: str) -> float:
+    exchange_rate_calls.append(currency)
+
+    return 1.5
+
+
+exchange_rate_calls = []
+
+
+class Rates(AsyncProgressiveSchema):
+    eur: AsyncComputation[float]
+
+
+@pytest.mark.asyncio
+async def test_async_computations_use_the_cache():
+    computation_cache.configure(get_exchange_rate, ttl=60)
+
+    try:
+        for _ in range(2):
+            rates = Rates(eur=AsyncComputation(get_exchange_rate, {"currency": "EUR"}))
+
+            frames = [json.loads(frame) async for frame in rates.to_streamer().stream()]
+    finally:
+        computation_cache.invalidate(get_exchange_rate)
+
+    assert exchange_rate_calls == ["EUR"]
+    assert frames == [
+        {"eur": 1.5, "completed_stream": False},
+        {"completed_stream": True},
+    ]
+
+
+class Rate(AsyncProgressiveSchema):
+    rate: AsyncComputation[float]
+
+
+@pytest.mark.asyncio
+async def test_single_flight_coalesces_identical_computations():
+    calls = []
+
+    async def get_rate(currency: str) -> float:
+        calls.append(currency)
+        await asyncio.sleep(0.05)
+
+        return 1.5
+
+    async def consume() -> list[dict]:
+        rate = Rate(
+            rate=AsyncComputation(get_rate, {"currency": "EUR"}, single_flight=True)
+        )
+
+        return [json.loads(frame) async for frame in rate.to_streamer().stream()]
+
+    results = await asyncio.gather(*[consume() for _ in range(50)])
+
+    assert calls == ["EUR"]
+
+    for frames in results:
+        assert frames[1] == {"$1": 1.5, "completed_stream": False}
+
+
+@pytest.mark.asyncio
+async def test_single_flight_propagates_errors_and_cancellation():
+    flight = AsyncSingleFlight()
+    started = []
+
+    async def failing() -> int:
+        started.append(True)
+        await asyncio.sleep(0.01)
+
+        raise ValueError("backend down")
+
+    results = await asyncio.gather(
+        *[flight.run(("failing", ()), failing) for _ in range(3)],
+        return_exceptions=True,
+    )
+
+    assert len(started) == 1
+    assert all(isinstance(result, ValueError) for result in results)
+
+    cancelled = []
+
+    async def slow() -> int:
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+
+            raise
+
+        return 1
+
+    first = asyncio.create_task(flight.run(("slow", ()), slow))
+    second = asyncio.create_task(flight.run(("slow", ()), slow))
+
+    await asyncio.sleep(0.01)
+
+    # one waiter leaving doesn't cancel the shared call
+    first.cancel()
+    await asyncio.sleep(0.01)
+
+    assert not second.done()
+    assert cancelled == []
+
+    # the last waiter leaving does
+    second.cancel()
+    await asyncio.sleep(0.01)
+
+    assert cancelled == [True]
+
+    with pytest.raises(asyncio.CancelledError):
+        await second
+
+
+class Product(AsyncProgressiveSchema):
+    name: str
+    price: AsyncComputation[float]
+
+
+class Listing(AsyncProgressiveSchema):
+    products: AsyncComputation[list[Product]]
+
+
+@pytest.mark.asyncio
+async def test_batch_computations_load_a_list_with_one_call():
+    calls = []
+
+    async def get_prices(product_ids: list[int]) -> list[float]:
+        calls.append(product_ids)
+        await asyncio.sleep(0.01)
+
+        return [product_id * 1.5 for product_id in product_ids]
+
+    async def get_products() -> list[Product]:
+        return [
+            Product(name=f"p{i}", price=AsyncBatchComputation(get_prices, i))
+            for i in range(50)
+        ]
+
+    listing = Listing(products=AsyncComputation(get_products))
+    frames = [json.loads(frame) async for frame in listing.to_streamer().stream()]
+
+    assert calls == [list(range(50))]
+
+    prices = {key: value for frame in frames[2:-1] for key, value in frame.items()}
+
+    assert prices.pop("completed_stream") is False
+    assert prices == {f"${i + 2}": i * 1.5 for i in range(50)}
+
+
+class Catalog(AsyncProgressiveSchema):
+    products: list[Product]
+
+
+@pytest.mark.asyncio
+async def test_batch_computations_are_gathered_across_sibling_models():
+    calls = []
+
+    async def get_prices(product_ids: list[int]) -> list[float]:
+        calls.append(product_ids)
+
+        return [product_id * 1.5 for product_id in product_ids]
+
+    catalog = Catalog(
+        products=[
+            Product(name=f"p{i}", price=AsyncBatchComputation(get_prices, i))
+            for i in range(5)
+        ]
+    )
+    frames = [json.loads(frame) async for frame in catalog.to_streamer().stream()]
+
+    # each product is a layer of its own, their prices are still loaded at once
+    assert calls == [[0, 1, 2, 3, 4]]
+
+    prices = {key: value for frame in frames[6:-1] for key, value in frame.items()}
+
+    assert prices.pop("completed_stream") is False
+    assert prices == {f"${i + 6}": i * 1.5 for i in range(5)}
+
+
+@pytest.mark.asyncio
+async def test_prefetch_starts_computations_before_streaming():
+    started = []
+
+    async def get_value(value: int) -> int:
+        started.append(value)
+        await asyncio.sleep(0.2)
+
+        return value
+
+    scores = Scores(
+        first=AsyncComputation(get_value, {"value": 1}),
+        second=AsyncComputation(get_value, {"value": 2}),
+        third=AsyncComputation(get_value, {"value": 3}),
+    )
+
+    streamer = scores.to_streamer()
+    streamer.prefetch()
+
+    await asyncio.sleep(0.2)
+
+    assert started == [1, 2, 3]
+
+    start = time.perf_counter()
+    values = [json.loads(frame) async for frame in streamer.stream()]
+
+    assert time.perf_counter() - start < 0.1
+    assert values[0] == {
+        "first": "$1",
+        "second": "$2",
+        "third": "$3",
+        "completed_stream": False,
+    }
+    assert {key for value in values[1:-1] for key in value} == {
+        "$1",
+        "$2",
+        "$3",
+        "completed_stream",
+    }
+    assert values[-1] == {"completed_stream": True}
+
+
+@pytest.mark.asyncio
+async def test_closing_the_stream_cancels_computations():
+    cancelled = []
+
+    async def wait_forever(value: int) -> int:
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(value)
+
+            raise
+
+        return value
+
+    started = threading.Event()
+
+    def wait_for_cancel() -> int:
+        started.set()
+
+        if get_cancel_token().wait(5):
+            cancelled.append(3)
+
+        return 3
+
+    class Cancelled(AsyncProgressiveSchema):
+        first: AsyncComputation[int]
+        second: AsyncComputation[int]
+        third: Computation[int]
+
+    scores = Cancelled(
+        first=AsyncComputation(make_slow_value(0, 1), priority=1),
+        second=AsyncComputation(wait_forever, {"value": 2}),
+        third=Computation(wait_for_cancel),
+    )
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        generator = scores.to_streamer(executor=executor, max_workers=1).stream()
+
+        await anext(generator)
+
+        assert json.loads(await anext(generator)) == {
+            "$1": 1,
+            "completed_stream": False,
+        }
+
+        await asyncio.to_thread(started.wait, 1)
+        await generator.aclose()
+        await asyncio.sleep(0.05)
+
+    assert sorted(cancelled) == [2, 3]
+
+
+@pytest.mark.asyncio
+async def test_hedged_computations_take_the_first_result():
+    calls = []
+    cancelled = []
+
+    async def get_score() -> int:
+        call = len(calls)
+        calls.append(call)
+
+        try:
+            await asyncio.sleep(2 if call == 0 else 0.01)
+        except asyncio.CancelledError:
+            cancelled.append(call)
+
+            raise
+
+        return call
+
+    scores = Scores(
+        first=AsyncComputation(get_score, hedge_after=0.05),
+        second=AsyncComputation(make_slow_value(0, 2)),
+        third=AsyncComputation(make_slow_value(0, 3)),
+    )
+
+    start = time.perf_counter()
+    values = [json.loads(frame) async for frame in scores.to_streamer().stream()]
+
+    assert time.perf_counter() - start < 0.5
+    assert {"$1": 1, "completed_stream": False} in values
+    assert len(values) == 5
+
+    await asyncio.sleep(0)
+
+    assert cancelled == [0]
+    assert hedge_budget.get_stats(get_score).hedges == 1
+
+
+class Report(AsyncProgressiveSchema):
+    rows: AsyncComputation[list[int]]
+
+
+@pytest.mark.asyncio
+async def test_generator_computations_wait_for_the_client():
+    produced = []
+
+    async def get_rows():
+        for i in range(10_000):
+            produced.append(i)
+
+            yield i
+
+    report = Report(rows=AsyncComputation(get_rows, chunk_size=10))
+    generator = report.to_streamer().stream()
+
+    await anext(generator)
+
+    assert json.loads(await anext(generator))["$1+"] == list(range(10))
+
+    await asyncio.sleep(0.1)
+
+    # the chunk being sent and the next one
+    assert len(produced) <= 20
+
+    assert len([json.loads(frame) async for frame in generator]) == 1_001
+
+
+@pytest.mark.asyncio
+async def test_cancelled_generator_computations_are_closed():
+    closed = []
+
+    async def get_rows():
+        try:
+            for i in range(10_000):
+                await asyncio.sleep(0.001)
+
+                yield i
+        finally:
+            closed.append(True)
+
+    report = Report(rows=AsyncComputation(get_rows, chunk_size=10, timeout=0.1))
+    frames = [json.loads(frame) async for frame in report.to_streamer().stream()]
+
+    assert frames[-2] == {"$1!": True, "completed_stream": False}
+
+    await asyncio.sleep(0.01)
+
+    assert closed == [True]
+
+    closed.clear()
+    report = Report(rows=AsyncComputation(get_rows, chunk_size=10))
+    generator = report.to_streamer().stream()
+
+    await anext(generator)
+    await anext(generator)
+    await generator.aclose()
+    await asyncio.sleep(0.01)
+
+    assert closed == [True]
+
+
+def test_chunk_size_must_be_positive():
+    async def get_rows():
+        yield 1
+
+    with pytest.raises(ValueError):
+        AsyncComputation(get_rows, chunk_size=0)
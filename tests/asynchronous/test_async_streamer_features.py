@@ -256,3 +256,35 @@ async def test_dict_with_model():
 
     # End of stream
     await assert_end_of_stream_async(generator)
+
+
+@pytest.mark.asyncio
+async def test_inline_static_models():
+    user_data = UserWithAddressAndCountry(
+        user_id=201,
+        username="testuser",
+        email="test@example.com",
+        address=AddressWithCountry(
+            street="456 Stream Ave",
+            city="Testville",
+            country=Country(name="Testland", code="TL"),
+        ),
+    )
+
+    generator = user_data.to_streamer(inline=True).stream()
+
+    value = await anext(generator)
+    expected = {
+        "user_id": 201,
+        "username": "testuser",
+        "email": "test@example.com",
+        "address": {
+            "street": "456 Stream Ave",
+            "city": "Testville",
+            "country": {"name": "Testland", "code": "TL"},
+        },
+        "completed_stream": False,
+    }
+    assert_as_json(value, expected)
+
+    await assert_end_of_stream_async(generator)
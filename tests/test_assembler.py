@@ -1,7 +1,11 @@
+import pytest
+from pydantic import ValidationError
 from ame_json.models.assembler.progressive_assembler import ProgressiveAssembler
 from ame_json.models.computation import Computation
+from ame_json.models.progressive_schema import ProgressiveSchema
 from tests.utils import (
     BaseUserProfile,
+    Products,
     UserWithAddress,
     UserAddress,
     UserProfile,
@@ -79,3 +83,157 @@ def test_user_with_list():
     data = assembler.assamble(generator)
 
     assert data == user_data.model_dump()
+
+
+class Report(ProgressiveSchema):
+    title: str
+    rows: Computation[list[Products]]
+    empty: Computation[list[int]]
+
+
+def get_report_rows():
+    for i in range(7):
+        yield Products(name=f"row {i}", price=float(i))
+
+
+def get_no_rows():
+    yield from []
+
+
+def test_streamed_list():
+    report = Report(
+        title="sales",
+        rows=Computation(get_report_rows, chunk_size=3),
+        empty=Computation(get_no_rows),
+    )
+
+    data = ProgressiveAssembler().assamble(report.to_streamer().stream())
+
+    assert data == {
+        "title": "sales",
+        "rows": [{"name": f"row {i}", "price": float(i)} for i in range(7)],
+        "empty": [],
+    }
+
+
+class Author(ProgressiveSchema):
+    name: str
+    address: UserAddress
+    score: Computation[int]
+
+
+class Thread(ProgressiveSchema):
+    title: str
+    authors: list[Author]
+    by_role: dict[str, Author]
+    replies: Computation[list[Author]]
+
+
+def make_author(i: int) -> Author:
+    return Author(
+        name=f"author {i}",
+        address=UserAddress(street=f"{i} Placeholder Dr", city="Streamington"),
+        score=Computation(lambda: i * 10),
+    )
+
+
+def test_placeholders_nested_in_lists_and_dicts():
+    thread = Thread(
+        title="hello",
+        authors=[make_author(i) for i in range(3)],
+        by_role={"owner": make_author(3), "editor": make_author(4)},
+        replies=Computation(lambda: [make_author(i) for i in range(5, 8)]),
+    )
+
+    data = ProgressiveAssembler().assamble(thread.to_streamer().stream())
+
+    assert data == {
+        "title": "hello",
+        "authors": [make_author(i).model_dump() for i in range(3)],
+        "by_role": {
+            "owner": make_author(3).model_dump(),
+            "editor": make_author(4).model_dump(),
+        },
+        "replies": [make_author(i).model_dump() for i in range(5, 8)],
+    }
+
+
+def make_thread() -> Thread:
+    return Thread(
+        title="hello",
+        authors=[make_author(i) for i in range(3)],
+        by_role={"owner": make_author(3)},
+        replies=Computation(lambda: [make_author(i) for i in range(5, 8)]),
+    )
+
+
+def test_assemble_into_model():
+    thread = ProgressiveAssembler().assamble(
+        make_thread().to_streamer().stream(), model=Thread
+    )
+
+    assert isinstance(thread, Thread)
+    assert isinstance(thread.by_role["owner"].address, UserAddress)
+    assert [reply.score for reply in thread.replies] == [50, 60, 70]
+    assert thread.authors[2].name == "author 2"
+
+
+def test_assemble_into_model_validates_fields():
+    user = ProgressiveAssembler().assamble(
+        UserProfile(
+            user_id=101,
+            username="jdoe",
+            email="john.doe@example.com",
+            address=UserAddress(street="123 Placeholder Dr", city="Streamington"),
+            products=Computation(lambda: [{"name": "pen", "price": "1.5"}]),
+            loyalty_score=Computation(lambda: "95"),
+        )
+        .to_streamer()
+        .stream(),
+        model=UserProfile,
+    )
+
+    assert user.loyalty_score == 95
+    assert user.products == [Products(name="pen", price=1.5)]
+
+    with pytest.raises(ValidationError):
+        ProgressiveAssembler().assamble(
+            UserWithLoyaltyScore(
+                user_id=101,
+                username="jdoe",
+                email="john.doe@example.com",
+                address=UserAddress(street="123 Placeholder Dr", city="Streamington"),
+                loyalty_score=Computation(lambda: "high"),
+            )
+            .to_streamer()
+            .stream(),
+            model=UserWithLoyaltyScore,
+        )
+
+
+class Offer(ProgressiveSchema):
+    label: str
+    code: str
+    price: Computation[int]
+    rows: Computation[list[Products]]
+
+
+def get_offer_rows():
+    yield Products(name="$ales", price=1.0)
+    yield Products(name="$9", price=2.0)
+
+
+def test_dollar_strings_are_values_in_typed_assembly():
+    offer = Offer(
+        label="$5 off",
+        code="$9",
+        price=Computation(lambda: 10),
+        rows=Computation(get_offer_rows),
+    )
+
+    result = ProgressiveAssembler().assamble(offer.to_streamer().stream(), model=Offer)
+
+    assert result.label == "$5 off"
+    assert result.code == "$9"
+    assert result.price == 10
+    assert [row.name for row in result.rows] == ["$ales", "$9"]
@@ -0,0 +1,164 @@
+import json
+import time
+
+import pytest
+from ame_json.models.computation import Computation
+from ame_json.models.computation_cache import ComputationCache, computation_cache
+from ame_json.models.progressive_schema import ProgressiveSchema
+from tests.utils import Products, assert_end_of_stream
+
+calls = []
+
+
+def get_feature_flag(name: str) -> bool:
+    calls.append(name)
+
+    return name == "dark_mode"
+
+
+def get_catalog() -> Products:
+    calls.append("catalog")
+
+    return Products(name="Monitor", price=350.5)
+
+
+class Flags(ProgressiveSchema):
+    dark_mode: Computation[bool]
+    beta: Computation[bool]
+    catalog: Computation[Products]
+
+
+@pytest.fixture(autouse=True)
+def reset_cache():
+    calls.clear()
+    computation_cache.clear()
+
+    yield
+
+    computation_cache.clear()
+    computation_cache._ttls.clear()
+
+
+def make_flags() -> Flags:
+    return Flags(
+        dark_mode=Computation(get_feature_flag, {"name": "dark_mode"}),
+        beta=Computation(get_feature_flag, {"name": "beta"}),
+        catalog=Computation(get_catalog),
+    )
+
+
+def test_cache_hits_are_inlined_into_the_parent_frame():
+    computation_cache.configure(get_feature_flag, ttl=60)
+    computation_cache.configure(get_catalog, ttl=60)
+
+    first_frames = [json.loads(frame) for frame in make_flags().to_streamer().stream()]
+
+    assert first_frames[0] == {
+        "dark_mode": "$1",
+        "beta": "$2",
+        "catalog": "$3",
+        "completed_stream": False,
+    }
+    assert len(first_frames) == 5
+    assert sorted(calls) == ["beta", "catalog", "dark_mode"]
+
+    generator = make_flags().to_streamer().stream()
+
+    assert json.loads(next(generator)) == {
+        "dark_mode": True,
+        "beta": False,
+        "catalog": "$1",
+        "completed_stream": False,
+    }
+    assert json.loads(next(generator)) == {
+        "$1": {"name": "Monitor", "price": 350.5},
+        "completed_stream": False,
+    }
+
+    assert_end_of_stream(generator)
+
+    assert len(calls) == 3
+    assert computation_cache.stats.hits == 3
+    assert computation_cache.stats.misses == 3
+
+
+def get_catalogs() -> list[Products]:
+    calls.append("catalogs")
+
+    return [Products(name="Monitor", price=350.5), Products(name="Desk", price=99)]
+
+
+class Catalogs(ProgressiveSchema):
+    catalogs: Computation[list[Products]]
+
+
+def test_cached_lists_of_models_are_inlined_without_running_again():
+    computation_cache.configure(get_catalogs, ttl=60)
+
+    list(Catalogs(catalogs=Computation(get_catalogs)).to_streamer().stream())
+
+    generator = Catalogs(catalogs=Computation(get_catalogs)).to_streamer().stream()
+
+    assert json.loads(next(generator)) == {
+        "catalogs": [
+            {"name": "Monitor", "price": 350.5},
+            {"name": "Desk", "price": 99.0},
+        ],
+        "completed_stream": False,
+    }
+
+    assert_end_of_stream(generator)
+
+    assert calls == ["catalogs"]
+    assert computation_cache.stats.hits == 1
+    assert computation_cache.stats.misses == 1
+
+
+def test_unconfigured_functions_are_not_cached():
+    computation_cache.configure(get_catalog, ttl=60)
+
+    list(make_flags().to_streamer().stream())
+    list(make_flags().to_streamer().stream())
+
+    assert sorted(calls) == ["beta", "beta", "catalog", "dark_mode", "dark_mode"]
+
+
+def test_ttl_lru_and_invalidation():
+    cache = ComputationCache(max_size=2)
+    cache.configure(get_feature_flag, ttl=0.05)
+
+    cache.store(get_feature_flag, {"name": "a"}, 1)
+    cache.store(get_feature_flag, {"name": "b"}, 2)
+
+    assert cache.lookup(get_feature_flag, {"name": "a"}) == (True, 1)
+
+    cache.store(get_feature_flag, {"name": "c"}, 3)
+
+    # "b" is the least recently used entry
+    assert cache.lookup(get_feature_flag, {"name": "b"}) == (False, None)
+    assert cache.stats.evictions == 1
+
+    cache.invalidate(get_feature_flag, {"name": "a"})
+
+    assert cache.lookup(get_feature_flag, {"name": "a"}) == (False, None)
+    assert cache.lookup(get_feature_flag, {"name": "c"}) == (True, 3)
+
+    time.sleep(0.06)
+
+    assert cache.lookup(get_feature_flag, {"name": "c"}) == (False, None)
+    assert cache.stats.size == 0
+
+    cache.store(get_feature_flag, {"name": "d"}, 4)
+    cache.invalidate(get_feature_flag)
+
+    assert cache.stats.size == 0
+
+
+def test_unhashable_kwargs_are_not_cached():
+    cache = ComputationCache()
+    cache.configure(get_feature_flag, ttl=60)
+
+    cache.store(get_feature_flag, {"name": ["a"]}, 1)
+
+    assert cache.lookup(get_feature_flag, {"name": ["a"]}) == (False, None)
+    assert cache.stats.size == 0
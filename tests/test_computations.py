@@ -0,0 +1,824 @@
+import json
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pytest
+from ame_json.models.cancellation import get_cancel_token
+from ame_json.models.computation import Computation
+from ame_json.models.computation_batch import BatchComputation
+from ame_json.models.computation_hedging import hedge_budget
+from ame_json.models.progressive_schema import ProgressiveSchema
+from ame_json.models.resource_groups import set_group_limit
+from ame_json.models.single_flight import SingleFlight
+from tests.utils import assert_end_of_stream, sum_of_squares
+
+
+def make_slow_value(delay: float, value: int):
+    def slow_value() -> int:
+        time.sleep(delay)
+
+        return value
+
+    return slow_value
+
+
+class Scores(ProgressiveSchema):
+    first: Computation[int]
+    second: Computation[int]
+    third: Computation[int]
+
+
+def test_computations_run_in_parallel():
+    scores = Scores(
+        first=Computation(make_slow_value(0.2, 1)),
+        second=Computation(make_slow_value(0.2, 2)),
+        third=Computation(make_slow_value(0.2, 3)),
+    )
+
+    generator = scores.to_streamer().stream()
+    start = time.perf_counter()
+
+    values = [json.loads(next(generator)) for _ in range(4)]
+
+    assert_end_of_stream(generator)
+
+    assert time.perf_counter() - start < 0.5
+    assert values[0] == {
+        "first": "$1",
+        "second": "$2",
+        "third": "$3",
+        "completed_stream": False,
+    }
+    assert {key for value in values[1:] for key in value} == {
+        "$1",
+        "$2",
+        "$3",
+        "completed_stream",
+    }
+
+
+class Child(ProgressiveSchema):
+    score: Computation[int]
+
+
+class Family(ProgressiveSchema):
+    first: Child
+    second: Child
+    third: Child
+
+
+def test_nested_computations_run_in_parallel():
+    family = Family(
+        first=Child(score=Computation(make_slow_value(0.2, 1))),
+        second=Child(score=Computation(make_slow_value(0.2, 2))),
+        third=Child(score=Computation(make_slow_value(0.2, 3))),
+    )
+
+    start = time.perf_counter()
+    frames = [json.loads(frame) for frame in family.to_streamer().stream()]
+
+    assert time.perf_counter() - start < 0.5
+    assert frames[1:4] == [
+        {"$1": {"score": "$4"}, "completed_stream": False},
+        {"$2": {"score": "$5"}, "completed_stream": False},
+        {"$3": {"score": "$6"}, "completed_stream": False},
+    ]
+
+    scores = {key: value for frame in frames[4:-1] for key, value in frame.items()}
+
+    assert scores == {"$4": 1, "$5": 2, "$6": 3, "completed_stream": False}
+
+
+def test_frames_are_emitted_in_completion_order():
+    scores = Scores(
+        first=Computation(make_slow_value(0.15, 1)),
+        second=Computation(make_slow_value(0.05, 2)),
+        third=Computation(make_slow_value(0.1, 3)),
+    )
+
+    generator = scores.to_streamer().stream()
+
+    next(generator)
+
+    values = [json.loads(next(generator)) for _ in range(3)]
+
+    assert values == [
+        {"$2": 2, "completed_stream": False},
+        {"$3": 3, "completed_stream": False},
+        {"$1": 1, "completed_stream": False},
+    ]
+
+    assert_end_of_stream(generator)
+
+
+def test_custom_executor():
+    scores = Scores(
+        first=Computation(make_slow_value(0.05, 1)),
+        second=Computation(make_slow_value(0.05, 2)),
+        third=Computation(make_slow_value(0.05, 3)),
+    )
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        generator = scores.to_streamer(executor=executor, max_workers=1).stream()
+
+        next(generator)
+
+        values = [json.loads(next(generator)) for _ in range(3)]
+
+    assert values == [
+        {"$1": 1, "completed_stream": False},
+        {"$2": 2, "completed_stream": False},
+        {"$3": 3, "completed_stream": False},
+    ]
+
+    assert_end_of_stream(generator)
+
+
+class CpuScores(ProgressiveSchema):
+    total: Computation[int]
+    square: Computation[int]
+
+
+def test_process_executor():
+    scores = CpuScores(
+        total=Computation(sum_of_squares, {"n": 1000}, executor="process"),
+        square=Computation(make_slow_value(0.01, 4)),
+    )
+
+    generator = scores.to_streamer().stream()
+
+    next(generator)
+
+    values = [json.loads(next(generator)) for _ in range(2)]
+
+    assert {"$1": sum_of_squares(1000), "completed_stream": False} in values
+    assert {"$2": 4, "completed_stream": False} in values
+
+    assert_end_of_stream(generator)
+
+
+def test_process_executor_requires_picklable_computation():
+    with pytest.raises(TypeError, match="picklable"):
+        Computation(lambda: 1, executor="process")
+
+    with pytest.raises(TypeError, match="'lock'"):
+        Computation(sum_of_squares, {"lock": threading.Lock()}, executor="process")
+
+
+class Recommendations(ProgressiveSchema):
+    user: Computation[str]
+    products: Computation[list[str]]
+    recommendations: Computation[list[str]]
+
+
+def test_dependencies_are_computed_once():
+    calls = []
+
+    def get_user() -> str:
+        calls.append("user")
+        time.sleep(0.05)
+
+        return "jdoe"
+
+    def get_products(user: str) -> list[str]:
+        calls.append("products")
+
+        return [f"{user}-bag", f"{user}-monitor"]
+
+    def get_recommendations(user: str, products: list[str]) -> list[str]:
+        calls.append("recommendations")
+
+        return [f"{user}-{product}-case" for product in products]
+
+    schema = Recommendations(
+        user=Computation(get_user),
+        products=Computation(get_products, depends_on=["user"]),
+        recommendations=Computation(
+            get_recommendations, depends_on=["user", "products"]
+        ),
+    )
+
+    generator = schema.to_streamer().stream()
+
+    next(generator)
+
+    values = [json.loads(next(generator)) for _ in range(3)]
+
+    assert values == [
+        {"$1": "jdoe", "completed_stream": False},
+        {"$2": ["jdoe-bag", "jdoe-monitor"], "completed_stream": False},
+        {
+            "$3": ["jdoe-jdoe-bag-case", "jdoe-jdoe-monitor-case"],
+            "completed_stream": False,
+        },
+    ]
+    assert calls == ["user", "products", "recommendations"]
+
+    assert_end_of_stream(generator)
+
+
+def test_dependency_cycles_are_rejected():
+    schema = Recommendations(
+        user=Computation(make_slow_value(0, 1), depends_on=["recommendations"]),
+        products=Computation(make_slow_value(0, 2), depends_on=["user"]),
+        recommendations=Computation(make_slow_value(0, 3), depends_on=["products"]),
+    )
+
+    with pytest.raises(ValueError, match="user -> recommendations -> products -> user"):
+        schema.to_streamer()
+
+
+class Storefront(ProgressiveSchema):
+    name: str
+    sections: list[Recommendations]
+
+
+def test_nested_dependency_cycles_are_rejected():
+    schema = Storefront(
+        name="shop",
+        sections=[
+            Recommendations(
+                user=Computation(make_slow_value(0, 1)),
+                products=Computation(
+                    make_slow_value(0, 2), depends_on=["recommendations"]
+                ),
+                recommendations=Computation(
+                    make_slow_value(0, 3), depends_on=["products"]
+                ),
+            )
+        ],
+    )
+
+    with pytest.raises(ValueError, match="products -> recommendations -> products"):
+        schema.to_streamer()
+
+
+def test_unknown_dependencies_are_rejected():
+    schema = Scores(
+        first=Computation(make_slow_value(0, 1), depends_on=["missing"]),
+        second=Computation(make_slow_value(0, 2)),
+        third=Computation(make_slow_value(0, 3)),
+    )
+
+    with pytest.raises(ValueError, match="'missing'"):
+        schema.to_streamer()
+
+
+def test_priority_decides_who_gets_a_worker_first():
+    started = []
+
+    def make_recorded_value(value: int):
+        def recorded_value() -> int:
+            started.append(value)
+            time.sleep(0.01)
+
+            return value
+
+        return recorded_value
+
+    scores = Scores(
+        first=Computation(make_recorded_value(1)),
+        second=Computation(make_recorded_value(2), priority=10),
+        third=Computation(make_recorded_value(3), priority=5),
+    )
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        generator = scores.to_streamer(executor=executor, max_workers=1).stream()
+
+        next(generator)
+
+        values = [json.loads(next(generator)) for _ in range(3)]
+
+    assert started == [2, 3, 1]
+    assert values == [
+        {"$2": 2, "completed_stream": False},
+        {"$3": 3, "completed_stream": False},
+        {"$1": 1, "completed_stream": False},
+    ]
+
+    assert_end_of_stream(generator)
+
+
+def test_timeouts_resolve_to_fallbacks():
+    scores = Scores(
+        first=Computation(make_slow_value(0.5, 1), timeout=0.05, fallback=0),
+        second=Computation(make_slow_value(0.5, 2), timeout=0.05),
+        third=Computation(make_slow_value(0.01, 3), timeout=0.3),
+    )
+
+    generator = scores.to_streamer().stream()
+    start = time.perf_counter()
+
+    next(generator)
+
+    values = [json.loads(next(generator)) for _ in range(3)]
+
+    assert_end_of_stream(generator)
+
+    assert time.perf_counter() - start < 0.3
+    assert values == [
+        {"$3": 3, "completed_stream": False},
+        {"$1": 0, "completed_stream": False},
+        {"$2": {"error": "timeout"}, "completed_stream": False},
+    ]
+
+
+def test_deadline_resolves_pending_computations():
+    schema = Recommendations(
+        user=Computation(make_slow_value(0.5, 1), fallback="anonymous"),
+        products=Computation(make_slow_value(0.01, 2), depends_on=["user"]),
+        recommendations=Computation(make_slow_value(0.01, 3)),
+    )
+
+    generator = schema.to_streamer(deadline=0.1).stream()
+    start = time.perf_counter()
+
+    next(generator)
+
+    values = [json.loads(next(generator)) for _ in range(3)]
+
+    assert_end_of_stream(generator)
+
+    assert time.perf_counter() - start < 0.3
+    assert values == [
+        {"$3": 3, "completed_stream": False},
+        {"$1": "anonymous", "completed_stream": False},
+        {"$2": {"error": "timeout"}, "completed_stream": False},
+    ]
+
+
+def test_resource_groups_limit_concurrency_across_streamers():
+    group = set_group_limit("test-sync-db", 2)
+    lock = threading.Lock()
+    running = []
+    max_running = []
+
+    def make_query(value: int):
+        def query() -> int:
+            with lock:
+                running.append(value)
+                max_running.append(len(running))
+
+            time.sleep(0.03)
+
+            with lock:
+                running.remove(value)
+
+            return value
+
+        return query
+
+    def consume(priority: int):
+        scores = Scores(
+            first=Computation(make_query(1), group="test-sync-db", priority=priority),
+            second=Computation(make_query(2), group="test-sync-db"),
+            third=Computation(make_query(3), group="test-sync-db"),
+        )
+
+        return [json.loads(frame) for frame in scores.to_streamer().stream()]
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = list(executor.map(consume, [0, 0]))
+
+    assert max(max_running) == 2
+    assert group.in_use == 0
+    assert group.stats.acquired == 6
+    assert group.stats.waited == 4
+    assert group.stats.max_wait > 0
+
+    for frames in results:
+        assert frames[-1] == {"completed_stream": True}
+        assert len(frames) == 5
+
+
+def test_resource_group_waiters_are_served_by_priority():
+    set_group_limit("test-sync-priority", 1)
+    started = []
+
+    def make_recorded_value(value: int):
+        def recorded_value() -> int:
+            started.append(value)
+            time.sleep(0.02)
+
+            return value
+
+        return recorded_value
+
+    scores = Scores(
+        first=Computation(make_recorded_value(1), group="test-sync-priority"),
+        second=Computation(make_recorded_value(2), group="test-sync-priority"),
+        third=Computation(
+            make_recorded_value(3), group="test-sync-priority", priority=1
+        ),
+    )
+
+    frames = list(scores.to_streamer().stream())
+
+    assert started == [3, 1, 2]
+    assert len(frames) == 5
+
+
+class Rate(ProgressiveSchema):
+    rate: Computation[float]
+
+
+def test_single_flight_shares_in_flight_calls_between_threads():
+    calls = []
+
+    def get_rate(currency: str) -> float:
+        calls.append(currency)
+        time.sleep(0.1)
+
+        return 1.5
+
+    def consume(_: int) -> list[dict]:
+        rate = Rate(rate=Computation(get_rate, {"currency": "EUR"}, single_flight=True))
+
+        return [json.loads(frame) for frame in rate.to_streamer().stream()]
+
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        results = list(executor.map(consume, range(10)))
+
+    assert calls == ["EUR"]
+
+    for frames in results:
+        assert frames[1] == {"$1": 1.5, "completed_stream": False}
+
+
+def test_single_flight_waiters_cancel_independently():
+    flight = SingleFlight()
+    shared: Future = Future()
+
+    first = flight.submit(("key", ()), lambda: shared)
+    second = flight.submit(("key", ()), lambda: Future())
+
+    first.cancel()
+
+    assert not shared.cancelled()
+
+    second.cancel()
+
+    assert shared.cancelled()
+
+    failing: Future = Future()
+    waiters = [flight.submit(("failing", ()), lambda: failing) for _ in range(3)]
+
+    failing.set_exception(ValueError("backend down"))
+
+    for waiter in waiters:
+        with pytest.raises(ValueError):
+            waiter.result()
+
+
+class Product(ProgressiveSchema):
+    name: str
+    price: Computation[float]
+
+
+class Listing(ProgressiveSchema):
+    products: Computation[list[Product]]
+
+
+def test_batch_computations_load_a_list_with_one_call():
+    calls = []
+
+    def get_prices(product_ids: list[int]) -> list[float]:
+        calls.append(product_ids)
+
+        return [product_id * 1.5 for product_id in product_ids]
+
+    def get_products() -> list[Product]:
+        return [
+            Product(name=f"p{i}", price=BatchComputation(get_prices, i % 4))
+            for i in range(8)
+        ]
+
+    listing = Listing(products=Computation(get_products))
+    frames = [json.loads(frame) for frame in listing.to_streamer().stream()]
+
+    assert calls == [[0, 1, 2, 3]]
+    assert frames[1]["$1"][5] == {"name": "p5", "price": "$7"}
+
+    prices = {key: value for frame in frames[2:-1] for key, value in frame.items()}
+
+    assert prices.pop("completed_stream") is False
+    assert prices == {f"${i + 2}": (i % 4) * 1.5 for i in range(8)}
+
+
+class Catalog(ProgressiveSchema):
+    products: list[Product]
+
+
+def test_batch_computations_are_gathered_across_sibling_models():
+    calls = []
+
+    def get_prices(product_ids: list[int]) -> list[float]:
+        calls.append(product_ids)
+
+        return [product_id * 1.5 for product_id in product_ids]
+
+    catalog = Catalog(
+        products=[
+            Product(name=f"p{i}", price=BatchComputation(get_prices, i))
+            for i in range(5)
+        ]
+    )
+    frames = [json.loads(frame) for frame in catalog.to_streamer().stream()]
+
+    # each product is a layer of its own, their prices are still loaded at once
+    assert calls == [[0, 1, 2, 3, 4]]
+    assert frames[1] == {"$1": {"name": "p0", "price": "$6"}, "completed_stream": False}
+
+    prices = {key: value for frame in frames[6:-1] for key, value in frame.items()}
+
+    assert prices.pop("completed_stream") is False
+    assert prices == {f"${i + 6}": i * 1.5 for i in range(5)}
+
+
+def test_batch_size_and_result_count_are_checked():
+    calls = []
+
+    def get_prices(product_ids: list[int]) -> list[float]:
+        calls.append(product_ids)
+
+        return [float(product_id) for product_id in product_ids]
+
+    def get_products() -> list[Product]:
+        return [
+            Product(
+                name=f"p{i}",
+                price=BatchComputation(get_prices, i, max_batch_size=2),
+            )
+            for i in range(5)
+        ]
+
+    listing = Listing(products=Computation(get_products))
+    list(listing.to_streamer().stream())
+
+    assert sorted(calls) == [[0, 1], [2, 3], [4]]
+
+    with pytest.raises(ValueError):
+        BatchComputation(lambda ids: [], 1).run()
+
+    with pytest.raises(TypeError):
+        BatchComputation(get_prices, [1])
+
+
+def test_eager_streamer_starts_computations_before_streaming():
+    scores = Scores(
+        first=Computation(make_slow_value(0.1, 1)),
+        second=Computation(make_slow_value(0.1, 2)),
+        third=Computation(make_slow_value(0.1, 3)),
+    )
+
+    streamer = scores.to_streamer(eager=True)
+
+    time.sleep(0.3)
+
+    start = time.perf_counter()
+    values = [json.loads(frame) for frame in streamer.stream()]
+
+    assert time.perf_counter() - start < 0.1
+    assert values[0] == {
+        "first": "$1",
+        "second": "$2",
+        "third": "$3",
+        "completed_stream": False,
+    }
+    assert values[1:] == [
+        {"$1": 1, "completed_stream": False},
+        {"$2": 2, "completed_stream": False},
+        {"$3": 3, "completed_stream": False},
+        {"completed_stream": True},
+    ]
+
+
+class Report(ProgressiveSchema):
+    rows: Computation[list[int]]
+
+
+def test_generator_computations_stream_chunks():
+    def get_rows():
+        for i in range(5):
+            if i == 4:
+                time.sleep(0.3)
+
+            yield i
+
+    report = Report(rows=Computation(get_rows, chunk_size=2))
+    generator = report.to_streamer().stream()
+    start = time.perf_counter()
+
+    assert json.loads(next(generator)) == {"rows": "$1", "completed_stream": False}
+    assert json.loads(next(generator)) == {"$1+": [0, 1], "completed_stream": False}
+    assert time.perf_counter() - start < 0.2
+
+    assert [json.loads(frame) for frame in generator] == [
+        {"$1+": [2, 3], "completed_stream": False},
+        {"$1+": [4], "completed_stream": False},
+        {"$1!": True, "completed_stream": False},
+        {"completed_stream": True},
+    ]
+
+
+def test_generator_computations_wait_for_the_client():
+    produced = []
+
+    def get_rows():
+        for i in range(10_000):
+            produced.append(i)
+
+            yield i
+
+    report = Report(rows=Computation(get_rows, chunk_size=10))
+    generator = report.to_streamer().stream()
+
+    next(generator)
+
+    assert json.loads(next(generator))["$1+"] == list(range(10))
+
+    time.sleep(0.1)
+
+    # the chunk being sent and the next one
+    assert len(produced) <= 20
+
+    assert len([json.loads(frame) for frame in generator]) == 1_001
+
+
+def test_generator_computations_can_not_be_dependencies():
+    def get_rows():
+        yield 1
+
+    class Summary(ProgressiveSchema):
+        rows: Computation[list[int]]
+        total: Computation[int]
+
+    summary = Summary(
+        rows=Computation(get_rows),
+        total=Computation(sum, depends_on=["rows"]),
+    )
+
+    with pytest.raises(ValueError):
+        summary.to_streamer()
+
+    with pytest.raises(ValueError):
+        Computation(get_rows, executor="process")
+
+
+def test_chunk_size_must_be_positive():
+    def get_rows():
+        yield 1
+
+    with pytest.raises(ValueError):
+        Computation(get_rows, chunk_size=0)
+
+
+def test_cancelled_generator_computations_are_closed():
+    closed = []
+
+    def get_rows():
+        try:
+            for i in range(10_000):
+                time.sleep(0.001)
+
+                yield i
+        finally:
+            closed.append(True)
+
+    report = Report(rows=Computation(get_rows, chunk_size=10, timeout=0.1))
+    frames = [json.loads(frame) for frame in report.to_streamer().stream()]
+
+    assert frames[-2] == {"$1!": True, "completed_stream": False}
+
+    time.sleep(0.05)
+
+    assert closed == [True]
+
+    closed.clear()
+    generator = Report(rows=Computation(get_rows, chunk_size=10)).to_streamer().stream()
+
+    next(generator)
+    next(generator)
+    generator.close()
+    time.sleep(0.05)
+
+    assert closed == [True]
+
+
+def test_closing_the_stream_cancels_computations():
+    started = []
+    cancelled = []
+
+    def wait_for_cancel(value: int) -> int:
+        started.append(value)
+
+        if get_cancel_token().wait(5):
+            cancelled.append(value)
+
+        return value
+
+    scores = Scores(
+        first=Computation(make_slow_value(0, 1), priority=1),
+        second=Computation(wait_for_cancel, {"value": 2}),
+        third=Computation(wait_for_cancel, {"value": 3}),
+    )
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        generator = scores.to_streamer(executor=executor, max_workers=1).stream()
+
+        next(generator)
+
+        assert json.loads(next(generator)) == {"$1": 1, "completed_stream": False}
+
+        time.sleep(0.05)
+        generator.close()
+        start = time.perf_counter()
+
+    assert time.perf_counter() - start < 1
+    assert started == [2]
+    assert cancelled == [2]
+
+
+def test_closing_a_prefetched_streamer_cancels_computations():
+    cancelled = []
+
+    def wait_for_cancel(value: int) -> int:
+        if get_cancel_token().wait(5):
+            cancelled.append(value)
+
+        return value
+
+    scores = Scores(
+        first=Computation(wait_for_cancel, {"value": 1}),
+        second=Computation(wait_for_cancel, {"value": 2}),
+        third=Computation(wait_for_cancel, {"value": 3}),
+    )
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        streamer = scores.to_streamer(executor=executor, max_workers=2, eager=True)
+        streamer.close()
+
+    assert sorted(cancelled) == [1, 2]
+    assert get_cancel_token().is_cancelled is False
+
+
+def test_hedged_computations_take_the_first_result():
+    calls = []
+    cancelled = []
+
+    def get_score() -> int:
+        call = len(calls)
+        calls.append(call)
+
+        # the first call hits a slow replica
+        if call == 0 and get_cancel_token().wait(2):
+            cancelled.append(call)
+
+        return 1
+
+    scores = Scores(
+        first=Computation(get_score, hedge_after=0.05),
+        second=Computation(make_slow_value(0, 2)),
+        third=Computation(make_slow_value(0, 3)),
+    )
+
+    start = time.perf_counter()
+    values = [json.loads(frame) for frame in scores.to_streamer().stream()]
+
+    assert time.perf_counter() - start < 0.5
+    assert {"$1": 1, "completed_stream": False} in values
+    assert len(values) == 5
+
+    time.sleep(0.05)
+
+    assert calls == [0, 1]
+    assert cancelled == [0]
+    assert hedge_budget.get_stats(get_score).wins == 1
+
+
+def test_hedge_budget_caps_hedges():
+    def get_score() -> int:
+        time.sleep(0.1)
+
+        return 1
+
+    hedge_budget.configure(get_score, ratio=0.5, burst=1)
+
+    for _ in range(3):
+        scores = Scores(
+            first=Computation(get_score, hedge_after=0.01),
+            second=Computation(make_slow_value(0, 2)),
+            third=Computation(make_slow_value(0, 3)),
+        )
+
+        list(scores.to_streamer().stream())
+
+    stats = hedge_budget.get_stats(get_score)
+
+    assert stats.calls == 3
+    assert stats.hedges == 2
+    assert stats.denied == 1
+
+    with pytest.raises(ValueError):
+        Computation(get_score, hedge_after=0.1, single_flight=True)
@@ -0,0 +1,95 @@
+import json
+
+import pytest
+from ame_json.models.assembler.progressive_assembler import ProgressiveAssembler
+from ame_json.models.computation import Computation
+from ame_json.models.framing import (
+    LENGTH_PREFIX,
+    FrameReader,
+    get_framing,
+    read_frames,
+)
+from tests.utils import UserAddress, UserWithLoyaltyScore
+
+
+def make_user() -> UserWithLoyaltyScore:
+    return UserWithLoyaltyScore(
+        user_id=101,
+        username="jdoe",
+        email="john.doe@example.com",
+        address=UserAddress(street="123 Placeholder Dr", city="Streamington"),
+        loyalty_score=Computation(lambda: 95),
+    )
+
+
+def rechunk(frames: list[bytes], size: int) -> list[bytes]:
+    """
+    Merges the frames into one byte stream, read back in `size` byte chunks.
+    """
+    data = b"".join(frames)
+
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("framing", ["length", "ndjson"])
+def test_frames_survive_any_chunking(framing: str):
+    frames = list(make_user().to_streamer(framing=framing).stream())
+    expected = [
+        json.loads(frame) for frame in make_user().to_streamer(codec="json").stream()
+    ]
+
+    for size in (1, 7, 64, 10_000):
+        chunks = rechunk(frames, size)
+
+        assert [
+            json.loads(bytes(frame)) for frame in read_frames(chunks, framing)
+        ] == expected
+
+        data = ProgressiveAssembler.assamble(iter(chunks), framing=framing)
+
+        assert data == make_user().model_dump()
+
+
+def test_streamer_framing():
+    frames = list(make_user().to_streamer(codec="json", framing="ndjson").stream())
+
+    assert all(frame.endswith(b"\n") for frame in frames)
+    assert frames[-1] == b'{"completed_stream": true}\n'
+
+    frames = list(make_user().to_streamer(codec="json", framing="length").stream())
+
+    assert frames[-1] == LENGTH_PREFIX.pack(26) + b'{"completed_stream": true}'
+
+
+def test_reader_yields_views_of_its_buffer():
+    reader = FrameReader("ndjson")
+
+    views = []
+
+    for frame in reader.feed(b'{"a": 1}\n{"b"'):
+        assert isinstance(frame, memoryview)
+        assert frame == b'{"a": 1}'
+
+        views.append(frame)
+
+    # released once the reader moves on, so the buffer can be reused
+    with pytest.raises(ValueError):
+        bytes(views[0])
+
+    assert reader.pending() == 4
+
+    frames = [bytes(frame) for frame in reader.feed(b": 2}\n\n")]
+
+    assert frames == [b'{"b": 2}']
+    assert reader.pending() == 0
+
+
+def test_framing_errors():
+    with pytest.raises(ValueError):
+        get_framing("msgpack", "ndjson")
+
+    with pytest.raises(ValueError):
+        get_framing("json", "lines")
+
+    with pytest.raises(ValueError):
+        list(read_frames([LENGTH_PREFIX.pack(10) + b"abc"], "length"))
@@ -0,0 +1,111 @@
+import pytest
+from ame_json.models.assembler.assembler_event import (
+    PLACEHOLDER_RESOLVED,
+    ROOT_READY,
+    STREAM_COMPLETE,
+)
+from ame_json.models.assembler.incremental_assembler import IncrementalAssembler
+from ame_json.models.computation import Computation
+from ame_json.models.progressive_schema import ProgressiveSchema
+from tests.utils import Products, UserAddress, UserWithLoyaltyScore
+
+
+class Report(ProgressiveSchema):
+    title: str
+    rows: Computation[list[Products]]
+
+
+def get_report_rows():
+    yield from (Products(name=f"row {i}", price=i) for i in range(5))
+
+
+def make_user() -> UserWithLoyaltyScore:
+    return UserWithLoyaltyScore(
+        user_id=101,
+        username="jdoe",
+        email="john.doe@example.com",
+        address=UserAddress(street="123 Placeholder Dr", city="Streamington"),
+        loyalty_score=Computation(lambda: 95),
+    )
+
+
+def test_feed_whole_frames():
+    assembler = IncrementalAssembler()
+    frames = make_user().to_streamer().stream()
+
+    assert assembler.feed(next(frames)) == []
+    assert assembler.data == {
+        "user_id": 101,
+        "username": "jdoe",
+        "email": "john.doe@example.com",
+        "address": "$1",
+        "loyalty_score": "$2",
+    }
+    assert assembler.get_value("$2") == "$2"
+
+    resolved = []
+
+    for frame in frames:
+        resolved.extend(assembler.feed(frame))
+
+    assert sorted(resolved) == ["$1", "$2"]
+    assert assembler.get_value("$2") == 95
+    assert assembler.completed
+    assert assembler.data == make_user().model_dump()
+
+
+@pytest.mark.parametrize("framing", ["length", "ndjson"])
+def test_feed_arbitrary_chunks(framing: str):
+    data = b"".join(make_user().to_streamer(framing=framing).stream())
+    assembler = IncrementalAssembler(framing=framing)
+    resolved = []
+
+    for i in range(0, len(data), 3):
+        resolved.extend(assembler.feed(data[i : i + 3]))
+
+        if not assembler.data:
+            assert not resolved
+
+    assert sorted(resolved) == ["$1", "$2"]
+    assert assembler.completed
+    assert assembler.data == make_user().model_dump()
+
+
+def test_streamed_lists_resolve_when_closed():
+    report = Report(title="sales", rows=Computation(get_report_rows, chunk_size=2))
+    assembler = IncrementalAssembler()
+    resolved = [assembler.feed(frame) for frame in report.to_streamer().stream()]
+
+    assert resolved == [[], [], [], [], ["$1"], []]
+    assert assembler.data["rows"] == [
+        {"name": f"row {i}", "price": float(i)} for i in range(5)
+    ]
+
+
+def test_event_callbacks():
+    assembler = IncrementalAssembler()
+    events = []
+
+    for event_type in (ROOT_READY, PLACEHOLDER_RESOLVED, STREAM_COMPLETE):
+        assembler.on(event_type, events.append)
+
+    frames = make_user().to_streamer().stream()
+    assembler.feed(next(frames))
+
+    assert [event.type for event in events] == [ROOT_READY]
+    assert events[0].value["address"] == "$1"
+
+    for frame in frames:
+        assembler.feed(frame)
+
+    resolved = {event.placeholder: event for event in events[1:-1]}
+
+    assert resolved["$1"].path == ("address",)
+    assert resolved["$1"].value == make_user().address.model_dump()
+    assert resolved["$2"].path == ("loyalty_score",)
+    assert resolved["$2"].value == 95
+    assert events[-1].type == STREAM_COMPLETE
+    assert events[-1].value == make_user().model_dump()
+
+    with pytest.raises(ValueError):
+        assembler.on("resolved", events.append)
@@ -0,0 +1,102 @@
+import json
+
+import pytest
+from ame_json.models.assembler.progressive_assembler import ProgressiveAssembler
+from ame_json.models.computation import Computation
+from ame_json.models.field_helper import encode_frame
+from ame_json.models.json_codec import (
+    get_codec,
+    get_default_codec,
+    set_default_codec,
+)
+from tests.utils import UserAddress, UserWithLoyaltyScore
+
+
+def require_codec(name: str):
+    if name != "json":
+        pytest.importorskip(name)
+
+
+def make_user() -> UserWithLoyaltyScore:
+    return UserWithLoyaltyScore(
+        user_id=101,
+        username="jdoe",
+        email="john.doe@example.com",
+        address=UserAddress(street="123 Placeholder Dr", city="Streamington"),
+        loyalty_score=Computation(lambda: 95),
+    )
+
+
+@pytest.mark.parametrize("name", ["json", "orjson", "msgspec"])
+def test_codecs_round_trip(name: str):
+    require_codec(name)
+
+    codec = get_codec(name)
+    data = {"$1": [{"name": "é", "price": 1.5}, None, True], 2: 2**70}
+
+    encoded = codec.encode(data)
+
+    assert isinstance(encoded, bytes)
+    assert codec.decode(encoded) == json.loads(json.dumps(data))
+    assert codec.decode(memoryview(encoded)) == codec.decode(encoded)
+
+
+@pytest.mark.parametrize("name", ["json", "orjson", "msgspec"])
+def test_streamers_and_assemblers_use_the_codec(name: str):
+    require_codec(name)
+
+    frames = list(make_user().to_streamer(codec=name).stream())
+    expected = [
+        json.loads(frame) for frame in make_user().to_streamer(codec="json").stream()
+    ]
+
+    assert [json.loads(frame) for frame in frames] == expected
+
+    data = ProgressiveAssembler().assamble(iter(frames), codec=name)
+
+    assert data == make_user().model_dump()
+
+
+def test_stdlib_codec_frames_are_unchanged():
+    frames = list(make_user().to_streamer(codec="json").stream())
+
+    assert frames[0] == json.dumps(
+        {
+            "user_id": 101,
+            "username": "jdoe",
+            "email": "john.doe@example.com",
+            "address": "$1",
+            "loyalty_score": "$2",
+            "completed_stream": False,
+        }
+    ).encode("utf-8")
+
+
+def test_default_codec_can_be_replaced():
+    default = get_default_codec()
+
+    try:
+        set_default_codec("json")
+
+        assert get_default_codec() is get_codec("json")
+        assert make_user().to_streamer().context.codec is get_codec("json")
+    finally:
+        set_default_codec(default)
+
+    with pytest.raises(ValueError):
+        get_codec("yaml")
+
+
+@pytest.mark.parametrize("name", ["json", "orjson", "msgspec"])
+def test_encode_frame(name: str):
+    require_codec(name)
+
+    codec = get_codec(name)
+    fields = {"user_id": 101, "username": "jdoe é", "address": "$1"}
+
+    assert encode_frame(fields.items(), False, codec) == codec.encode(
+        {**fields, "completed_stream": False}
+    )
+    assert encode_frame(fields.items(), True, codec, "$2") == codec.encode(
+        {"$2": fields, "completed_stream": True}
+    )
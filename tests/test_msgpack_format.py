@@ -0,0 +1,96 @@
+import datetime
+
+import pytest
+from ame_json.models.assembler.progressive_assembler import ProgressiveAssembler
+from ame_json.models.computation import Computation
+from ame_json.models.framing import LENGTH_PREFIX, read_length_prefixed
+from ame_json.models.msgpack_codec import PLACEHOLDER_EXT, get_format_codec
+from ame_json.models.progressive_schema import ProgressiveSchema
+from tests.utils import Products, UserAddress, UserWithLoyaltyScore
+
+msgpack = pytest.importorskip("msgpack")
+
+
+class Order(ProgressiveSchema):
+    code: str
+    created_at: datetime.datetime
+    products: Computation[list[Products]]
+    address: UserAddress
+
+
+def make_order() -> Order:
+    return Order(
+        code="$5 off",
+        created_at=datetime.datetime(2024, 1, 2),
+        products=Computation(
+            lambda: [Products(name="$" + str(i), price=i) for i in range(5)],
+            chunk_size=2,
+        ),
+        address=UserAddress(street="123 Placeholder Dr", city="Streamington"),
+    )
+
+
+def get_streamed_products():
+    yield from (Products(name="$" + str(i), price=i) for i in range(5))
+
+
+def test_frames_are_length_prefixed_msgpack():
+    user = UserWithLoyaltyScore(
+        user_id=101,
+        username="jdoe",
+        email="john.doe@example.com",
+        address=UserAddress(street="123 Placeholder Dr", city="Streamington"),
+        loyalty_score=Computation(lambda: 95),
+    )
+
+    frames = list(user.to_streamer(format="msgpack").stream())
+    (size,) = LENGTH_PREFIX.unpack_from(frames[0])
+
+    assert size == len(frames[0]) - LENGTH_PREFIX.size
+
+    root = msgpack.unpackb(read_length_prefixed(frames[0]))
+
+    assert root["address"] == msgpack.ExtType(PLACEHOLDER_EXT, b"\x01")
+    assert root["loyalty_score"] == msgpack.ExtType(PLACEHOLDER_EXT, b"\x02")
+    assert root["completed_stream"] is False
+
+    data = ProgressiveAssembler.assamble(iter(frames), format="msgpack")
+
+    assert data == user.model_dump()
+
+
+def test_dollar_strings_are_not_placeholders():
+    frames = make_order().to_streamer(format="msgpack").stream()
+
+    data = ProgressiveAssembler.assamble(frames, format="msgpack")
+
+    assert data == {
+        "code": "$5 off",
+        "created_at": "2024-01-02T00:00:00",
+        "products": [{"name": "$" + str(i), "price": float(i)} for i in range(5)],
+        "address": {"street": "123 Placeholder Dr", "city": "Streamington"},
+    }
+
+
+def test_streamed_lists_in_msgpack():
+    order = make_order()
+    order.products = Computation(get_streamed_products, chunk_size=2)
+
+    data = ProgressiveAssembler.assamble(
+        order.to_streamer(format="msgpack").stream(), format="msgpack"
+    )
+
+    assert data["products"] == [
+        {"name": "$" + str(i), "price": float(i)} for i in range(5)
+    ]
+
+
+def test_codecs_only_apply_to_json():
+    with pytest.raises(ValueError):
+        get_format_codec("msgpack", "orjson")
+
+    with pytest.raises(ValueError):
+        get_format_codec("cbor")
+
+    with pytest.raises(ValueError):
+        read_length_prefixed(b"\x00\x00\x00\x05abc")
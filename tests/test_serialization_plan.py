@@ -0,0 +1,159 @@
+import datetime
+import json
+
+from ame_json.models.computation import Computation
+from ame_json.models.serialization_plan import (
+    ANY,
+    COMPUTATION,
+    DICT,
+    LIST,
+    MODEL,
+    PRIMITIVE,
+    STATIC,
+    get_model_plan,
+)
+from pydantic import BaseModel, ConfigDict, Field
+from tests.utils import (
+    BaseUserProfile,
+    Products,
+    UserAddress,
+    UserProfile,
+    UserWithAddress,
+)
+
+
+class Order(BaseModel):
+    order_id: int
+    note: str | None = None
+    tags: list[str] = []
+    extra: dict[str, int] = {}
+    products: list[Products] = []
+    meta: dict = {}
+    product: Products
+    anything: object = None
+
+
+def test_plan_kinds_follow_annotations():
+    plan = get_model_plan(Order)
+
+    assert plan.fields == (
+        ("order_id", PRIMITIVE),
+        ("note", PRIMITIVE),
+        ("tags", STATIC),
+        ("extra", STATIC),
+        ("products", LIST),
+        ("meta", DICT),
+        ("product", MODEL),
+        ("anything", ANY),
+    )
+    assert plan.computation_fields == ("anything",)
+    assert plan.static_fields == {"tags", "extra"}
+    assert not plan.is_static
+    assert get_model_plan(Order) is plan
+    assert get_model_plan(Products).is_static
+
+    profile_plan = get_model_plan(UserProfile)
+
+    assert dict(profile_plan.fields)["loyalty_score"] == COMPUTATION
+    assert profile_plan.computation_fields == ("loyalty_score", "products")
+
+
+def test_unvalidated_primitive_fields_are_still_dispatched():
+    user = UserWithAddress.model_construct(
+        user_id=101,
+        username=UserAddress(street="123 Placeholder Dr", city="Streamington"),
+        email="john.doe@example.com",
+        address=UserAddress(street="456 Other St", city="Streamington"),
+    )
+
+    frames = [json.loads(frame) for frame in user.to_streamer().stream()]
+
+    assert frames[0] == {
+        "user_id": 101,
+        "username": "$1",
+        "email": "john.doe@example.com",
+        "address": "$2",
+        "completed_stream": False,
+    }
+
+
+def test_list_of_models_uses_the_plan():
+    class Catalog(UserWithAddress):
+        products: Computation[list[Products]]
+
+    catalog = Catalog(
+        user_id=1,
+        username="jdoe",
+        email="john.doe@example.com",
+        address=UserAddress(street="123 Placeholder Dr", city="Streamington"),
+        products=Computation(
+            lambda: [Products(name=str(i), price=i) for i in range(3)]
+        ),
+    )
+
+    frames = [json.loads(frame) for frame in catalog.to_streamer().stream()]
+
+    assert {
+        "$2": [
+            {"name": "0", "price": 0.0},
+            {"name": "1", "price": 1.0},
+            {"name": "2", "price": 2.0},
+        ],
+        "completed_stream": False,
+    } in frames
+
+
+class Event(BaseModel):
+    name: str
+    at: datetime.datetime
+    tags: set[str]
+
+
+class Calendar(BaseUserProfile):
+    events: Computation[list[Event]]
+    first: Event
+    dates: list[datetime.date]
+
+
+def test_static_sub_trees_are_serialized_by_pydantic():
+    event = Event(name="launch", at=datetime.datetime(2024, 1, 2, 3, 4), tags={"a"})
+    calendar = Calendar(
+        user_id=1,
+        username="jdoe",
+        email="john.doe@example.com",
+        events=Computation(lambda: [event, event]),
+        first=event,
+        dates=[datetime.date(2024, 1, 2)],
+    )
+
+    frames = [
+        json.loads(frame) for frame in calendar.to_streamer(codec="json").stream()
+    ]
+    dumped_event = {"name": "launch", "at": "2024-01-02T03:04:00", "tags": ["a"]}
+
+    assert frames[0]["dates"] == ["2024-01-02"]
+    assert {"$2": dumped_event, "completed_stream": False} in frames
+    assert {"$1": [dumped_event, dumped_event], "completed_stream": False} in frames
+
+
+class TaggedUser(BaseUserProfile):
+    model_config = ConfigDict(serialize_by_alias=True)
+
+    tags: list[str] = Field(serialization_alias="labels")
+
+
+def test_static_fields_keep_their_names_with_aliases():
+    user = TaggedUser(user_id=1, username="jdoe", email="j@example.com", tags=["a"])
+
+    frames = [json.loads(frame) for frame in user.to_streamer(codec="json").stream()]
+
+    assert frames == [
+        {
+            "user_id": 1,
+            "username": "jdoe",
+            "email": "j@example.com",
+            "tags": ["a"],
+            "completed_stream": False,
+        },
+        {"completed_stream": True},
+    ]
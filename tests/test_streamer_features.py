@@ -1,3 +1,10 @@
+import json
+
+from ame_json.models.assembler.progressive_assembler import ProgressiveAssembler
+from ame_json.models.computation import Computation
+from ame_json.models.inline_policy import InlinePolicy
+from ame_json.models.progressive_schema import ProgressiveSchema
+from pydantic import BaseModel
 from tests.test_features_utils import (
     Emoji,
     Like,
@@ -9,7 +16,12 @@ from tests.test_features_utils import (
     Post,
     Comment,
 )
-from tests.utils import assert_as_json, assert_end_of_stream
+from tests.utils import (
+    UserAddress,
+    UserWithLoyaltyScore,
+    assert_as_json,
+    assert_end_of_stream,
+)
 
 
 def test_deeply_nested_model():
@@ -251,3 +263,145 @@ def test_dict_with_model():
 
     # End of stream
     assert_end_of_stream(generator)
+
+
+def make_nested_user() -> UserWithAddressAndCountry:
+    return UserWithAddressAndCountry(
+        user_id=201,
+        username="testuser",
+        email="test@example.com",
+        address=AddressWithCountry(
+            street="456 Stream Ave",
+            city="Testville",
+            country=Country(name="Testland", code="TL"),
+        ),
+    )
+
+
+def test_inline_static_models():
+    generator = make_nested_user().to_streamer(inline=True).stream()
+
+    value = next(generator)
+    expected = {
+        "user_id": 201,
+        "username": "testuser",
+        "email": "test@example.com",
+        "address": {
+            "street": "456 Stream Ave",
+            "city": "Testville",
+            "country": {"name": "Testland", "code": "TL"},
+        },
+        "completed_stream": False,
+    }
+    assert_as_json(value, expected)
+
+    assert_end_of_stream(generator)
+
+
+def test_inline_policy_limits():
+    generator = (
+        make_nested_user().to_streamer(inline=InlinePolicy(max_depth=1)).stream()
+    )
+
+    value = next(generator)
+    expected = {
+        "user_id": 201,
+        "username": "testuser",
+        "email": "test@example.com",
+        "address": "$1",
+        "completed_stream": False,
+    }
+    assert_as_json(value, expected)
+
+    # the address nests two levels of models, its country one
+    value = next(generator)
+    expected = {
+        "$1": {
+            "street": "456 Stream Ave",
+            "city": "Testville",
+            "country": {"name": "Testland", "code": "TL"},
+        },
+        "completed_stream": False,
+    }
+    assert_as_json(value, expected)
+
+    assert_end_of_stream(generator)
+
+    frames = list(
+        make_nested_user().to_streamer(inline=InlinePolicy(max_bytes=40)).stream()
+    )
+
+    # the address is too big, its country isn't
+    assert [json.loads(frame) for frame in frames][:2] == [
+        {
+            "user_id": 201,
+            "username": "testuser",
+            "email": "test@example.com",
+            "address": "$1",
+            "completed_stream": False,
+        },
+        {
+            "$1": {
+                "street": "456 Stream Ave",
+                "city": "Testville",
+                "country": {"name": "Testland", "code": "TL"},
+            },
+            "completed_stream": False,
+        },
+    ]
+
+
+class Inner(BaseModel):
+    text: str
+
+
+class Mid(BaseModel):
+    text: str
+    inner: Inner
+
+
+class Outer(ProgressiveSchema):
+    mid: Mid
+
+
+def test_models_too_big_to_inline_are_sent_once():
+    text = "x" * 50
+    outer = Outer(mid=Mid(text=text, inner=Inner(text=text)))
+
+    frames = list(outer.to_streamer(inline=InlinePolicy(max_bytes=40)).stream())
+    values = [json.loads(frame) for frame in frames]
+
+    assert values[0] == {"mid": "$2", "completed_stream": False}
+    assert [next(iter(value)) for value in values] == [
+        "mid",
+        "$2",
+        "$3",
+        "completed_stream",
+    ]
+    assert ProgressiveAssembler().assamble(iter(frames)) == outer.model_dump()
+
+
+def test_models_with_computations_are_not_inlined():
+    user = UserWithLoyaltyScore(
+        user_id=101,
+        username="jdoe",
+        email="john.doe@example.com",
+        address=UserAddress(street="123 Placeholder Dr", city="Streamington"),
+        loyalty_score=Computation(lambda: 95),
+    )
+
+    frames = list(user.to_streamer(inline=True).stream())
+
+    assert [json.loads(frame) for frame in frames] == [
+        {
+            "user_id": 101,
+            "username": "jdoe",
+            "email": "john.doe@example.com",
+            "address": {"street": "123 Placeholder Dr", "city": "Streamington"},
+            "loyalty_score": "$1",
+            "completed_stream": False,
+        },
+        {"$1": 95, "completed_stream": False},
+        {"completed_stream": True},
+    ]
+    assert ProgressiveAssembler.assamble(iter(frames)) == user.model_dump()
@@ -32,6 +32,12 @@ def calculate_loyalty_score_sync() -> int:
     return 95
 
 
+def sum_of_squares(n: int) -> int:
+    """A CPU bound computation, module level so it can run in a process pool."""
+
+    return sum(i * i for i in range(n))
+
+
 # The result type definition is just for type hinting, not used by the streamer logic
 
 